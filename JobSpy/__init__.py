@@ -1,17 +1,36 @@
 from __future__ import annotations
 
+import asyncio
 import pandas as pd
+from datetime import datetime
 from typing import Tuple
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from .jobs import JobType, Location
+from .jobs import CompensationInterval, JobType, Location
 from .scrapers.utils import set_logger_level, extract_salary, create_logger
-from .scrapers.indeed import IndeedScraper
-from .scrapers.ziprecruiter import ZipRecruiterScraper
-from .scrapers.glassdoor import GlassdoorScraper
-from .scrapers.google import GoogleJobsScraper
-from .scrapers.linkedin import LinkedInScraper
+from .scrapers.indeed import IndeedScraper, AsyncIndeedScraper
+from .scrapers.ziprecruiter import ZipRecruiterScraper, AsyncZipRecruiterScraper
+from .scrapers.glassdoor import GlassdoorScraper, AsyncGlassdoorScraper
+from .scrapers.google import GoogleJobsScraper, AsyncGoogleJobsScraper
+from .scrapers.linkedin import LinkedInScraper, AsyncLinkedInScraper
 from .scrapers import SalarySource, ScraperInput, Site, JobResponse, Country
+from .scrapers.ratelimit import (
+    CircuitOpenError,
+    circuit_opened_since,
+    circuit_state,
+    configure_site_limits,
+    limiter_stats,
+    reset_limiter_stats,
+)
+from .scrapers.parsing import configure_parse_pool
+from .scrapers.metrics import RequestMetrics, collect_metrics, submit_in_context
+from .scrapers.sessionpool import reset_session_pool_stats, session_pool_stats
+from .scrapers.stopsignal import stop_requested, stop_when, stopped_early
+from .scrapers.bootstrap import (
+    bootstrap_stats,
+    configure_bootstrap_cache,
+    reset_bootstrap_stats,
+)
 from .scrapers.exceptions import (
     LinkedInException,
     IndeedException,
@@ -21,42 +40,91 @@ from .scrapers.exceptions import (
 )
 
 
-def scrape_jobs(
-    site_name: str | list[str] | Site | list[Site] | None = None,
-    search_term: str | None = None,
-    google_search_term: str | None = None,
-    location: str | None = None,
-    distance: int | None = 50,
-    is_remote: bool = False,
-    job_type: str | None = None,
-    easy_apply: bool | None = None,
-    results_wanted: int = 15,
-    country_indeed: str = "usa",
-    hyperlinks: bool = False,
-    proxies: list[str] | str | None = None,
-    ca_cert: str | None = None,
-    description_format: str = "markdown",
-    linkedin_fetch_description: bool | None = False,
-    linkedin_company_ids: list[int] | None = None,
-    offset: int | None = 0,
-    hours_old: int = None,
-    enforce_annual_salary: bool = False,
-    verbose: int = 2,
-    **kwargs,
-) -> pd.DataFrame:
+SCRAPER_MAPPING = {
+    Site.LINKEDIN: LinkedInScraper,
+    Site.INDEED: IndeedScraper,
+    Site.ZIP_RECRUITER: ZipRecruiterScraper,
+    Site.GLASSDOOR: GlassdoorScraper,
+    Site.GOOGLE: GoogleJobsScraper,
+}
+ASYNC_SCRAPER_MAPPING = {
+    Site.LINKEDIN: AsyncLinkedInScraper,
+    Site.INDEED: AsyncIndeedScraper,
+    Site.ZIP_RECRUITER: AsyncZipRecruiterScraper,
+    Site.GLASSDOOR: AsyncGlassdoorScraper,
+    Site.GOOGLE: AsyncGoogleJobsScraper,
+}
+
+# dtypes of the scrape_jobs output. Repeated labels are categoricals (sorted
+# categories, so sorting by them stays alphabetical), date_posted is
+# datetime64 and amounts are nullable floats. Other columns keep pandas'
+# default text dtype.
+JOB_SCHEMA = {
+    "site": pd.CategoricalDtype(sorted(site.value for site in Site)),
+    "country": pd.CategoricalDtype(),
+    "date_posted": "datetime64[ns]",
+    "job_type": pd.CategoricalDtype(),
+    "salary_source": pd.CategoricalDtype(sorted(s.value for s in SalarySource)),
+    "interval": pd.CategoricalDtype(
+        sorted(interval.value for interval in CompensationInterval)
+    ),
+    "min_amount": "Float64",
+    "max_amount": "Float64",
+    "currency": pd.CategoricalDtype(),
+    "is_remote": "boolean",
+    "listing_type": pd.CategoricalDtype(),
+    "job_level": pd.CategoricalDtype(),
+}
+
+
+def apply_job_schema(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Simultaneously scrapes job data from multiple job sites.
-    :return: pandas dataframe containing job data
+    Casts the columns of df found in JOB_SCHEMA, in place, and returns df.
+    Typed columns are left alone, so it is cheap to call again, e.g. after
+    pd.concat, which turns categoricals with different categories into
+    object columns.
     """
-    SCRAPER_MAPPING = {
-        Site.LINKEDIN: LinkedInScraper,
-        Site.INDEED: IndeedScraper,
-        Site.ZIP_RECRUITER: ZipRecruiterScraper,
-        Site.GLASSDOOR: GlassdoorScraper,
-        Site.GOOGLE: GoogleJobsScraper,
-    }
-    set_logger_level(verbose)
+    for column, dtype in JOB_SCHEMA.items():
+        if column not in df.columns:
+            continue
+        series = df[column]
+        if isinstance(dtype, pd.CategoricalDtype):
+            if isinstance(series.dtype, pd.CategoricalDtype) and (
+                dtype.categories is None or series.dtype == dtype
+            ):
+                continue
+            df[column] = series.astype(
+                dtype if dtype.categories is not None else "category"
+            )
+        elif column == "date_posted":
+            if series.dtype != dtype:
+                df[column] = pd.to_datetime(
+                    series, errors="coerce", format="mixed"
+                ).astype(dtype)
+        elif series.dtype != dtype:
+            df[column] = series.astype(dtype)
+    return df
+
+
 
+def _build_scraper_input(
+    site_name: str | list[str] | Site | list[Site] | None,
+    search_term: str | None,
+    google_search_term: str | None,
+    location: str | None,
+    distance: int | None,
+    is_remote: bool,
+    job_type: str | None,
+    easy_apply: bool | None,
+    results_wanted: int,
+    country_indeed: str,
+    description_format: str,
+    linkedin_fetch_description: bool | None,
+    linkedin_company_ids: list[int] | None,
+    offset: int | None,
+    hours_old: int | None,
+    posted_since: datetime | None,
+) -> ScraperInput:
     def map_str_to_site(site_name: str) -> Site:
         return Site[site_name.upper()]
 
@@ -81,11 +149,9 @@ def scrape_jobs(
             ]
         return site_types
 
-    country_enum = Country.from_string(country_indeed)
-
-    scraper_input = ScraperInput(
+    return ScraperInput(
         site_type=get_site_type(),
-        country=country_enum,
+        country=Country.from_string(country_indeed),
         search_term=search_term,
         google_search_term=google_search_term,
         location=location,
@@ -99,32 +165,16 @@ def scrape_jobs(
         linkedin_company_ids=linkedin_company_ids,
         offset=offset,
         hours_old=hours_old,
+        posted_since=posted_since,
     )
 
-    def scrape_site(site: Site) -> Tuple[str, JobResponse]:
-        scraper_class = SCRAPER_MAPPING[site]
-        scraper = scraper_class(proxies=proxies, ca_cert=ca_cert)
-        scraped_data: JobResponse = scraper.scrape(scraper_input)
-        cap_name = site.value.capitalize()
-        site_name = "ZipRecruiter" if cap_name == "Zip_recruiter" else cap_name
-        create_logger(site_name).info(f"finished scraping")
-        return site.value, scraped_data
-
-    site_to_jobs_dict = {}
-
-    def worker(site):
-        site_val, scraped_info = scrape_site(site)
-        return site_val, scraped_info
-
-    with ThreadPoolExecutor() as executor:
-        future_to_site = {
-            executor.submit(worker, site): site for site in scraper_input.site_type
-        }
-
-        for future in as_completed(future_to_site):
-            site_value, scraped_data = future.result()
-            site_to_jobs_dict[site_value] = scraped_data
 
+def _jobs_to_dataframe(
+    site_to_jobs_dict: dict[str, JobResponse],
+    country_enum: Country,
+    hyperlinks: bool,
+    enforce_annual_salary: bool,
+) -> pd.DataFrame:
     def convert_to_annual(job_data: dict):
         if job_data["interval"] == "hourly":
             job_data["min_amount"] *= 2080
@@ -140,7 +190,7 @@ def scrape_jobs(
             job_data["max_amount"] *= 260
         job_data["interval"] = "yearly"
 
-    jobs_dfs: list[pd.DataFrame] = []
+    jobs_data: list[dict] = []
 
     for site, job_response in site_to_jobs_dict.items():
         for job in job_response.jobs:
@@ -199,15 +249,12 @@ def scrape_jobs(
                 if "min_amount" in job_data and job_data["min_amount"]
                 else None
             )
-            job_df = pd.DataFrame([job_data])
-            jobs_dfs.append(job_df)
+            jobs_data.append(job_data)
 
-    if jobs_dfs:
-        # Step 1: Filter out all-NA columns from each DataFrame before concatenation
-        filtered_dfs = [df.dropna(axis=1, how="all") for df in jobs_dfs]
-
-        # Step 2: Concatenate the filtered DataFrames
-        jobs_df = pd.concat(filtered_dfs, ignore_index=True)
+    if jobs_data:
+        # Steps 1-2: one frame from all the records, instead of one frame per
+        # job concatenated
+        jobs_df = pd.DataFrame(jobs_data)
 
         # Desired column order
         desired_order = [
@@ -247,7 +294,7 @@ def scrape_jobs(
                 jobs_df[column] = None  # Add missing columns as empty
 
         # Reorder the DataFrame according to the desired order
-        jobs_df = jobs_df[desired_order]
+        jobs_df = apply_job_schema(jobs_df[desired_order].copy())
 
         # Step 4: Sort the DataFrame as required
         return jobs_df.sort_values(
@@ -255,3 +302,153 @@ def scrape_jobs(
         ).reset_index(drop=True)
     else:
         return pd.DataFrame()
+
+
+def scrape_jobs(
+    site_name: str | list[str] | Site | list[Site] | None = None,
+    search_term: str | None = None,
+    google_search_term: str | None = None,
+    location: str | None = None,
+    distance: int | None = 50,
+    is_remote: bool = False,
+    job_type: str | None = None,
+    easy_apply: bool | None = None,
+    results_wanted: int = 15,
+    country_indeed: str = "usa",
+    hyperlinks: bool = False,
+    proxies: list[str] | str | None = None,
+    ca_cert: str | None = None,
+    description_format: str = "markdown",
+    linkedin_fetch_description: bool | None = False,
+    linkedin_company_ids: list[int] | None = None,
+    offset: int | None = 0,
+    hours_old: int = None,
+    posted_since: datetime | None = None,
+    enforce_annual_salary: bool = False,
+    verbose: int = 2,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Simultaneously scrapes job data from multiple job sites.
+    :param posted_since: stop paginating once a page only holds jobs posted before it
+    :return: pandas dataframe containing job data
+    """
+    set_logger_level(verbose)
+    scraper_input = _build_scraper_input(
+        site_name,
+        search_term,
+        google_search_term,
+        location,
+        distance,
+        is_remote,
+        job_type,
+        easy_apply,
+        results_wanted,
+        country_indeed,
+        description_format,
+        linkedin_fetch_description,
+        linkedin_company_ids,
+        offset,
+        hours_old,
+        posted_since,
+    )
+
+    def scrape_site(site: Site) -> Tuple[str, JobResponse]:
+        scraper_class = SCRAPER_MAPPING[site]
+        scraper = scraper_class(proxies=proxies, ca_cert=ca_cert)
+        try:
+            scraped_data: JobResponse = scraper.scrape(scraper_input)
+        finally:
+            scraper.close()
+        cap_name = site.value.capitalize()
+        site_name = "ZipRecruiter" if cap_name == "Zip_recruiter" else cap_name
+        create_logger(site_name).info(f"finished scraping")
+        return site.value, scraped_data
+
+    site_to_jobs_dict = {}
+
+    def worker(site):
+        site_val, scraped_info = scrape_site(site)
+        return site_val, scraped_info
+
+    with ThreadPoolExecutor() as executor:
+        future_to_site = {
+            submit_in_context(executor, worker, site): site
+            for site in scraper_input.site_type
+        }
+
+        for future in as_completed(future_to_site):
+            site_value, scraped_data = future.result()
+            site_to_jobs_dict[site_value] = scraped_data
+
+    return _jobs_to_dataframe(
+        site_to_jobs_dict, scraper_input.country, hyperlinks, enforce_annual_salary
+    )
+
+
+async def scrape_jobs_async(
+    site_name: str | list[str] | Site | list[Site] | None = None,
+    search_term: str | None = None,
+    google_search_term: str | None = None,
+    location: str | None = None,
+    distance: int | None = 50,
+    is_remote: bool = False,
+    job_type: str | None = None,
+    easy_apply: bool | None = None,
+    results_wanted: int = 15,
+    country_indeed: str = "usa",
+    hyperlinks: bool = False,
+    proxies: list[str] | str | None = None,
+    ca_cert: str | None = None,
+    description_format: str = "markdown",
+    linkedin_fetch_description: bool | None = False,
+    linkedin_company_ids: list[int] | None = None,
+    offset: int | None = 0,
+    hours_old: int = None,
+    posted_since: datetime | None = None,
+    enforce_annual_salary: bool = False,
+    verbose: int = 2,
+    **kwargs,
+) -> pd.DataFrame:
+    """
+    Async version of scrape_jobs: every site is scraped concurrently on the
+    running event loop through httpx, so many searches can be awaited
+    together without a thread per request.
+    :param posted_since: stop paginating once a page only holds jobs posted before it
+    :return: pandas dataframe containing job data
+    """
+    set_logger_level(verbose)
+    scraper_input = _build_scraper_input(
+        site_name,
+        search_term,
+        google_search_term,
+        location,
+        distance,
+        is_remote,
+        job_type,
+        easy_apply,
+        results_wanted,
+        country_indeed,
+        description_format,
+        linkedin_fetch_description,
+        linkedin_company_ids,
+        offset,
+        hours_old,
+        posted_since,
+    )
+
+    async def scrape_site(site: Site) -> Tuple[str, JobResponse]:
+        scraper_class = ASYNC_SCRAPER_MAPPING[site]
+        scraper = scraper_class(proxies=proxies, ca_cert=ca_cert)
+        scraped_data: JobResponse = await scraper.scrape(scraper_input)
+        cap_name = site.value.capitalize()
+        site_name = "ZipRecruiter" if cap_name == "Zip_recruiter" else cap_name
+        create_logger(site_name).info(f"finished scraping")
+        return site.value, scraped_data
+
+    results = await asyncio.gather(
+        *(scrape_site(site) for site in scraper_input.site_type)
+    )
+    return _jobs_to_dataframe(
+        dict(results), scraper_input.country, hyperlinks, enforce_annual_salary
+    )
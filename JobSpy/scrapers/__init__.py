@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from datetime import datetime
 from typing import Optional, List, Union
 
+from .sessionpool import release_session
 from ..jobs import (
     Enum,
     BaseModel,
@@ -44,6 +46,7 @@ class ScraperInput(BaseModel):
 
     results_wanted: int = 15
     hours_old: Optional[int] = None
+    posted_since: Optional[datetime] = None
 
 
 class Scraper(ABC):
@@ -60,3 +63,13 @@ class Scraper(ABC):
     @abstractmethod
     def scrape(self, scraper_input: ScraperInput) -> JobResponse:
         ...
+
+    def close(self):
+        """
+        Gives a session borrowed from the session pool back, so the next
+        scraper for this site reuses its open connections.
+        """
+        session = getattr(self, "session", None)
+        if session is not None and getattr(session, "pool_key", None) is not None:
+            release_session(session)
+            self.session = None
@@ -0,0 +1,214 @@
+"""
+jobspy.scrapers.async_utils
+~~~~~~~~~~~~~~~~~~~
+
+Async HTTP sessions used by the async scrapers: AsyncSession is backed by
+httpx; TLSAsyncSession keeps tls_client's browser TLS fingerprint for sites
+behind Cloudflare (Glassdoor) by running its blocking calls in threads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from itertools import cycle
+
+try:
+    import httpx
+except ImportError:  # httpx is only needed for the async API
+    httpx = None
+
+from . import metrics
+from .ratelimit import get_limiter
+from .utils import RETRY_STATUSES, RotatingProxySession, create_session
+
+
+class AsyncSession:
+    """
+    Minimal async counterpart of RequestsRotating/TLSRotating: rotates
+    proxies (one httpx client per proxy), retries on 429/5xx with backoff
+    when has_retry is set, and sends every request through the site's
+    shared rate limiter. As in RequestsRotating, each retry is a separate
+    pass through the limiter.
+    """
+
+    max_retries = 3
+
+    def __init__(
+        self,
+        proxies=None,
+        ca_cert: str | None = None,
+        has_retry: bool = False,
+        delay: int = 1,
+        clear_cookies: bool = False,
+        site: str | None = None,
+        max_connections: int = 100,
+    ):
+        if httpx is None:
+            raise ImportError("the async API requires httpx: pip install httpx")
+        if isinstance(proxies, str):
+            proxies = [proxies]
+        proxy_urls = [
+            RotatingProxySession.format_proxy(proxy)["https"] for proxy in proxies or []
+        ]
+        proxy_urls = [None if url == "http://localhost" else url for url in proxy_urls]
+        self.headers: dict[str, str] = {}
+        self.has_retry = has_retry
+        self.delay = delay
+        self.clear_cookies = clear_cookies
+        self.limiter = get_limiter(site) if site else None
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+        )
+        self.clients = [
+            httpx.AsyncClient(
+                proxy=url,
+                verify=ca_cert if ca_cert else True,
+                limits=limits,
+                follow_redirects=True,
+                timeout=30,
+            )
+            for url in proxy_urls or [None]
+        ]
+        self.client_cycle = cycle(self.clients)
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params=None,
+        data=None,
+        json=None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        allow_redirects: bool = True,
+    ) -> "httpx.Response":
+        client = next(self.client_cycle)
+        if self.clear_cookies:
+            client.cookies.clear()
+        request_headers = {**self.headers, **(headers or {})}
+        kwargs = dict(
+            params=params,
+            json=json,
+            headers=request_headers,
+            follow_redirects=allow_redirects,
+        )
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        if data is not None:
+            kwargs["content" if isinstance(data, (str, bytes)) else "data"] = data
+
+        attempts = self.max_retries + 1 if self.has_retry else 1
+        for attempt in range(attempts):
+            try:
+                response = await self._send(client, method, url, **kwargs)
+            except httpx.TransportError:
+                if attempt == attempts - 1:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                    return response
+            await asyncio.sleep(self.delay * 2**attempt)
+
+    async def _send(self, client, method: str, url: str, **kwargs):
+        try:
+            if self.limiter is None:
+                response = await client.request(method, url, **kwargs)
+            else:
+                async with self.limiter.aslot():
+                    response = await client.request(method, url, **kwargs)
+                self.limiter.record_status(response.status_code)
+        except httpx.HTTPError:
+            metrics.record_error()
+            raise
+        metrics.record_response(response)
+        return response
+
+    async def get(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> "httpx.Response":
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        for client in self.clients:
+            await client.aclose()
+
+
+class TLSAsyncSession:
+    """
+    Async wrapper around a TLSRotating session. httpx cannot impersonate a
+    browser's TLS handshake, and Cloudflare blocks plain clients, so each
+    request runs tls_client in a worker thread. The sync limiter inside
+    TLSRotating still applies, which also bounds how many threads are busy.
+    """
+
+    def __init__(
+        self, proxies=None, ca_cert: str | None = None, site: str | None = None
+    ):
+        self.session = create_session(
+            proxies=proxies, ca_cert=ca_cert, is_tls=True, site=site
+        )
+        self.headers = self.session.headers
+        self.cookies = self.session.cookies
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params=None,
+        data=None,
+        json=None,
+        headers: dict | None = None,
+        timeout: float | None = None,
+        allow_redirects: bool = True,
+    ):
+        return await asyncio.to_thread(
+            self.session.execute_request,
+            method,
+            url,
+            params=params,
+            data=data,
+            json=json,
+            headers=headers,
+            timeout_seconds=timeout,
+            allow_redirects=allow_redirects,
+        )
+
+    async def get(self, url: str, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def close(self):
+        await asyncio.to_thread(self.session.close)
+
+
+def create_async_session(
+    *,
+    proxies: dict | str | None = None,
+    ca_cert: str | None = None,
+    is_tls: bool = False,
+    has_retry: bool = False,
+    delay: int = 1,
+    clear_cookies: bool = False,
+    site: str | None = None,
+) -> AsyncSession | TLSAsyncSession:
+    """
+    Creates an async session with optional tls, proxy, retry and rate-limit
+    settings. is_tls keeps tls_client's fingerprint (no retries, as in sync).
+    :return: An AsyncSession or TLSAsyncSession object
+    """
+    if is_tls:
+        return TLSAsyncSession(proxies=proxies, ca_cert=ca_cert, site=site)
+    return AsyncSession(
+        proxies=proxies,
+        ca_cert=ca_cert,
+        has_retry=has_retry,
+        delay=delay,
+        clear_cookies=clear_cookies,
+        site=site,
+    )
@@ -0,0 +1,176 @@
+"""
+jobspy.scrapers.bootstrap
+~~~~~~~~~~~~~~~~~~~
+
+TTL cache for the artifacts some scrapers fetch before their first search
+request: Glassdoor's CSRF token (read from a whole HTML page) and
+ZipRecruiter's session cookies (a POST to its event API). Without it both
+were fetched again for every (country, site) task. Values are kept per site
+in process and, if a path is configured, in a JSON file so the next run can
+reuse them. Scrapers invalidate a value when the server rejects it, and the
+next fetch() downloads a fresh one.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+DEFAULT_TTL = 30 * 60
+
+# Statuses with which a server rejects a stale token or session cookie
+REJECTED_STATUSES = (401, 403, 419)
+
+
+class BootstrapCache:
+    def __init__(self, ttl: float = DEFAULT_TTL, path: str | None = None):
+        self.ttl = ttl
+        self.path = path
+        self.lock = threading.Lock()
+        # One lock per site, so concurrent tasks wait for a single download
+        self.site_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self.entries: dict[str, dict] = {}
+        self.reset_stats()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError):
+                self.entries = {}
+
+    def reset_stats(self):
+        with self.lock:
+            self.fetched = defaultdict(int)
+            self.cached = defaultdict(int)
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def get(self, site: str):
+        """
+        The cached value for site, or None if there is none or it expired.
+        """
+        with self.lock:
+            entry = self.entries.get(site)
+            if entry is None or entry["expires"] <= time.time():
+                return None
+            self.cached[site] += 1
+            return entry["value"]
+
+    def put(self, site: str, value):
+        with self.lock:
+            self.fetched[site] += 1
+            if value is None:
+                return
+            self.entries[site] = {"value": value, "expires": time.time() + self.ttl}
+            self._save()
+
+    def invalidate(self, site: str, value=None):
+        """
+        Drops the cached value for site. With value, only if it is still the
+        cached one: another task may have refreshed it already.
+        """
+        with self.lock:
+            entry = self.entries.get(site)
+            if entry is None or (value is not None and entry["value"] != value):
+                return
+            del self.entries[site]
+            self._save()
+
+    def fetch(self, site: str, download):
+        """
+        The cached value for site, or the result of download(), which is
+        cached. A None result is not cached.
+        """
+        value = self.get(site)
+        if value is not None:
+            return value
+        with self.site_locks[site]:
+            value = self.get(site)
+            if value is None:
+                value = download()
+                self.put(site, value)
+        return value
+
+    async def afetch(self, site: str, download):
+        """
+        fetch() for async scrapers; download is a coroutine function. Tasks
+        that miss the cache at the same time may each download a value.
+        """
+        value = self.get(site)
+        if value is None:
+            value = await download()
+            self.put(site, value)
+        return value
+
+    def stats(self) -> dict[str, dict]:
+        with self.lock:
+            return {
+                site: {"fetched": self.fetched[site], "cached": self.cached[site]}
+                for site in set(self.fetched) | set(self.cached)
+            }
+
+
+_cache = BootstrapCache()
+
+
+def get_bootstrap_cache() -> BootstrapCache:
+    return _cache
+
+
+def configure_bootstrap_cache(ttl: float | None = None, path: str | None = None):
+    """
+    Sets how long bootstrap artifacts are reused and, optionally, a JSON file
+    that keeps them between runs. Replaces the current cache.
+    """
+    global _cache
+    _cache = BootstrapCache(ttl=DEFAULT_TTL if ttl is None else ttl, path=path)
+
+
+def bootstrap_stats() -> dict[str, dict]:
+    """
+    Per site: bootstrap downloads and lookups served from the cache since the
+    last reset_bootstrap_stats().
+    """
+    return _cache.stats()
+
+
+def reset_bootstrap_stats():
+    _cache.reset_stats()
+
+
+def dump_cookies(jar) -> list[dict]:
+    """
+    The cookies of a session's jar as JSON-serializable dicts.
+    """
+    return [
+        {
+            "name": cookie.name,
+            "value": cookie.value,
+            "domain": cookie.domain,
+            "path": cookie.path,
+            "secure": cookie.secure,
+            "expires": cookie.expires,
+        }
+        for cookie in jar
+    ]
+
+
+def load_cookies(jar, cookies: list[dict]):
+    for cookie in cookies:
+        jar.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie["domain"],
+            path=cookie["path"],
+            secure=cookie["secure"],
+            expires=cookie["expires"],
+        )
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import re
 import json
+import asyncio
 import requests
 from typing import Optional, Tuple
 from datetime import datetime, timedelta
@@ -18,9 +19,15 @@ from .constants import fallback_token, query_template, headers
 from .. import Scraper, ScraperInput, Site
 from ..utils import extract_emails_from_text, create_logger
 from ..exceptions import GlassdoorException
+from ..async_utils import create_async_session
+from ..bootstrap import REJECTED_STATUSES, get_bootstrap_cache
+from ..metrics import record_page, submit_in_context
+from ..sessionpool import borrow_session
+from ..stopsignal import stop_requested
+from ..parsing import aparse_later, aresolve, parse_later, resolve
 from ..utils import (
-    create_session,
     markdown_converter,
+    is_page_stale,
 )
 from ...jobs import (
     JobPost,
@@ -52,6 +59,8 @@ class GlassdoorScraper(Scraper):
         self.jobs_per_page = 30
         self.max_pages = 30
         self.seen_urls = set()
+        self.csrf_token = None
+        self.headers = headers
 
     def scrape(self, scraper_input: ScraperInput) -> JobResponse:
         """
@@ -59,16 +68,15 @@ class GlassdoorScraper(Scraper):
         :param scraper_input: Information about job search criteria.
         :return: JobResponse containing a list of jobs.
         """
-        self.scraper_input = scraper_input
-        self.scraper_input.results_wanted = min(900, scraper_input.results_wanted)
-        self.base_url = self.scraper_input.country.get_glassdoor_url()
-
-        self.session = create_session(
-            proxies=self.proxies, ca_cert=self.ca_cert, is_tls=True, has_retry=True
+        self._prepare(scraper_input)
+        self.session = borrow_session(
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            is_tls=True,
+            has_retry=True,
+            site=self.site.value,
         )
-        token = self._get_csrf_token()
-        headers["gd-csrf-token"] = token if token else fallback_token
-        self.session.headers.update(headers)
+        self._set_csrf_token(self._get_csrf_token())
 
         location_id, location_type = self._get_location(
             scraper_input.location, scraper_input.is_remote
@@ -79,9 +87,7 @@ class GlassdoorScraper(Scraper):
         job_list: list[JobPost] = []
         cursor = None
 
-        range_start = 1 + (scraper_input.offset // self.jobs_per_page)
-        tot_pages = (scraper_input.results_wanted // self.jobs_per_page) + 2
-        range_end = min(tot_pages, self.max_pages + 1)
+        range_start, range_end = self._page_range(scraper_input)
         for page in range(range_start, range_end):
             logger.info(f"search page: {page} / {range_end-1}")
             try:
@@ -92,11 +98,28 @@ class GlassdoorScraper(Scraper):
                 if not jobs or len(job_list) >= scraper_input.results_wanted:
                     job_list = job_list[: scraper_input.results_wanted]
                     break
+                if is_page_stale(jobs, scraper_input.posted_since):
+                    logger.info(f"page {page} is older than {scraper_input.posted_since}")
+                    break
+                if stop_requested():
+                    logger.info("stop requested, returning the jobs found so far")
+                    break
             except Exception as e:
                 logger.error(f"Glassdoor: {str(e)}")
                 break
         return JobResponse(jobs=job_list)
 
+    def _prepare(self, scraper_input: ScraperInput):
+        self.scraper_input = scraper_input
+        self.scraper_input.results_wanted = min(900, scraper_input.results_wanted)
+        self.base_url = self.scraper_input.country.get_glassdoor_url()
+
+    def _page_range(self, scraper_input: ScraperInput) -> Tuple[int, int]:
+        range_start = 1 + (scraper_input.offset // self.jobs_per_page)
+        tot_pages = (scraper_input.results_wanted // self.jobs_per_page) + 2
+        range_end = min(tot_pages, self.max_pages + 1)
+        return range_start, range_end
+
     def _fetch_jobs_page(
         self,
         scraper_input: ScraperInput,
@@ -112,17 +135,12 @@ class GlassdoorScraper(Scraper):
         self.scraper_input = scraper_input
         try:
             payload = self._add_payload(location_id, location_type, page_num, cursor)
-            response = self.session.post(
-                f"{self.base_url}/graph",
-                timeout_seconds=15,
-                data=payload,
-            )
+            record_page()
+            response = self._post_graph(payload)
             if response.status_code != 200:
                 exc_msg = f"bad response status code: {response.status_code}"
                 raise GlassdoorException(exc_msg)
-            res_json = response.json()[0]
-            if "errors" in res_json:
-                raise ValueError("Error encountered in API response")
+            res_json = self._parse_jobs_response(response.json())
         except (
             requests.exceptions.ReadTimeout,
             GlassdoorException,
@@ -134,43 +152,136 @@ class GlassdoorScraper(Scraper):
 
         jobs_data = res_json["data"]["jobListings"]["jobListings"]
 
+        # The threads only fetch descriptions; converting them runs on the
+        # parse pool and the JobPosts are assembled here
         with ThreadPoolExecutor(max_workers=self.jobs_per_page) as executor:
             future_to_job_data = {
-                executor.submit(self._process_job, job): job for job in jobs_data
+                submit_in_context(executor, self._fetch_job, job): job
+                for job in jobs_data
             }
             for future in as_completed(future_to_job_data):
                 try:
-                    job_post = future.result()
-                    if job_post:
-                        jobs.append(job_post)
+                    fetched = future.result()
+                    if fetched:
+                        job_data, description = fetched
+                        jobs.append(
+                            self._parse_job(job_data, self._resolve_description(description))
+                        )
                 except Exception as exc:
                     raise GlassdoorException(f"Glassdoor generated an exception: {exc}")
 
-        return jobs, self.get_cursor_for_page(
+        return jobs, self._next_cursor(res_json, page_num)
+
+    @staticmethod
+    def _parse_jobs_response(data: list) -> dict:
+        res_json = data[0]
+        if "errors" in res_json:
+            raise ValueError("Error encountered in API response")
+        return res_json
+
+    def _next_cursor(self, res_json: dict, page_num: int) -> str | None:
+        return self.get_cursor_for_page(
             res_json["data"]["jobListings"]["paginationCursors"], page_num + 1
         )
 
+    def _post_graph(self, payload: str):
+        """
+        POSTs to the GraphQL API. If the server rejects the CSRF token, the
+        cached one is dropped and the request is sent once more with a new one.
+        """
+        response = self.session.post(
+            f"{self.base_url}/graph", timeout_seconds=15, data=payload
+        )
+        if response.status_code in REJECTED_STATUSES and self._refresh_csrf_token():
+            response = self.session.post(
+                f"{self.base_url}/graph", timeout_seconds=15, data=payload
+            )
+        return response
+
     def _get_csrf_token(self):
         """
-        Fetches csrf token needed for API by visiting a generic page
+        Fetches csrf token needed for API by visiting a generic page. The
+        token is cached per site (see bootstrap.py), so the page is only
+        downloaded once per TTL, not once per country.
+        """
+        return get_bootstrap_cache().fetch(self.site.value, self._download_csrf_token)
+
+    def _download_csrf_token(self):
+        res = self.session.get(self._csrf_token_url())
+        return self._parse_csrf_token(res.text)
+
+    def _refresh_csrf_token(self) -> bool:
         """
-        res = self.session.get(f"{self.base_url}/Job/computer-science-jobs.htm")
+        Replaces a rejected token. False if no new token could be obtained.
+        """
+        get_bootstrap_cache().invalidate(self.site.value, self.csrf_token)
+        token = self._get_csrf_token()
+        if token is None or token == self.csrf_token:
+            return False
+        self._set_csrf_token(token)
+        return True
+
+    def _set_csrf_token(self, token: str | None):
+        self.csrf_token = token
+        self.headers = {**headers, "gd-csrf-token": token if token else fallback_token}
+        self.session.headers.update(self.headers)
+
+    def _csrf_token_url(self) -> str:
+        return f"{self.base_url}/Job/computer-science-jobs.htm"
+
+    @staticmethod
+    def _parse_csrf_token(text: str) -> str | None:
         pattern = r'"token":\s*"([^"]+)"'
-        matches = re.findall(pattern, res.text)
+        matches = re.findall(pattern, text)
         token = None
         if matches:
             token = matches[0]
         return token
 
+    def _is_new_listing(self, job_id) -> bool:
+        job_url = f"{self.base_url}job-listing/j?jl={job_id}"
+        if job_url in self.seen_urls:
+            return False
+        self.seen_urls.add(job_url)
+        return True
+
+    def _fetch_job(self, job_data):
+        """
+        Fetch stage for a single job: its description, as a parse pool Future
+        when it still has to be converted.
+        """
+        job_id = job_data["jobview"]["job"]["listingId"]
+        if not self._is_new_listing(job_id):
+            return None
+        try:
+            description = self._fetch_job_description(job_id)
+        except:
+            description = None
+        return job_data, description
+
+    @staticmethod
+    def _resolve_description(description) -> str | None:
+        try:
+            return resolve(description)
+        except:
+            return None
+
     def _process_job(self, job_data):
         """
         Processes a single job and fetches its description.
         """
+        fetched = self._fetch_job(job_data)
+        if fetched is None:
+            return None
+        job_data, description = fetched
+        return self._parse_job(job_data, self._resolve_description(description))
+
+    def _parse_job(self, job_data: dict, description: str | None) -> JobPost:
+        """
+        Builds the JobPost for a listing once its description is known.
+        """
         job_id = job_data["jobview"]["job"]["listingId"]
         job_url = f"{self.base_url}job-listing/j?jl={job_id}"
-        if job_url in self.seen_urls:
-            return None
-        self.seen_urls.add(job_url)
         job = job_data["jobview"]
         title = job["job"]["jobTitleText"]
         company_name = job["header"]["employerNameFromSearch"]
@@ -188,10 +299,6 @@ class GlassdoorScraper(Scraper):
             location = self.parse_location(location_name)
 
         compensation = self.parse_compensation(job["header"])
-        try:
-            description = self._fetch_job_description(job_id)
-        except:
-            description = None
         company_url = f"{self.base_url}Overview/W-EI_IE{company_id}.htm"
         company_logo = (
             job_data["jobview"].get("overview", {}).get("squareLogoUrl", None)
@@ -222,8 +329,21 @@ class GlassdoorScraper(Scraper):
         """
         Fetches the job description for a single job ID.
         """
-        url = f"{self.base_url}/graph"
-        body = [
+        res = requests.post(
+            f"{self.base_url}/graph",
+            json=self._job_description_body(job_id),
+            headers=self.headers,
+        )
+        if res.status_code != 200:
+            return None
+        desc = self._job_description_html(res.json())
+        if self._wants_markdown():
+            return parse_later(markdown_converter, desc)
+        return desc
+
+    @staticmethod
+    def _job_description_body(job_id) -> list[dict]:
+        return [
             {
                 "operationName": "JobDetailQuery",
                 "variables": {
@@ -247,29 +367,34 @@ class GlassdoorScraper(Scraper):
                 """,
             }
         ]
-        res = requests.post(url, json=body, headers=headers)
-        if res.status_code != 200:
-            return None
-        data = res.json()[0]
-        desc = data["data"]["jobview"]["job"]["description"]
-        if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
-            desc = markdown_converter(desc)
-        return desc
+
+    @staticmethod
+    def _job_description_html(data: list) -> str | None:
+        return data[0]["data"]["jobview"]["job"]["description"]
+
+    def _wants_markdown(self) -> bool:
+        return self.scraper_input.description_format == DescriptionFormat.MARKDOWN
 
     def _get_location(self, location: str, is_remote: bool) -> (int, str):
         if not location or is_remote:
             return "11047", "STATE"  # remote options
-        url = f"{self.base_url}/findPopularLocationAjax.htm?maxLocationsToReturn=10&term={location}"
-        res = self.session.get(url)
-        if res.status_code != 200:
-            if res.status_code == 429:
+        res = self.session.get(self._location_url(location))
+        return self._parse_location_response(location, res.status_code, res)
+
+    def _location_url(self, location: str) -> str:
+        return f"{self.base_url}/findPopularLocationAjax.htm?maxLocationsToReturn=10&term={location}"
+
+    @staticmethod
+    def _parse_location_response(location: str, status_code: int, res) -> (int, str):
+        if status_code != 200:
+            if status_code == 429:
                 err = f"429 Response - Blocked by Glassdoor for too many requests"
                 logger.error(err)
                 return None, None
             else:
-                err = f"Glassdoor response status code {res.status_code}"
+                err = f"Glassdoor response status code {status_code}"
                 err += f" - {res.text}"
-                logger.error(f"Glassdoor response status code {res.status_code}")
+                logger.error(f"Glassdoor response status code {status_code}")
                 return None, None
         items = res.json()
 
@@ -362,3 +487,140 @@ class GlassdoorScraper(Scraper):
         for cursor_data in pagination_cursors:
             if cursor_data["pageNumber"] == page_num:
                 return cursor_data["cursor"]
+
+
+class AsyncGlassdoorScraper(GlassdoorScraper):
+    """
+    Async Glassdoor scraper: same requests and parsing as GlassdoorScraper,
+    with the page's job descriptions fetched concurrently. Requests go through
+    tls_client (TLSAsyncSession) like the sync scraper, since Glassdoor's
+    Cloudflare front blocks clients without a browser TLS fingerprint.
+    """
+
+    async def scrape(self, scraper_input: ScraperInput) -> JobResponse:
+        self._prepare(scraper_input)
+        self.session = create_async_session(
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            is_tls=True,
+            has_retry=True,
+            site=self.site.value,
+        )
+        job_list: list[JobPost] = []
+        try:
+            self._set_csrf_token(await self._aget_csrf_token())
+
+            location_id, location_type = await self._get_location(
+                scraper_input.location, scraper_input.is_remote
+            )
+            if location_type is None:
+                logger.error("Glassdoor: location not parsed")
+                return JobResponse(jobs=[])
+            cursor = None
+
+            range_start, range_end = self._page_range(scraper_input)
+            for page in range(range_start, range_end):
+                logger.info(f"search page: {page} / {range_end-1}")
+                try:
+                    jobs, cursor = await self._fetch_jobs_page(
+                        scraper_input, location_id, location_type, page, cursor
+                    )
+                    job_list.extend(jobs)
+                    if not jobs or len(job_list) >= scraper_input.results_wanted:
+                        job_list = job_list[: scraper_input.results_wanted]
+                        break
+                    if is_page_stale(jobs, scraper_input.posted_since):
+                        logger.info(f"page {page} is older than {scraper_input.posted_since}")
+                        break
+                    if stop_requested():
+                        logger.info("stop requested, returning the jobs found so far")
+                        break
+                except Exception as e:
+                    logger.error(f"Glassdoor: {str(e)}")
+                    break
+        finally:
+            await self.session.close()
+        return JobResponse(jobs=job_list)
+
+    async def _aget_csrf_token(self):
+        return await get_bootstrap_cache().afetch(
+            self.site.value, self._adownload_csrf_token
+        )
+
+    async def _adownload_csrf_token(self):
+        res = await self.session.get(self._csrf_token_url())
+        return self._parse_csrf_token(res.text)
+
+    async def _post_graph(self, payload: str):
+        response = await self.session.post(
+            f"{self.base_url}/graph", data=payload, timeout=15
+        )
+        if response.status_code in REJECTED_STATUSES:
+            get_bootstrap_cache().invalidate(self.site.value, self.csrf_token)
+            token = await self._aget_csrf_token()
+            if token is not None and token != self.csrf_token:
+                self._set_csrf_token(token)
+                response = await self.session.post(
+                    f"{self.base_url}/graph", data=payload, timeout=15
+                )
+        return response
+
+    async def _get_location(self, location: str, is_remote: bool) -> (int, str):
+        if not location or is_remote:
+            return "11047", "STATE"  # remote options
+        res = await self.session.get(self._location_url(location))
+        return self._parse_location_response(location, res.status_code, res)
+
+    async def _fetch_jobs_page(
+        self,
+        scraper_input: ScraperInput,
+        location_id: int,
+        location_type: str,
+        page_num: int,
+        cursor: str | None,
+    ) -> Tuple[list[JobPost], str | None]:
+        self.scraper_input = scraper_input
+        try:
+            payload = self._add_payload(location_id, location_type, page_num, cursor)
+            record_page()
+            response = await self._post_graph(payload)
+            if response.status_code != 200:
+                exc_msg = f"bad response status code: {response.status_code}"
+                raise GlassdoorException(exc_msg)
+            res_json = self._parse_jobs_response(response.json())
+        except Exception as e:
+            logger.error(f"Glassdoor: {str(e)}")
+            return [], None
+
+        jobs_data = res_json["data"]["jobListings"]["jobListings"]
+        results = await asyncio.gather(
+            *(self._process_job(job) for job in jobs_data), return_exceptions=True
+        )
+        jobs = []
+        for result in results:
+            if isinstance(result, Exception):
+                raise GlassdoorException(f"Glassdoor generated an exception: {result}")
+            if result:
+                jobs.append(result)
+        return jobs, self._next_cursor(res_json, page_num)
+
+    async def _process_job(self, job_data):
+        job_id = job_data["jobview"]["job"]["listingId"]
+        if not self._is_new_listing(job_id):
+            return None
+        try:
+            description = await aresolve(await self._fetch_job_description(job_id))
+        except:
+            description = None
+        return self._parse_job(job_data, description)
+
+    async def _fetch_job_description(self, job_id):
+        res = await self.session.post(
+            f"{self.base_url}/graph", json=self._job_description_body(job_id)
+        )
+        if res.status_code != 200:
+            return None
+        desc = self._job_description_html(res.json())
+        if self._wants_markdown():
+            return await aparse_later(markdown_converter, desc)
+        return desc
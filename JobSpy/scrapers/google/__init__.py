@@ -15,9 +15,13 @@ from datetime import datetime, timedelta
 
 from .constants import headers_jobs, headers_initial, async_param
 from .. import Scraper, ScraperInput, Site
+from ..async_utils import create_async_session
+from ..metrics import record_page
+from ..sessionpool import borrow_session
+from ..stopsignal import stop_requested
 from ..utils import extract_emails_from_text, create_logger, extract_job_type
 from ..utils import (
-    create_session,
+    is_page_stale,
 )
 from ...jobs import (
     JobPost,
@@ -56,8 +60,12 @@ class GoogleJobsScraper(Scraper):
         self.scraper_input = scraper_input
         self.scraper_input.results_wanted = min(900, scraper_input.results_wanted)
 
-        self.session = create_session(
-            proxies=self.proxies, ca_cert=self.ca_cert, is_tls=False, has_retry=True
+        self.session = borrow_session(
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            is_tls=False,
+            has_retry=True,
+            site=self.site.value,
         )
         forward_cursor, job_list = self._get_initial_cursor_and_jobs()
         if forward_cursor is None:
@@ -85,6 +93,12 @@ class GoogleJobsScraper(Scraper):
                 break
             job_list += jobs
             page += 1
+            if is_page_stale(jobs, scraper_input.posted_since):
+                logger.info(f"page {page - 1} is older than {scraper_input.posted_since}")
+                break
+            if stop_requested():
+                logger.info("stop requested, returning the jobs found so far")
+                break
         return JobResponse(
             jobs=job_list[
                 scraper_input.offset : scraper_input.offset
@@ -94,6 +108,13 @@ class GoogleJobsScraper(Scraper):
 
     def _get_initial_cursor_and_jobs(self) -> Tuple[str, list[JobPost]]:
         """Gets initial cursor and jobs to paginate through job listings"""
+        record_page()
+        response = self.session.get(
+            self.url, headers=headers_initial, params=self._initial_query_params()
+        )
+        return self._parse_initial_page(response.text)
+
+    def _initial_query_params(self) -> dict:
         query = f"{self.scraper_input.search_term} jobs"
 
         def get_time_range(hours_old):
@@ -129,13 +150,13 @@ class GoogleJobsScraper(Scraper):
         if self.scraper_input.google_search_term:
             query = self.scraper_input.google_search_term
 
-        params = {"q": query, "udm": "8"}
-        response = self.session.get(self.url, headers=headers_initial, params=params)
+        return {"q": query, "udm": "8"}
 
+    def _parse_initial_page(self, html_text: str) -> Tuple[str, list[JobPost]]:
         pattern_fc = r'<div jsname="Yust4d"[^>]+data-async-fc="([^"]+)"'
-        match_fc = re.search(pattern_fc, response.text)
+        match_fc = re.search(pattern_fc, html_text)
         data_async_fc = match_fc.group(1) if match_fc else None
-        jobs_raw = self._find_job_info_initial_page(response.text)
+        jobs_raw = self._find_job_info_initial_page(html_text)
         jobs = []
         for job_raw in jobs_raw:
             job_post = self._parse_job(job_raw)
@@ -144,10 +165,18 @@ class GoogleJobsScraper(Scraper):
         return data_async_fc, jobs
 
     def _get_jobs_next_page(self, forward_cursor: str) -> Tuple[list[JobPost], str]:
-        params = {"fc": [forward_cursor], "fcv": ["3"], "async": [async_param]}
-        response = self.session.get(self.jobs_url, headers=headers_jobs, params=params)
+        record_page()
+        response = self.session.get(
+            self.jobs_url,
+            headers=headers_jobs,
+            params=self._next_page_params(forward_cursor),
+        )
         return self._parse_jobs(response.text)
 
+    @staticmethod
+    def _next_page_params(forward_cursor: str) -> dict:
+        return {"fc": [forward_cursor], "fcv": ["3"], "async": [async_param]}
+
     def _parse_jobs(self, job_data: str) -> Tuple[list[JobPost], str]:
         """
         Parses jobs on a page with next page cursor
@@ -245,3 +274,71 @@ class GoogleJobsScraper(Scraper):
                 logger.error(f"Failed to parse match: {str(e)}")
                 results.append({"raw_match": match.group(0), "error": str(e)})
         return results
+
+
+class AsyncGoogleJobsScraper(GoogleJobsScraper):
+    """
+    Async Google scraper: same requests and parsing as GoogleJobsScraper,
+    awaited on an AsyncSession.
+    """
+
+    async def scrape(self, scraper_input: ScraperInput) -> JobResponse:
+        self.scraper_input = scraper_input
+        self.scraper_input.results_wanted = min(900, scraper_input.results_wanted)
+
+        self.session = create_async_session(
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            has_retry=True,
+            site=self.site.value,
+        )
+        try:
+            record_page()
+            response = await self.session.get(
+                self.url, headers=headers_initial, params=self._initial_query_params()
+            )
+            forward_cursor, job_list = self._parse_initial_page(response.text)
+            if forward_cursor is None:
+                logger.debug(
+                    "No forward_cursor found; possibly only 10 or fewer results returned by Google."
+                )
+                return JobResponse(jobs=job_list)
+
+            page = 1
+            while (
+                len(self.seen_urls) < scraper_input.results_wanted + scraper_input.offset
+                and forward_cursor
+            ):
+                logger.info(
+                    f"search page: {page} / {math.ceil(scraper_input.results_wanted / self.jobs_per_page)}"
+                )
+                try:
+                    record_page()
+                    response = await self.session.get(
+                        self.jobs_url,
+                        headers=headers_jobs,
+                        params=self._next_page_params(forward_cursor),
+                    )
+                    jobs, forward_cursor = self._parse_jobs(response.text)
+                except Exception as e:
+                    logger.error(f"failed to get jobs on page: {page}, {e}")
+                    break
+                if not jobs:
+                    logger.info(f"found no jobs on page: {page}")
+                    break
+                job_list += jobs
+                page += 1
+                if is_page_stale(jobs, scraper_input.posted_since):
+                    logger.info(f"page {page - 1} is older than {scraper_input.posted_since}")
+                    break
+                if stop_requested():
+                    logger.info("stop requested, returning the jobs found so far")
+                    break
+        finally:
+            await self.session.close()
+        return JobResponse(
+            jobs=job_list[
+                scraper_input.offset : scraper_input.offset
+                + scraper_input.results_wanted
+            ]
+        )
@@ -13,12 +13,17 @@ from datetime import datetime
 
 from .constants import job_search_query, api_headers
 from .. import Scraper, ScraperInput, Site
+from ..async_utils import create_async_session
+from ..metrics import record_page
+from ..sessionpool import borrow_session
+from ..stopsignal import stop_requested
+from ..parsing import aparse_later, aresolve, parse_later, resolve
 from ..utils import (
     extract_emails_from_text,
     get_enum_from_job_type,
     markdown_converter,
-    create_session,
     create_logger,
+    is_page_stale,
 )
 from ...jobs import (
     JobPost,
@@ -40,10 +45,10 @@ class IndeedScraper(Scraper):
         """
         Initializes IndeedScraper with the Indeed API url
         """
-        super().__init__(Site.INDEED, proxies=proxies)
+        super().__init__(Site.INDEED, proxies=proxies, ca_cert=ca_cert)
 
-        self.session = create_session(
-            proxies=self.proxies, ca_cert=ca_cert, is_tls=False
+        self.session = borrow_session(
+            proxies=self.proxies, ca_cert=ca_cert, is_tls=False, site=self.site.value
         )
         self.scraper_input = None
         self.jobs_per_page = 100
@@ -60,11 +65,7 @@ class IndeedScraper(Scraper):
         :param scraper_input:
         :return: job_response
         """
-        self.scraper_input = scraper_input
-        domain, self.api_country_code = self.scraper_input.country.indeed_domain_value
-        self.base_url = f"https://{domain}.indeed.com"
-        self.headers = api_headers.copy()
-        self.headers["indeed-co"] = self.scraper_input.country.indeed_domain_value
+        self._prepare(scraper_input)
         job_list = []
         page = 1
 
@@ -80,6 +81,12 @@ class IndeedScraper(Scraper):
                 break
             job_list += jobs
             page += 1
+            if is_page_stale(jobs, scraper_input.posted_since):
+                logger.info(f"page {page - 1} is older than {scraper_input.posted_since}")
+                break
+            if stop_requested():
+                logger.info("stop requested, returning the jobs found so far")
+                break
         return JobResponse(
             jobs=job_list[
                 scraper_input.offset : scraper_input.offset
@@ -87,14 +94,39 @@ class IndeedScraper(Scraper):
             ]
         )
 
+    def _prepare(self, scraper_input: ScraperInput):
+        self.scraper_input = scraper_input
+        domain, self.api_country_code = self.scraper_input.country.indeed_domain_value
+        self.base_url = f"https://{domain}.indeed.com"
+        self.headers = api_headers.copy()
+        self.headers["indeed-co"] = self.scraper_input.country.indeed_domain_value
+
     def _scrape_page(self, cursor: str | None) -> Tuple[list[JobPost], str | None]:
         """
         Scrapes a page of Indeed for jobs with scraper_input criteria
         :param cursor:
         :return: jobs found on page, next page cursor
         """
-        jobs = []
-        new_cursor = None
+        payload, api_headers_temp = self._page_request(cursor)
+        record_page()
+        response = self.session.post(
+            self.api_url,
+            headers=api_headers_temp,
+            json=payload,
+            timeout=10,
+        )
+        if not response.ok:
+            logger.info(
+                f"responded with status code: {response.status_code} (submit GitHub issue if this appears to be a bug)"
+            )
+            return [], None
+        return self._parse_page(response.json())
+
+    def _page_request(self, cursor: str | None) -> Tuple[dict, dict]:
+        """
+        Builds the GraphQL payload and headers for a search page
+        :return: payload, headers
+        """
         filters = self._build_filters()
         search_term = (
             self.scraper_input.search_term.replace('"', '\\"')
@@ -117,29 +149,44 @@ class IndeedScraper(Scraper):
         }
         api_headers_temp = api_headers.copy()
         api_headers_temp["indeed-co"] = self.api_country_code
-        response = self.session.post(
-            self.api_url,
-            headers=api_headers_temp,
-            json=payload,
-            timeout=10,
-        )
-        if not response.ok:
-            logger.info(
-                f"responded with status code: {response.status_code} (submit GitHub issue if this appears to be a bug)"
-            )
-            return jobs, new_cursor
-        data = response.json()
-        jobs = data["data"]["jobSearch"]["results"]
-        new_cursor = data["data"]["jobSearch"]["pageInfo"]["nextCursor"]
-
-        job_list = []
-        for job in jobs:
-            processed_job = self._process_job(job["job"])
-            if processed_job:
-                job_list.append(processed_job)
+        return payload, api_headers_temp
 
+    def _parse_page(self, data: dict) -> Tuple[list[JobPost], str | None]:
+        """
+        Parses a search page response into jobs and the next page cursor
+        """
+        jobs, new_cursor = self._new_jobs(data)
+        # Every description is queued on the parse pool before any is awaited
+        descriptions = [
+            parse_later(markdown_converter, job["description"]["html"])
+            if self._wants_markdown()
+            else job["description"]["html"]
+            for job in jobs
+        ]
+        job_list = [
+            self._process_job(job, resolve(description))
+            for job, description in zip(jobs, descriptions)
+        ]
         return job_list, new_cursor
 
+    def _new_jobs(self, data: dict) -> Tuple[list[dict], str | None]:
+        """
+        Jobs on a search page not seen before, and the next page cursor
+        """
+        new_cursor = data["data"]["jobSearch"]["pageInfo"]["nextCursor"]
+        jobs = []
+        for result in data["data"]["jobSearch"]["results"]:
+            job = result["job"]
+            job_url = f'{self.base_url}/viewjob?jk={job["key"]}'
+            if job_url in self.seen_urls:
+                continue
+            self.seen_urls.add(job_url)
+            jobs.append(job)
+        return jobs, new_cursor
+
+    def _wants_markdown(self) -> bool:
+        return self.scraper_input.description_format == DescriptionFormat.MARKDOWN
+
     def _build_filters(self):
         """
         Builds the filters dict for job type/is_remote. If hours_old is provided, composite filter for job_type/is_remote is not possible.
@@ -198,20 +245,14 @@ class IndeedScraper(Scraper):
                 """
         return filters_str
 
-    def _process_job(self, job: dict) -> JobPost | None:
+    def _process_job(self, job: dict, description: str) -> JobPost:
         """
         Parses the job dict into JobPost model
         :param job: dict to parse
-        :return: JobPost if it's a new job
+        :param description: the job's description, already converted
+        :return: JobPost
         """
         job_url = f'{self.base_url}/viewjob?jk={job["key"]}'
-        if job_url in self.seen_urls:
-            return
-        self.seen_urls.add(job_url)
-        description = job["description"]["html"]
-        if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
-            description = markdown_converter(description)
-
         job_type = self._get_job_type(job["attributes"])
         timestamp_seconds = job["datePublished"] / 1000
         date_posted = datetime.fromtimestamp(timestamp_seconds).strftime("%Y-%m-%d")
@@ -347,3 +388,73 @@ class IndeedScraper(Scraper):
             return CompensationInterval[mapped_interval]
         else:
             raise ValueError(f"Unsupported interval: {interval}")
+
+
+class AsyncIndeedScraper(IndeedScraper):
+    """
+    Async Indeed scraper: same requests and parsing as IndeedScraper, with
+    the HTTP calls awaited on an AsyncSession.
+    """
+
+    async def scrape(self, scraper_input: ScraperInput) -> JobResponse:
+        self._prepare(scraper_input)
+        # The sync session borrowed in __init__ is not used here
+        self.close()
+        self.session = create_async_session(
+            proxies=self.proxies, ca_cert=self.ca_cert, site=self.site.value
+        )
+        job_list = []
+        page = 1
+        cursor = None
+        try:
+            while (
+                len(self.seen_urls) < scraper_input.results_wanted + scraper_input.offset
+            ):
+                logger.info(
+                    f"search page: {page} / {math.ceil(scraper_input.results_wanted / self.jobs_per_page)}"
+                )
+                jobs, cursor = await self._scrape_page(cursor)
+                if not jobs:
+                    logger.info(f"found no jobs on page: {page}")
+                    break
+                job_list += jobs
+                page += 1
+                if is_page_stale(jobs, scraper_input.posted_since):
+                    logger.info(f"page {page - 1} is older than {scraper_input.posted_since}")
+                    break
+                if stop_requested():
+                    logger.info("stop requested, returning the jobs found so far")
+                    break
+        finally:
+            await self.session.close()
+        return JobResponse(
+            jobs=job_list[
+                scraper_input.offset : scraper_input.offset
+                + scraper_input.results_wanted
+            ]
+        )
+
+    async def _scrape_page(self, cursor: str | None) -> Tuple[list[JobPost], str | None]:
+        payload, api_headers_temp = self._page_request(cursor)
+        record_page()
+        response = await self.session.post(
+            self.api_url,
+            headers=api_headers_temp,
+            json=payload,
+            timeout=10,
+        )
+        if not response.is_success:
+            logger.info(f"responded with status code: {response.status_code}")
+            return [], None
+        jobs, new_cursor = self._new_jobs(response.json())
+        descriptions = [
+            await aparse_later(markdown_converter, job["description"]["html"])
+            if self._wants_markdown()
+            else job["description"]["html"]
+            for job in jobs
+        ]
+        job_list = [
+            self._process_job(job, await aresolve(description))
+            for job, description in zip(jobs, descriptions)
+        ]
+        return job_list, new_cursor
@@ -10,8 +10,10 @@ from __future__ import annotations
 import math
 import time
 import random
+import asyncio
 import regex as re
 from typing import Optional
+from concurrent.futures import Future
 from datetime import datetime
 
 from bs4.element import Tag
@@ -21,7 +23,12 @@ from urllib.parse import urlparse, urlunparse, unquote
 from .constants import headers
 from .. import Scraper, ScraperInput, Site
 from ..exceptions import LinkedInException
-from ..utils import create_session, remove_attributes, create_logger
+from ..async_utils import create_async_session
+from ..metrics import record_page
+from ..parsing import aparse_later, aresolve, parse_later, resolve
+from ..sessionpool import borrow_session
+from ..stopsignal import stop_requested
+from ..utils import remove_attributes, create_logger
 from ...jobs import (
     JobPost,
     Location,
@@ -36,6 +43,7 @@ from ..utils import (
     get_enum_from_job_type,
     currency_parser,
     markdown_converter,
+    is_page_stale,
 )
 
 logger = create_logger("LinkedIn")
@@ -43,6 +51,8 @@ logger = create_logger("LinkedIn")
 
 class LinkedInScraper(Scraper):
     base_url = "https://www.linkedin.com"
+    search_url = f"{base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search?"
+    job_url_direct_regex = re.compile(r'(?<=\?url=)[^"]+')
     delay = 3
     band_delay = 4
     jobs_per_page = 25
@@ -54,18 +64,18 @@ class LinkedInScraper(Scraper):
         Initializes LinkedInScraper with the LinkedIn job search url
         """
         super().__init__(Site.LINKEDIN, proxies=proxies, ca_cert=ca_cert)
-        self.session = create_session(
+        self.session = borrow_session(
             proxies=self.proxies,
             ca_cert=ca_cert,
             is_tls=False,
             has_retry=True,
             delay=5,
             clear_cookies=True,
+            site=self.site.value,
         )
         self.session.headers.update(headers)
         self.scraper_input = None
         self.country = "worldwide"
-        self.job_url_direct_regex = re.compile(r'(?<=\?url=)[^"]+')
 
     def scrape(self, scraper_input: ScraperInput) -> JobResponse:
         """
@@ -89,50 +99,17 @@ class LinkedInScraper(Scraper):
             logger.info(
                 f"search page: {request_count} / {math.ceil(scraper_input.results_wanted / 10)}"
             )
-            params = {
-                "keywords": scraper_input.search_term,
-                "location": scraper_input.location,
-                "distance": scraper_input.distance,
-                "f_WT": 2 if scraper_input.is_remote else None,
-                "f_JT": (
-                    self.job_type_code(scraper_input.job_type)
-                    if scraper_input.job_type
-                    else None
-                ),
-                "pageNum": 0,
-                "start": start,
-                "f_AL": "true" if scraper_input.easy_apply else None,
-                "f_C": (
-                    ",".join(map(str, scraper_input.linkedin_company_ids))
-                    if scraper_input.linkedin_company_ids
-                    else None
-                ),
-            }
-            if seconds_old is not None:
-                params["f_TPR"] = f"r{seconds_old}"
-
-            params = {k: v for k, v in params.items() if v is not None}
             try:
+                record_page()
                 response = self.session.get(
-                    f"{self.base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search?",
-                    params=params,
+                    self.search_url,
+                    params=self._search_params(scraper_input, start, seconds_old),
                     timeout=10,
                 )
-                if response.status_code not in range(200, 400):
-                    if response.status_code == 429:
-                        err = (
-                            f"429 Response - Blocked by LinkedIn for too many requests"
-                        )
-                    else:
-                        err = f"LinkedIn response status code {response.status_code}"
-                        err += f" - {response.text}"
-                    logger.error(err)
+                if not self._search_ok(response):
                     return JobResponse(jobs=job_list)
             except Exception as e:
-                if "Proxy responded with" in str(e):
-                    logger.error(f"LinkedIn: Bad proxy")
-                else:
-                    logger.error(f"LinkedIn: {str(e)}")
+                self._log_request_error(e)
                 return JobResponse(jobs=job_list)
 
             soup = BeautifulSoup(response.text, "html.parser")
@@ -140,25 +117,38 @@ class LinkedInScraper(Scraper):
             if len(job_cards) == 0:
                 return JobResponse(jobs=job_list)
 
+            # Detail pages are fetched here and parsed on the parse pool; the
+            # JobPosts are assembled once every card of the page is fetched
+            pending = []
             for job_card in job_cards:
-                href_tag = job_card.find("a", class_="base-card__full-link")
-                if href_tag and "href" in href_tag.attrs:
-                    href = href_tag.attrs["href"].split("?")[0]
-                    job_id = href.split("-")[-1]
-
+                job_id = self._job_card_id(job_card)
+                if job_id:
                     if job_id in seen_ids:
                         continue
                     seen_ids.add(job_id)
 
-                    try:
-                        fetch_desc = scraper_input.linkedin_fetch_description
-                        job_post = self._process_job(job_card, job_id, fetch_desc)
-                        if job_post:
-                            job_list.append(job_post)
-                        if not continue_search():
-                            break
-                    except Exception as e:
-                        raise LinkedInException(str(e))
+                    fetch_desc = scraper_input.linkedin_fetch_description
+                    details = self._get_job_details(job_id) if fetch_desc else {}
+                    pending.append((job_card, job_id, details))
+                    if len(job_list) + len(pending) >= scraper_input.results_wanted:
+                        break
+
+            page_jobs: list[JobPost] = []
+            for job_card, job_id, details in pending:
+                try:
+                    job_post = self._parse_job_card(job_card, job_id, resolve(details))
+                except Exception as e:
+                    raise LinkedInException(str(e))
+                if job_post:
+                    job_list.append(job_post)
+                    page_jobs.append(job_post)
+
+            if is_page_stale(page_jobs, scraper_input.posted_since):
+                logger.info(f"page {request_count} is older than {scraper_input.posted_since}")
+                break
+            if stop_requested():
+                logger.info("stop requested, returning the jobs found so far")
+                break
 
             if continue_search():
                 time.sleep(random.uniform(self.delay, self.delay + self.band_delay))
@@ -167,8 +157,67 @@ class LinkedInScraper(Scraper):
         job_list = job_list[: scraper_input.results_wanted]
         return JobResponse(jobs=job_list)
 
+    def _search_params(
+        self, scraper_input: ScraperInput, start: int, seconds_old: int | None
+    ) -> dict:
+        params = {
+            "keywords": scraper_input.search_term,
+            "location": scraper_input.location,
+            "distance": scraper_input.distance,
+            "f_WT": 2 if scraper_input.is_remote else None,
+            "f_JT": (
+                self.job_type_code(scraper_input.job_type)
+                if scraper_input.job_type
+                else None
+            ),
+            "pageNum": 0,
+            "start": start,
+            "f_AL": "true" if scraper_input.easy_apply else None,
+            "f_C": (
+                ",".join(map(str, scraper_input.linkedin_company_ids))
+                if scraper_input.linkedin_company_ids
+                else None
+            ),
+        }
+        if seconds_old is not None:
+            params["f_TPR"] = f"r{seconds_old}"
+        return {k: v for k, v in params.items() if v is not None}
+
+    @staticmethod
+    def _search_ok(response) -> bool:
+        if response.status_code not in range(200, 400):
+            if response.status_code == 429:
+                err = f"429 Response - Blocked by LinkedIn for too many requests"
+            else:
+                err = f"LinkedIn response status code {response.status_code}"
+                err += f" - {response.text}"
+            logger.error(err)
+            return False
+        return True
+
+    @staticmethod
+    def _log_request_error(e: Exception):
+        if "Proxy responded with" in str(e):
+            logger.error(f"LinkedIn: Bad proxy")
+        else:
+            logger.error(f"LinkedIn: {str(e)}")
+
+    @staticmethod
+    def _job_card_id(job_card: Tag) -> str | None:
+        href_tag = job_card.find("a", class_="base-card__full-link")
+        if href_tag and "href" in href_tag.attrs:
+            href = href_tag.attrs["href"].split("?")[0]
+            return href.split("-")[-1]
+        return None
+
     def _process_job(
         self, job_card: Tag, job_id: str, full_descr: bool
+    ) -> Optional[JobPost]:
+        job_details = resolve(self._get_job_details(job_id)) if full_descr else {}
+        return self._parse_job_card(job_card, job_id, job_details)
+
+    def _parse_job_card(
+        self, job_card: Tag, job_id: str, job_details: dict
     ) -> Optional[JobPost]:
         salary_tag = job_card.find("span", class_="job-search-card__salary-info")
 
@@ -213,9 +262,6 @@ class LinkedInScraper(Scraper):
                 date_posted = datetime.strptime(datetime_str, "%Y-%m-%d")
             except:
                 date_posted = None
-        job_details = {}
-        if full_descr:
-            job_details = self._get_job_details(job_id)
 
         return JobPost(
             id=f"li-{job_id}",
@@ -236,11 +282,11 @@ class LinkedInScraper(Scraper):
             job_function=job_details.get("job_function"),
         )
 
-    def _get_job_details(self, job_id: str) -> dict:
+    def _get_job_details(self, job_id: str) -> dict | Future:
         """
         Retrieves job description and other job details by going to the job page url
         :param job_page_url:
-        :return: dict
+        :return: dict, or a parse pool Future of it
         """
         try:
             response = self.session.get(
@@ -249,10 +295,25 @@ class LinkedInScraper(Scraper):
             response.raise_for_status()
         except:
             return {}
-        if "linkedin.com/signup" in response.url:
+        return parse_later(
+            LinkedInScraper._parse_job_details,
+            str(response.url),
+            response.text,
+            self._wants_markdown(),
+        )
+
+    def _wants_markdown(self) -> bool:
+        return self.scraper_input.description_format == DescriptionFormat.MARKDOWN
+
+    @staticmethod
+    def _parse_job_details(response_url: str, text: str, markdown: bool) -> dict:
+        """
+        Parses a job page. Runs on the parse pool, so it only uses its arguments.
+        """
+        if "linkedin.com/signup" in response_url:
             return {}
 
-        soup = BeautifulSoup(response.text, "html.parser")
+        soup = BeautifulSoup(text, "html.parser")
         div_content = soup.find(
             "div", class_=lambda x: x and "show-more-less-html__markup" in x
         )
@@ -260,7 +321,7 @@ class LinkedInScraper(Scraper):
         if div_content is not None:
             div_content = remove_attributes(div_content)
             description = div_content.prettify(formatter="html")
-            if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
+            if markdown:
                 description = markdown_converter(description)
 
         h3_tag = soup.find(
@@ -282,10 +343,10 @@ class LinkedInScraper(Scraper):
         )
         return {
             "description": description,
-            "job_level": self._parse_job_level(soup),
-            "company_industry": self._parse_company_industry(soup),
-            "job_type": self._parse_job_type(soup),
-            "job_url_direct": self._parse_job_url_direct(soup),
+            "job_level": LinkedInScraper._parse_job_level(soup),
+            "company_industry": LinkedInScraper._parse_company_industry(soup),
+            "job_type": LinkedInScraper._parse_job_type(soup),
+            "job_url_direct": LinkedInScraper._parse_job_url_direct(soup),
             "company_logo": company_logo,
             "job_function": job_function,
         }
@@ -387,7 +448,8 @@ class LinkedInScraper(Scraper):
 
         return industry
 
-    def _parse_job_url_direct(self, soup: BeautifulSoup) -> str | None:
+    @staticmethod
+    def _parse_job_url_direct(soup: BeautifulSoup) -> str | None:
         """
         Gets the job url direct from job page
         :param soup:
@@ -396,7 +458,7 @@ class LinkedInScraper(Scraper):
         job_url_direct = None
         job_url_direct_content = soup.find("code", id="applyUrl")
         if job_url_direct_content:
-            job_url_direct_match = self.job_url_direct_regex.search(
+            job_url_direct_match = LinkedInScraper.job_url_direct_regex.search(
                 job_url_direct_content.decode_contents().strip()
             )
             if job_url_direct_match:
@@ -413,3 +475,120 @@ class LinkedInScraper(Scraper):
             JobType.CONTRACT: "C",
             JobType.TEMPORARY: "T",
         }.get(job_type_enum, "")
+
+
+class AsyncLinkedInScraper(LinkedInScraper):
+    """
+    Async LinkedIn scraper: same requests and parsing as LinkedInScraper,
+    with the job detail pages of a search page fetched concurrently.
+    """
+
+    async def scrape(self, scraper_input: ScraperInput) -> JobResponse:
+        self.scraper_input = scraper_input
+        # The sync session borrowed in __init__ is not used here
+        self.close()
+        self.session = create_async_session(
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            has_retry=True,
+            delay=5,
+            clear_cookies=True,
+            site=self.site.value,
+        )
+        self.session.headers.update(headers)
+        try:
+            return await self._scrape(scraper_input)
+        finally:
+            await self.session.close()
+
+    async def _scrape(self, scraper_input: ScraperInput) -> JobResponse:
+        job_list: list[JobPost] = []
+        seen_ids = set()
+        start = scraper_input.offset // 10 * 10 if scraper_input.offset else 0
+        request_count = 0
+        seconds_old = (
+            scraper_input.hours_old * 3600 if scraper_input.hours_old else None
+        )
+        continue_search = (
+            lambda: len(job_list) < scraper_input.results_wanted and start < 1000
+        )
+        while continue_search():
+            request_count += 1
+            logger.info(
+                f"search page: {request_count} / {math.ceil(scraper_input.results_wanted / 10)}"
+            )
+            try:
+                record_page()
+                response = await self.session.get(
+                    self.search_url,
+                    params=self._search_params(scraper_input, start, seconds_old),
+                    timeout=10,
+                )
+                if not self._search_ok(response):
+                    return JobResponse(jobs=job_list)
+            except Exception as e:
+                self._log_request_error(e)
+                return JobResponse(jobs=job_list)
+
+            soup = BeautifulSoup(response.text, "html.parser")
+            job_cards = soup.find_all("div", class_="base-search-card")
+            if len(job_cards) == 0:
+                return JobResponse(jobs=job_list)
+
+            new_cards = []
+            remaining = scraper_input.results_wanted - len(job_list)
+            for job_card in job_cards:
+                job_id = self._job_card_id(job_card)
+                if job_id and job_id not in seen_ids and len(new_cards) < remaining:
+                    seen_ids.add(job_id)
+                    new_cards.append((job_card, job_id))
+
+            fetch_desc = scraper_input.linkedin_fetch_description
+            try:
+                page_jobs = await asyncio.gather(
+                    *(
+                        self._process_job(job_card, job_id, fetch_desc)
+                        for job_card, job_id in new_cards
+                    )
+                )
+            except Exception as e:
+                raise LinkedInException(str(e))
+            page_jobs = [job_post for job_post in page_jobs if job_post]
+            job_list.extend(page_jobs)
+
+            if is_page_stale(page_jobs, scraper_input.posted_since):
+                logger.info(f"page {request_count} is older than {scraper_input.posted_since}")
+                break
+            if stop_requested():
+                logger.info("stop requested, returning the jobs found so far")
+                break
+
+            if continue_search():
+                await asyncio.sleep(
+                    random.uniform(self.delay, self.delay + self.band_delay)
+                )
+                start += len(job_list)
+
+        job_list = job_list[: scraper_input.results_wanted]
+        return JobResponse(jobs=job_list)
+
+    async def _process_job(
+        self, job_card: Tag, job_id: str, full_descr: bool
+    ) -> Optional[JobPost]:
+        job_details = await self._get_job_details(job_id) if full_descr else {}
+        return self._parse_job_card(job_card, job_id, await aresolve(job_details))
+
+    async def _get_job_details(self, job_id: str) -> dict:
+        try:
+            response = await self.session.get(
+                f"{self.base_url}/jobs/view/{job_id}", timeout=5
+            )
+            response.raise_for_status()
+        except:
+            return {}
+        return await aparse_later(
+            LinkedInScraper._parse_job_details,
+            str(response.url),
+            response.text,
+            self._wants_markdown(),
+        )
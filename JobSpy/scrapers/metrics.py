@@ -0,0 +1,98 @@
+"""
+jobspy.scrapers.metrics
+~~~~~~~~~~~~~~~~~~~
+
+Per-call request metrics. A caller opens collect_metrics() around a scrape
+and every session request made inside it (in this thread, in the worker
+threads the scrapers start through submit_in_context, or in asyncio tasks
+and to_thread calls, which copy the context) is counted into the same
+RequestMetrics: requests, status codes, body bytes, connection errors and
+result pages.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.status_codes = Counter()
+        self.bytes = 0
+        self.errors = 0
+        self.pages = 0
+
+    def record_response(self, status_code: int, nbytes: int):
+        with self.lock:
+            self.requests += 1
+            self.status_codes[status_code] += 1
+            self.bytes += nbytes
+
+    def record_error(self):
+        with self.lock:
+            self.requests += 1
+            self.errors += 1
+
+    def record_page(self):
+        with self.lock:
+            self.pages += 1
+
+    def to_dict(self) -> dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "status_codes": {str(k): v for k, v in sorted(self.status_codes.items())},
+                "bytes": self.bytes,
+                "errors": self.errors,
+                "pages": self.pages,
+            }
+
+
+_current: ContextVar[RequestMetrics | None] = ContextVar("jobspy_metrics", default=None)
+
+
+@contextmanager
+def collect_metrics():
+    """
+    Counts every request made inside the block into a new RequestMetrics.
+    """
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    try:
+        yield metrics
+    finally:
+        _current.reset(token)
+
+
+def record_response(response):
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_response(response.status_code, len(response.content or b""))
+
+
+def record_error():
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_error()
+
+
+def record_page():
+    """
+    Called by the scrapers once per page of search results.
+    """
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.record_page()
+
+
+def submit_in_context(executor, fn, *args):
+    """
+    executor.submit() that runs fn in a copy of the caller's context, so the
+    worker thread records into the caller's metrics.
+    """
+    return executor.submit(copy_context().run, fn, *args)
@@ -0,0 +1,136 @@
+"""
+jobspy.scrapers.parsing
+~~~~~~~~~~~~~~~~~~~
+
+CPU-bound parse stage shared by all scrapers. Network threads hand raw
+payloads (HTML, description markup) to a process pool through a bounded
+queue and get a Future back, so they can go on fetching while markdownify
+and BeautifulSoup run on other cores. The JobPost is assembled once the
+future resolves.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+
+class ParsePool:
+    """
+    Process pool with a bounded queue: submit() blocks once max_pending
+    payloads are waiting, so a slow parse stage throttles the fetchers
+    instead of piling raw pages up in memory. With workers=0 payloads are
+    parsed inline (the right choice on a single core).
+    """
+
+    def __init__(self, workers: int | None = None, max_pending: int = 256):
+        if workers is None:
+            # One core stays free for the fetch threads and JobPost assembly
+            workers = max(0, (os.cpu_count() or 1) - 1)
+        self.workers = workers
+        self.max_pending = max_pending
+        self.pending = threading.BoundedSemaphore(max_pending)
+        self.executor = None
+        self.lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                # spawn: the pool is often created from a worker thread, and
+                # forking a threaded process can deadlock on inherited locks
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self.executor
+
+    def _inline(self, fn, *args) -> Future:
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def _submit_acquired(self, fn, *args) -> Future:
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self.pending.release()
+            raise
+        future.add_done_callback(lambda _: self.pending.release())
+        return future
+
+    def submit(self, fn, *args) -> Future:
+        """
+        Queues fn(*args) on the pool, blocking while the queue is full.
+        fn must be a module-level function and args picklable.
+        """
+        if not self.workers:
+            return self._inline(fn, *args)
+        self.pending.acquire()
+        return self._submit_acquired(fn, *args)
+
+    async def asubmit(self, fn, *args) -> Future:
+        """
+        submit() for coroutines: waits for queue space without blocking the loop.
+        """
+        if not self.workers:
+            return self._inline(fn, *args)
+        while not self.pending.acquire(blocking=False):
+            await asyncio.sleep(0.01)
+        return self._submit_acquired(fn, *args)
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(cancel_futures=True)
+                self.executor = None
+
+
+_pool: ParsePool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_parse_pool() -> ParsePool:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParsePool()
+        return _pool
+
+
+def configure_parse_pool(workers: int | None = None, max_pending: int = 256):
+    """
+    Replaces the process-wide parse pool. workers=0 parses inline in the
+    fetch threads; None uses every core but one.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = ParsePool(workers=workers, max_pending=max_pending)
+
+
+def parse_later(fn, *args) -> Future:
+    return get_parse_pool().submit(fn, *args)
+
+
+async def aparse_later(fn, *args) -> Future:
+    return await get_parse_pool().asubmit(fn, *args)
+
+
+def resolve(value):
+    """
+    The parsed value of a parse_later() future (plain values pass through).
+    """
+    return value.result() if isinstance(value, Future) else value
+
+
+async def aresolve(value):
+    if isinstance(value, Future):
+        return await asyncio.wrap_future(value)
+    return value
@@ -0,0 +1,381 @@
+"""
+jobspy.scrapers.ratelimit
+~~~~~~~~~~~~~~~~~~~
+
+Process-wide per-site request limits: a concurrency cap plus a token bucket
+for the request rate. Every session created for a site goes through the
+same limiter, so all scraper instances (and threads) share the budget.
+Async sessions share the same token bucket; their concurrency cap is
+enforced per event loop with an asyncio semaphore.
+
+Each limiter also carries a circuit breaker: after `failure_threshold`
+consecutive 429/5xx responses or connection errors the site is cut off for
+`cooldown` seconds, then a single probe request decides whether it opens
+again or closes.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+
+from ..jobs import BaseModel
+
+
+class SiteLimits(BaseModel):
+    max_concurrent: int
+    rate: float  # requests per second
+    burst: int
+    failure_threshold: int = 5  # consecutive failures that open the circuit
+    cooldown: float = 60.0  # seconds open before the half-open probe
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request while a site's circuit is open.
+    """
+
+    def __init__(self, site: str, retry_in: float):
+        super().__init__(f"{site}: circuit open, retry in {retry_in:.0f}s")
+        self.site = site
+        self.retry_in = retry_in
+
+
+# Statuses that count as a failure for the circuit breaker
+FAILURE_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitBreaker:
+    """
+    closed -> open after `threshold` consecutive failures; open -> half_open
+    once `cooldown` has passed, letting exactly one probe through; the probe
+    closes the circuit on success and reopens it on failure.
+    """
+
+    def __init__(self, site: str, threshold: int, cooldown: float):
+        self.site = site
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.lock = threading.Lock()
+        self.failures = 0
+        self.opened_at = None
+        # The probe's token (see before_request) while one is in flight
+        self.probing = None
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.times_opened = 0
+            self.rejected = 0
+            self.last_opened = None
+
+    @property
+    def state(self) -> str:
+        with self.lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if self.probing or time.monotonic() - self.opened_at < self.cooldown:
+            return "open"
+        return "half_open"
+
+    def before_request(self):
+        """
+        Lets a request through or raises CircuitOpenError. In half_open only
+        the first caller gets through, as the probe, and gets a token to hand
+        to abandon_probe() if it ends without an outcome; otherwise None.
+        """
+        with self.lock:
+            state = self._state()
+            if state == "closed":
+                return None
+            if state == "half_open":
+                self.probing = object()
+                return self.probing
+            self.rejected += 1
+            retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at))
+        raise CircuitOpenError(self.site, retry_in)
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None and not self.probing:
+                # A request sent before the circuit opened; only the probe closes it
+                return
+            self.failures = 0
+            self.opened_at = None
+            self.probing = None
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probing or (
+                self.opened_at is None and self.failures >= self.threshold
+            ):
+                if not self.probing:
+                    self.times_opened += 1
+                self.opened_at = time.monotonic()
+                self.last_opened = time.time()
+                self.probing = None
+
+    def abandon_probe(self, probe):
+        """
+        Back to half_open after a probe that got neither a response nor an
+        error (e.g. cancelled while waiting for its slot), so the next request
+        probes instead of the circuit staying open for good.
+        """
+        with self.lock:
+            if probe is not None and self.probing is probe:
+                self.probing = None
+
+    def opened_since(self, when: float) -> bool:
+        """
+        Whether the circuit opened (or reopened) after `when` (time.time()).
+        """
+        with self.lock:
+            return self.last_opened is not None and self.last_opened >= when
+
+
+# Defaults tuned to how much each site tolerates before answering 429
+DEFAULT_LIMITS = {
+    "indeed": SiteLimits(max_concurrent=10, rate=10.0, burst=20),
+    "glassdoor": SiteLimits(max_concurrent=3, rate=2.0, burst=4),
+    "zip_recruiter": SiteLimits(max_concurrent=2, rate=1.0, burst=2),
+    "linkedin": SiteLimits(max_concurrent=1, rate=0.3, burst=1),
+    "google": SiteLimits(max_concurrent=2, rate=1.0, burst=2),
+}
+FALLBACK_LIMITS = SiteLimits(max_concurrent=4, rate=2.0, burst=4)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """
+        Takes one token if available.
+        :return: 0 if a token was taken, else seconds until the next one
+        """
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity, self.tokens + (now - self.updated) * self.rate
+            )
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> float:
+        """
+        Takes one token, sleeping until one is available.
+        :return: seconds spent waiting
+        """
+        waited = 0.0
+        while delay := self.try_acquire():
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+    async def aacquire(self) -> float:
+        waited = 0.0
+        while delay := self.try_acquire():
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+
+class SiteLimiter:
+    def __init__(self, site: str, limits: SiteLimits):
+        self.site = site
+        self.limits = limits
+        self.semaphore = threading.BoundedSemaphore(limits.max_concurrent)
+        self.bucket = TokenBucket(limits.rate, limits.burst)
+        self.async_semaphores = weakref.WeakKeyDictionary()
+        self.breaker = CircuitBreaker(site, limits.failure_threshold, limits.cooldown)
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.breaker.reset_stats()
+        with self.lock:
+            self.requests = 0
+            self.throttled = 0
+            self.wait_seconds = 0.0
+            self.rate_limited = 0
+            self.first_request = None
+            self.last_request = None
+
+    @contextmanager
+    def slot(self):
+        """
+        Holds one concurrency slot and one rate token for a request. Raises
+        CircuitOpenError while the site's circuit is open; an exception from
+        the request itself counts as a failure.
+        """
+        probe = self.breaker.before_request()
+        try:
+            started = time.monotonic()
+            self.semaphore.acquire()
+            try:
+                self.bucket.acquire()
+                self._count(time.monotonic() - started)
+                try:
+                    yield
+                except Exception:
+                    self.breaker.record_failure()
+                    raise
+            finally:
+                self.semaphore.release()
+        except BaseException:
+            self.breaker.abandon_probe(probe)
+            raise
+
+    @asynccontextmanager
+    async def aslot(self):
+        """
+        Async version of slot(), for sessions running on an event loop.
+        """
+        probe = self.breaker.before_request()
+        loop = asyncio.get_running_loop()
+        with self.lock:
+            semaphore = self.async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.limits.max_concurrent)
+                self.async_semaphores[loop] = semaphore
+        started = time.monotonic()
+        try:
+            async with semaphore:
+                await self.bucket.aacquire()
+                self._count(time.monotonic() - started)
+                try:
+                    yield
+                except Exception:
+                    self.breaker.record_failure()
+                    raise
+        except BaseException:
+            # asyncio.CancelledError is not an Exception: a cancelled probe
+            # has no outcome and must not keep the circuit open
+            self.breaker.abandon_probe(probe)
+            raise
+
+    def _count(self, waited: float):
+        with self.lock:
+            self.requests += 1
+            if waited > 0.001:
+                self.throttled += 1
+                self.wait_seconds += waited
+            now = time.time()
+            self.first_request = self.first_request or now
+            self.last_request = now
+
+    def record_status(self, status_code: int):
+        if status_code == 429:
+            with self.lock:
+                self.rate_limited += 1
+        if status_code in FAILURE_STATUSES:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+    def stats(self) -> dict:
+        with self.lock:
+            elapsed = (
+                self.last_request - self.first_request
+                if self.first_request and self.last_request
+                else 0.0
+            )
+            return {
+                "requests": self.requests,
+                "requests_per_second": (
+                    self.requests / elapsed if elapsed > 0 else float(self.requests)
+                ),
+                "throttled": self.throttled,
+                "wait_seconds": round(self.wait_seconds, 3),
+                "rate_limited_429": self.rate_limited,
+                "circuit_state": self.breaker.state,
+                "circuit_opened": self.breaker.times_opened,
+                "circuit_rejected": self.breaker.rejected,
+                "max_concurrent": self.limits.max_concurrent,
+                "rate": self.limits.rate,
+            }
+
+
+_limiters: dict[str, SiteLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(site: str) -> SiteLimiter:
+    with _limiters_lock:
+        limiter = _limiters.get(site)
+        if limiter is None:
+            limits = DEFAULT_LIMITS.get(site, FALLBACK_LIMITS)
+            limiter = _limiters[site] = SiteLimiter(site, limits)
+        return limiter
+
+
+def configure_site_limits(
+    site: str,
+    max_concurrent: int | None = None,
+    rate: float | None = None,
+    burst: int | None = None,
+    failure_threshold: int | None = None,
+    cooldown: float | None = None,
+):
+    """
+    Overrides a site's limits (and circuit breaker settings) for the rest of
+    the process. Should be called before scraping starts: in-flight requests
+    keep the old limiter.
+    """
+    with _limiters_lock:
+        current = DEFAULT_LIMITS.get(site, FALLBACK_LIMITS)
+        previous = _limiters.get(site)
+        if previous is not None:
+            current = previous.limits
+        limits = SiteLimits(
+            max_concurrent=max_concurrent or current.max_concurrent,
+            rate=rate or current.rate,
+            burst=burst or current.burst,
+            failure_threshold=failure_threshold or current.failure_threshold,
+            cooldown=cooldown if cooldown is not None else current.cooldown,
+        )
+        _limiters[site] = SiteLimiter(site, limits)
+
+
+def limiter_stats() -> dict[str, dict]:
+    """
+    Per-site throughput and throttle counts for every site used so far.
+    """
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    return {limiter.site: limiter.stats() for limiter in limiters}
+
+
+def circuit_state(site: str) -> str:
+    """
+    "closed", "open" or "half_open" for a site's circuit breaker.
+    """
+    return get_limiter(site).breaker.state
+
+
+def circuit_opened_since(site: str, when: float) -> bool:
+    """
+    Whether a site's circuit opened after `when` (a time.time() value).
+    """
+    return get_limiter(site).breaker.opened_since(when)
+
+
+def reset_limiter_stats():
+    with _limiters_lock:
+        limiters = list(_limiters.values())
+    for limiter in limiters:
+        limiter.reset_stats()
@@ -0,0 +1,138 @@
+"""
+jobspy.scrapers.sessionpool
+~~~~~~~~~~~~~~~~~~~
+
+Process-wide pool of HTTP sessions. scrape_jobs builds a new scraper for
+every call, so without a pool every (country, site) task opened fresh TCP
+and TLS connections to the same hosts. Scrapers now borrow a session keyed
+by site, proxies, certificate and session options, and give it back when
+they finish; the next task for that site reuses its open connections.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+
+from .utils import create_session
+
+
+def _proxies_key(proxies) -> tuple:
+    if proxies is None:
+        return ()
+    if isinstance(proxies, str):
+        return (proxies,)
+    if isinstance(proxies, dict):
+        return tuple(sorted(proxies.items()))
+    return tuple(proxies)
+
+
+class SessionPool:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.idle: dict[tuple, list] = defaultdict(list)
+        # Every session created, per site, to add up their TLS handshakes
+        self.sessions: dict[str, list] = defaultdict(list)
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.created = defaultdict(int)
+            self.reused = defaultdict(int)
+            self.handshake_baseline = {
+                id(session): session.tls_handshakes()
+                for sessions in self.sessions.values()
+                for session in sessions
+            }
+
+    def borrow(
+        self,
+        *,
+        proxies=None,
+        ca_cert: str | None = None,
+        is_tls: bool = True,
+        has_retry: bool = False,
+        delay: int = 1,
+        clear_cookies: bool = False,
+        site: str | None = None,
+    ):
+        """
+        An idle session with these settings, or a new one (create_session).
+        It must be given back with release() once the scraper is done.
+        """
+        key = (
+            site,
+            _proxies_key(proxies),
+            ca_cert,
+            is_tls,
+            has_retry,
+            delay,
+            clear_cookies,
+        )
+        with self.lock:
+            if self.idle[key]:
+                session = self.idle[key].pop()
+                self.reused[site] += 1
+                return session
+        session = create_session(
+            proxies=proxies,
+            ca_cert=ca_cert,
+            is_tls=is_tls,
+            has_retry=has_retry,
+            delay=delay,
+            clear_cookies=clear_cookies,
+            site=site,
+        )
+        session.pool_key = key
+        with self.lock:
+            self.created[site] += 1
+            self.sessions[site].append(session)
+        return session
+
+    def release(self, session):
+        key = getattr(session, "pool_key", None)
+        if key is None:
+            return
+        with self.lock:
+            if session not in self.idle[key]:
+                self.idle[key].append(session)
+
+    def stats(self) -> dict[str, dict]:
+        with self.lock:
+            sites = set(self.sessions) | set(self.created) | set(self.reused)
+            return {
+                site: {
+                    "sessions_created": self.created[site],
+                    "sessions_reused": self.reused[site],
+                    "tls_handshakes": sum(
+                        session.tls_handshakes()
+                        - self.handshake_baseline.get(id(session), 0)
+                        for session in self.sessions[site]
+                    ),
+                }
+                for site in sites
+                if site is not None
+            }
+
+
+_pool = SessionPool()
+
+
+def borrow_session(**kwargs):
+    return _pool.borrow(**kwargs)
+
+
+def release_session(session):
+    _pool.release(session)
+
+
+def session_pool_stats() -> dict[str, dict]:
+    """
+    Per site: sessions created, borrows served by an idle session and TLS
+    handshakes since the last reset_session_pool_stats().
+    """
+    return _pool.stats()
+
+
+def reset_session_pool_stats():
+    _pool.reset_stats()
@@ -0,0 +1,64 @@
+"""
+jobspy.scrapers.stopsignal
+~~~~~~~~~~~~~~~~~~~
+
+Cooperative stop for scrapes already running. A caller opens
+stop_when(event) around a scrape; the scrapers check stop_requested() after
+each page of search results and, once the event is set, return the jobs
+found so far instead of requesting the next page. Like collect_metrics, the
+event travels in a context variable, so it reaches the worker threads
+started through submit_in_context and the asyncio tasks of the async API.
+stopped_early() then tells the caller whether a scraper in the block actually
+cut its search short, or ran to completion anyway.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+class StopSignal:
+    def __init__(self, event: threading.Event):
+        self.event = event
+        # Set once a scraper breaks out of its page loop on the event
+        self.stopped = False
+
+
+_signal: ContextVar[StopSignal | None] = ContextVar("jobspy_stop", default=None)
+
+
+@contextmanager
+def stop_when(event: threading.Event):
+    """
+    Scrapes run inside the block stop at their next page boundary once
+    event is set. Yields the block's StopSignal.
+    """
+    signal = StopSignal(event)
+    token = _signal.set(signal)
+    try:
+        yield signal
+    finally:
+        _signal.reset(token)
+
+
+def stop_requested() -> bool:
+    """
+    Called by the scrapers between pages; True means stop now. The scraper
+    is expected to break out when it gets True, so the block is marked as
+    stopped early.
+    """
+    signal = _signal.get()
+    if signal is None or not signal.event.is_set():
+        return False
+    signal.stopped = True
+    return True
+
+
+def stopped_early() -> bool:
+    """
+    True if a scraper in the current stop_when block cut its search short.
+    """
+    signal = _signal.get()
+    return signal is not None and signal.stopped
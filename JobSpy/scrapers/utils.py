@@ -1,16 +1,25 @@
 from __future__ import annotations
 
 import re
+import time
 import logging
+from datetime import date, datetime
 from itertools import cycle
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlparse
 import tls_client
+from tls_client.exceptions import TLSClientException
 import numpy as np
 from markdownify import markdownify as md
-from requests.adapters import HTTPAdapter, Retry
 
 from ..jobs import CompensationInterval, JobType
+from . import metrics
+from .ratelimit import get_limiter
+
+# Statuses retried by sessions created with has_retry
+RETRY_STATUSES = {429, 500, 502, 503, 504}
 
 
 def create_logger(name: str):
@@ -26,8 +35,22 @@ def create_logger(name: str):
     return logger
 
 
+def is_page_stale(jobs: list, posted_since: datetime | None) -> bool:
+    """
+    True when every dated job on a page was posted before posted_since,
+    so pagination can stop: later pages only hold older listings.
+    """
+    if posted_since is None or not jobs:
+        return False
+    cutoff = posted_since.date() if isinstance(posted_since, datetime) else posted_since
+    dates = [job.date_posted for job in jobs if isinstance(job.date_posted, date)]
+    return bool(dates) and all(posted < cutoff for posted in dates)
+
+
 class RotatingProxySession:
-    def __init__(self, proxies=None):
+    def __init__(self, proxies=None, site=None):
+        # Shared per-site limiter (concurrency cap + token bucket), if any
+        self.limiter = get_limiter(site) if site else None
         if isinstance(proxies, str):
             self.proxy_cycle = cycle([self.format_proxy(proxies)])
         elif isinstance(proxies, list):
@@ -49,25 +72,40 @@ class RotatingProxySession:
 
 class RequestsRotating(RotatingProxySession, requests.Session):
 
-    def __init__(self, proxies=None, has_retry=False, delay=1, clear_cookies=False):
-        RotatingProxySession.__init__(self, proxies=proxies)
+    def __init__(
+        self, proxies=None, has_retry=False, delay=1, clear_cookies=False, site=None
+    ):
+        RotatingProxySession.__init__(self, proxies=proxies, site=site)
         requests.Session.__init__(self)
         self.clear_cookies = clear_cookies
         self.allow_redirects = True
         self.setup_session(has_retry, delay)
 
+    max_retries = 3
+
     def setup_session(self, has_retry, delay):
-        if has_retry:
-            retries = Retry(
-                total=3,
-                connect=3,
-                status=3,
-                status_forcelist=[500, 502, 503, 504, 429],
-                backoff_factor=delay,
-            )
-            adapter = HTTPAdapter(max_retries=retries)
-            self.mount("http://", adapter)
-            self.mount("https://", adapter)
+        # Retries live in request(), above the limiter, rather than in a urllib3
+        # Retry adapter: every attempt then takes its own slot and rate token
+        # and every 429 is counted.
+        self.has_retry = has_retry
+        self.delay = delay
+        # Keep-alive pool sized to the site's real concurrency: the limiter
+        # never lets more requests than max_concurrent run at once
+        pool_size = self.limiter.limits.max_concurrent if self.limiter else 10
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=pool_size)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def tls_handshakes(self) -> int:
+        """
+        New HTTPS connections opened by this session (one TLS handshake each).
+        """
+        pools = self.get_adapter("https://").poolmanager.pools
+        return sum(
+            pools[key].num_connections
+            for key in list(pools.keys())
+            if key.key_scheme == "https"
+        )
 
     def request(self, method, url, **kwargs):
         if self.clear_cookies:
@@ -79,23 +117,69 @@ class RequestsRotating(RotatingProxySession, requests.Session):
                 self.proxies = next_proxy
             else:
                 self.proxies = {}
-        return requests.Session.request(self, method, url, **kwargs)
+        attempts = self.max_retries + 1 if self.has_retry else 1
+        for attempt in range(attempts):
+            try:
+                response = self._send(method, url, **kwargs)
+            except requests.exceptions.ConnectionError:
+                if attempt == attempts - 1:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == attempts - 1:
+                    return response
+            time.sleep(self.delay * 2**attempt)
+
+    def _send(self, method, url, **kwargs):
+        try:
+            if self.limiter is None:
+                response = requests.Session.request(self, method, url, **kwargs)
+            else:
+                with self.limiter.slot():
+                    response = requests.Session.request(self, method, url, **kwargs)
+                self.limiter.record_status(response.status_code)
+        except requests.exceptions.RequestException:
+            metrics.record_error()
+            raise
+        metrics.record_response(response)
+        return response
 
 
 class TLSRotating(RotatingProxySession, tls_client.Session):
 
-    def __init__(self, proxies=None):
-        RotatingProxySession.__init__(self, proxies=proxies)
+    def __init__(self, proxies=None, site=None):
+        RotatingProxySession.__init__(self, proxies=proxies, site=site)
         tls_client.Session.__init__(self, random_tls_extension_order=True)
-
-    def execute_request(self, *args, **kwargs):
+        self.hosts_seen = set()
+
+    def tls_handshakes(self) -> int:
+        """
+        Hosts contacted over HTTPS. tls_client keeps its connections alive in
+        Go, out of sight, so this is a lower bound: one handshake per host.
+        """
+        return len(self.hosts_seen)
+
+    def execute_request(self, method, url, *args, **kwargs):
+        parsed = urlparse(url)
+        if parsed.scheme == "https":
+            self.hosts_seen.add(parsed.netloc)
+        args = (method, url, *args)
         if self.proxy_cycle:
             next_proxy = next(self.proxy_cycle)
             if next_proxy["http"] != "http://localhost":
                 self.proxies = next_proxy
             else:
                 self.proxies = {}
-        response = tls_client.Session.execute_request(self, *args, **kwargs)
+        try:
+            if self.limiter is None:
+                response = tls_client.Session.execute_request(self, *args, **kwargs)
+            else:
+                with self.limiter.slot():
+                    response = tls_client.Session.execute_request(self, *args, **kwargs)
+                self.limiter.record_status(response.status_code)
+        except TLSClientException:
+            metrics.record_error()
+            raise
+        metrics.record_response(response)
         response.ok = response.status_code in range(200, 400)
         return response
 
@@ -108,19 +192,22 @@ def create_session(
     has_retry: bool = False,
     delay: int = 1,
     clear_cookies: bool = False,
+    site: str | None = None,
 ) -> requests.Session:
     """
     Creates a requests session with optional tls, proxy, and retry settings.
+    When site is given, requests go through that site's shared rate limiter.
     :return: A session object
     """
     if is_tls:
-        session = TLSRotating(proxies=proxies)
+        session = TLSRotating(proxies=proxies, site=site)
     else:
         session = RequestsRotating(
             proxies=proxies,
             has_retry=has_retry,
             delay=delay,
             clear_cookies=clear_cookies,
+            site=site,
         )
 
     if ca_cert:
@@ -11,21 +11,33 @@ import json
 import math
 import re
 import time
+import asyncio
 from datetime import datetime
 from typing import Optional, Tuple, Any
 
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from bs4 import BeautifulSoup
 
 from .constants import headers
 from .. import Scraper, ScraperInput, Site
+from ..async_utils import create_async_session
+from ..bootstrap import (
+    REJECTED_STATUSES,
+    dump_cookies,
+    get_bootstrap_cache,
+    load_cookies,
+)
+from ..metrics import record_page, submit_in_context
+from ..sessionpool import borrow_session
+from ..stopsignal import stop_requested
+from ..parsing import aparse_later, aresolve, parse_later, resolve
 from ..utils import (
     extract_emails_from_text,
-    create_session,
     markdown_converter,
     remove_attributes,
     create_logger,
+    is_page_stale,
 )
 from ...jobs import (
     JobPost,
@@ -50,10 +62,13 @@ class ZipRecruiterScraper(Scraper):
         """
         Initializes ZipRecruiterScraper with the ZipRecruiter job search url
         """
-        super().__init__(Site.ZIP_RECRUITER, proxies=proxies)
+        super().__init__(Site.ZIP_RECRUITER, proxies=proxies, ca_cert=ca_cert)
 
         self.scraper_input = None
-        self.session = create_session(proxies=proxies, ca_cert=ca_cert)
+        self.cookies = None
+        self.session = borrow_session(
+            proxies=proxies, ca_cert=ca_cert, site=self.site.value
+        )
         self.session.headers.update(headers)
         self._get_cookies()
 
@@ -87,6 +102,12 @@ class ZipRecruiterScraper(Scraper):
                 break
             if not continue_token:
                 break
+            if is_page_stale(jobs_on_page, scraper_input.posted_since):
+                logger.info(f"page {page} is older than {scraper_input.posted_since}")
+                break
+            if stop_requested():
+                logger.info("stop requested, returning the jobs found so far")
+                break
         return JobResponse(jobs=job_list[: scraper_input.results_wanted])
 
     def _find_jobs_in_page(
@@ -99,45 +120,103 @@ class ZipRecruiterScraper(Scraper):
         :return: jobs found on page
         """
         jobs_list = []
-        params = self._add_params(scraper_input)
-        if continue_token:
-            params["continue_from"] = continue_token
         try:
-            res = self.session.get(f"{self.api_url}/jobs-app/jobs", params=params)
-            if res.status_code not in range(200, 400):
-                if res.status_code == 429:
-                    err = "429 Response - Blocked by ZipRecruiter for too many requests"
-                else:
-                    err = f"ZipRecruiter response status code {res.status_code}"
-                    err += f" with response: {res.text}"  # ZipRecruiter likely not available in EU
-                logger.error(err)
+            record_page()
+            res = self.session.get(
+                f"{self.api_url}/jobs-app/jobs",
+                params=self._page_params(scraper_input, continue_token),
+            )
+            if res.status_code in REJECTED_STATUSES and self._refresh_cookies():
+                res = self.session.get(
+                    f"{self.api_url}/jobs-app/jobs",
+                    params=self._page_params(scraper_input, continue_token),
+                )
+            if not self._page_ok(res):
                 return jobs_list, ""
         except Exception as e:
-            if "Proxy responded with" in str(e):
-                logger.error(f"Indeed: Bad proxy")
-            else:
-                logger.error(f"Indeed: {str(e)}")
+            self._log_request_error(e)
             return jobs_list, ""
 
         res_data = res.json()
         jobs_list = res_data.get("jobs", [])
         next_continue_token = res_data.get("continue", None)
+        # The threads only fetch detail pages; parsing runs on the parse pool
+        # and the JobPosts are assembled here
         with ThreadPoolExecutor(max_workers=self.jobs_per_page) as executor:
-            job_results = [executor.submit(self._process_job, job) for job in jobs_list]
+            job_results = [
+                submit_in_context(executor, self._fetch_job, job) for job in jobs_list
+            ]
 
-        job_list = list(filter(None, (result.result() for result in job_results)))
+        job_list = []
+        for result in job_results:
+            fetched = result.result()
+            if fetched:
+                job, job_url, descr = fetched
+                job_list.append(self._parse_job(job, job_url, *resolve(descr)))
         return job_list, next_continue_token
 
+    def _page_params(self, scraper_input: ScraperInput, continue_token: str | None):
+        params = self._add_params(scraper_input)
+        if continue_token:
+            params["continue_from"] = continue_token
+        return params
+
+    @staticmethod
+    def _page_ok(res) -> bool:
+        if res.status_code not in range(200, 400):
+            if res.status_code == 429:
+                err = "429 Response - Blocked by ZipRecruiter for too many requests"
+            else:
+                err = f"ZipRecruiter response status code {res.status_code}"
+                err += f" with response: {res.text}"  # ZipRecruiter likely not available in EU
+            logger.error(err)
+            return False
+        return True
+
+    @staticmethod
+    def _log_request_error(e: Exception):
+        if "Proxy responded with" in str(e):
+            logger.error(f"Indeed: Bad proxy")
+        else:
+            logger.error(f"Indeed: {str(e)}")
+
+    def _claim_job_url(self, job: dict) -> str | None:
+        job_url = f"{self.base_url}/jobs//j?lvk={job['listing_key']}"
+        if job_url in self.seen_urls:
+            return None
+        self.seen_urls.add(job_url)
+        return job_url
+
+    def _fetch_job(self, job: dict) -> Tuple[dict, str, Any] | None:
+        """
+        Fetch stage for a job: its url and detail page (a parse pool Future)
+        """
+        job_url = self._claim_job_url(job)
+        if job_url is None:
+            return None
+        return job, job_url, self._get_descr(job_url)
+
     def _process_job(self, job: dict) -> JobPost | None:
         """
         Processes an individual job dict from the response
         """
-        title = job.get("name")
-        job_url = f"{self.base_url}/jobs//j?lvk={job['listing_key']}"
-        if job_url in self.seen_urls:
+        fetched = self._fetch_job(job)
+        if fetched is None:
             return
-        self.seen_urls.add(job_url)
+        job, job_url, descr = fetched
+        return self._parse_job(job, job_url, *resolve(descr))
 
+    def _parse_job(
+        self,
+        job: dict,
+        job_url: str,
+        description_full: str | None,
+        job_url_direct: str | None,
+    ) -> JobPost:
+        """
+        Builds the JobPost from the search result and its detail page
+        """
+        title = job.get("name")
         description = job.get("job_description", "").strip()
         listing_type = job.get("buyer_type", "")
         description = (
@@ -161,7 +240,6 @@ class ZipRecruiterScraper(Scraper):
         comp_min = int(job["compensation_min"]) if "compensation_min" in job else None
         comp_max = int(job["compensation_max"]) if "compensation_max" in job else None
         comp_currency = job.get("compensation_currency")
-        description_full, job_url_direct = self._get_descr(job_url)
 
         return JobPost(
             id=f'zr-{job["listing_key"]}',
@@ -183,41 +261,81 @@ class ZipRecruiterScraper(Scraper):
             listing_type=listing_type,
         )
 
-    def _get_descr(self, job_url):
+    def _get_descr(self, job_url) -> Tuple[str | None, str | None] | Future:
         res = self.session.get(job_url, allow_redirects=True)
-        description_full = job_url_direct = None
         if res.ok:
-            soup = BeautifulSoup(res.text, "html.parser")
-            job_descr_div = soup.find("div", class_="job_description")
-            company_descr_section = soup.find("section", class_="company_description")
-            job_description_clean = (
-                remove_attributes(job_descr_div).prettify(formatter="html")
-                if job_descr_div
-                else ""
-            )
-            company_description_clean = (
-                remove_attributes(company_descr_section).prettify(formatter="html")
-                if company_descr_section
-                else ""
+            return parse_later(
+                ZipRecruiterScraper._parse_descr, res.text, self._wants_markdown()
             )
-            description_full = job_description_clean + company_description_clean
-            script_tag = soup.find("script", type="application/json")
-            if script_tag:
-                job_json = json.loads(script_tag.string)
-                job_url_val = job_json["model"].get("saveJobURL", "")
-                m = re.search(r"job_url=(.+)", job_url_val)
-                if m:
-                    job_url_direct = m.group(1)
-
-            if self.scraper_input.description_format == DescriptionFormat.MARKDOWN:
-                description_full = markdown_converter(description_full)
+        return None, None
+
+    def _wants_markdown(self) -> bool:
+        return self.scraper_input.description_format == DescriptionFormat.MARKDOWN
+
+    @staticmethod
+    def _parse_descr(text: str, markdown: bool) -> Tuple[str | None, str | None]:
+        """
+        Parses a job detail page. Runs on the parse pool, so it only uses its
+        arguments.
+        """
+        job_url_direct = None
+        soup = BeautifulSoup(text, "html.parser")
+        job_descr_div = soup.find("div", class_="job_description")
+        company_descr_section = soup.find("section", class_="company_description")
+        job_description_clean = (
+            remove_attributes(job_descr_div).prettify(formatter="html")
+            if job_descr_div
+            else ""
+        )
+        company_description_clean = (
+            remove_attributes(company_descr_section).prettify(formatter="html")
+            if company_descr_section
+            else ""
+        )
+        description_full = job_description_clean + company_description_clean
+        script_tag = soup.find("script", type="application/json")
+        if script_tag:
+            job_json = json.loads(script_tag.string)
+            job_url_val = job_json["model"].get("saveJobURL", "")
+            m = re.search(r"job_url=(.+)", job_url_val)
+            if m:
+                job_url_direct = m.group(1)
+
+        if markdown:
+            description_full = markdown_converter(description_full)
 
         return description_full, job_url_direct
 
     def _get_cookies(self):
-        data = "event_type=session&logged_in=false&number_of_retry=1&property=model%3AiPhone&property=os%3AiOS&property=locale%3Aen_us&property=app_build_number%3A4734&property=app_version%3A91.0&property=manufacturer%3AApple&property=timestamp%3A2024-01-12T12%3A04%3A42-06%3A00&property=screen_height%3A852&property=os_version%3A16.6.1&property=source%3Ainstall&property=screen_width%3A393&property=device_model%3AiPhone%2014%20Pro&property=brand%3AApple"
-        url = f"{self.api_url}/jobs-app/event"
-        self.session.post(url, data=data)
+        """
+        Loads the session cookies from the event API into the session. They
+        are cached per site (see bootstrap.py), so the POST is sent once per
+        TTL rather than once per scraper.
+        """
+        self.cookies = get_bootstrap_cache().fetch(self.site.value, self._download_cookies)
+        if self.cookies:
+            load_cookies(self.session.cookies, self.cookies)
+
+    def _download_cookies(self) -> list[dict] | None:
+        self.session.post(self._cookies_url(), data=self._cookies_data())
+        return dump_cookies(self.session.cookies) or None
+
+    def _refresh_cookies(self) -> bool:
+        """
+        Replaces rejected session cookies. False if they did not change.
+        """
+        rejected = self.cookies
+        get_bootstrap_cache().invalidate(self.site.value, rejected)
+        self.session.cookies.clear()
+        self._get_cookies()
+        return bool(self.cookies) and self.cookies != rejected
+
+    def _cookies_url(self) -> str:
+        return f"{self.api_url}/jobs-app/event"
+
+    @staticmethod
+    def _cookies_data() -> str:
+        return "event_type=session&logged_in=false&number_of_retry=1&property=model%3AiPhone&property=os%3AiOS&property=locale%3Aen_us&property=app_build_number%3A4734&property=app_version%3A91.0&property=manufacturer%3AApple&property=timestamp%3A2024-01-12T12%3A04%3A42-06%3A00&property=screen_height%3A852&property=os_version%3A16.6.1&property=source%3Ainstall&property=screen_width%3A393&property=device_model%3AiPhone%2014%20Pro&property=brand%3AApple"
 
     @staticmethod
     def _get_job_type_enum(job_type_str: str) -> list[JobType] | None:
@@ -245,3 +363,115 @@ class ZipRecruiterScraper(Scraper):
         if scraper_input.distance:
             params["radius"] = scraper_input.distance
         return {k: v for k, v in params.items() if v is not None}
+
+
+class AsyncZipRecruiterScraper(ZipRecruiterScraper):
+    """
+    Async ZipRecruiter scraper: same requests and parsing as
+    ZipRecruiterScraper. The session cookie is fetched when scraping starts
+    rather than in __init__, and detail pages are fetched concurrently.
+    Requests go through tls_client (TLSAsyncSession), as in the sync scraper.
+    """
+
+    def _get_cookies(self):
+        pass
+
+    async def scrape(self, scraper_input: ScraperInput) -> JobResponse:
+        self.scraper_input = scraper_input
+        # The sync session borrowed in __init__ is not used here
+        self.close()
+        self.session = create_async_session(
+            proxies=self.proxies,
+            ca_cert=self.ca_cert,
+            is_tls=True,
+            site=self.site.value,
+        )
+        self.session.headers.update(headers)
+        job_list: list[JobPost] = []
+        continue_token = None
+        try:
+            await self._aget_cookies()
+            max_pages = math.ceil(scraper_input.results_wanted / self.jobs_per_page)
+            for page in range(1, max_pages + 1):
+                if len(job_list) >= scraper_input.results_wanted:
+                    break
+                if page > 1:
+                    await asyncio.sleep(self.delay)
+                logger.info(f"search page: {page} / {max_pages}")
+                jobs_on_page, continue_token = await self._find_jobs_in_page(
+                    scraper_input, continue_token
+                )
+                if jobs_on_page:
+                    job_list.extend(jobs_on_page)
+                else:
+                    break
+                if not continue_token:
+                    break
+                if is_page_stale(jobs_on_page, scraper_input.posted_since):
+                    logger.info(f"page {page} is older than {scraper_input.posted_since}")
+                    break
+                if stop_requested():
+                    logger.info("stop requested, returning the jobs found so far")
+                    break
+        finally:
+            await self.session.close()
+        return JobResponse(jobs=job_list[: scraper_input.results_wanted])
+
+    async def _aget_cookies(self):
+        self.cookies = await get_bootstrap_cache().afetch(
+            self.site.value, self._adownload_cookies
+        )
+        if self.cookies:
+            load_cookies(self.session.cookies, self.cookies)
+
+    async def _adownload_cookies(self) -> list[dict] | None:
+        await self.session.post(self._cookies_url(), data=self._cookies_data())
+        return dump_cookies(self.session.cookies) or None
+
+    async def _find_jobs_in_page(
+        self, scraper_input: ScraperInput, continue_token: str | None = None
+    ) -> Tuple[list[JobPost], Optional[str]]:
+        try:
+            record_page()
+            res = await self.session.get(
+                f"{self.api_url}/jobs-app/jobs",
+                params=self._page_params(scraper_input, continue_token),
+            )
+            if res.status_code in REJECTED_STATUSES:
+                rejected = self.cookies
+                get_bootstrap_cache().invalidate(self.site.value, rejected)
+                self.session.cookies.clear()
+                await self._aget_cookies()
+                if self.cookies and self.cookies != rejected:
+                    res = await self.session.get(
+                        f"{self.api_url}/jobs-app/jobs",
+                        params=self._page_params(scraper_input, continue_token),
+                    )
+            if not self._page_ok(res):
+                return [], ""
+        except Exception as e:
+            self._log_request_error(e)
+            return [], ""
+
+        res_data = res.json()
+        jobs_list = res_data.get("jobs", [])
+        next_continue_token = res_data.get("continue", None)
+        job_results = await asyncio.gather(
+            *(self._process_job(job) for job in jobs_list)
+        )
+        return list(filter(None, job_results)), next_continue_token
+
+    async def _process_job(self, job: dict) -> JobPost | None:
+        job_url = self._claim_job_url(job)
+        if job_url is None:
+            return
+        descr = await aresolve(await self._get_descr(job_url))
+        return self._parse_job(job, job_url, *descr)
+
+    async def _get_descr(self, job_url):
+        res = await self.session.get(job_url, allow_redirects=True)
+        if res.ok:
+            return await aparse_later(
+                ZipRecruiterScraper._parse_descr, res.text, self._wants_markdown()
+            )
+        return None, None
@@ -1,5 +1,8 @@
+import argparse
 import logging
 import warnings
+from datetime import datetime
+
 import pandas as pd
 from bs4 import MarkupResemblesLocatorWarning
 
@@ -10,14 +13,37 @@ logging.getLogger("JobSpy:Glassdoor").setLevel(logging.ERROR)
 # Importa la clase JobScraper
 from Library.JobScraperModule import JobScraper
 
-# Importa los filtros y la función apply_filters
-from Library.myfilters import (
-    apply_filters,
-    truncate_column,
-)
+# Importa los filtros y la función compile_filters
+from Library.myfilters import truncate_column
+from Library.filterplan import compile_filters
+from Library.jobstore import JobStore
+from Library.profiles import PROFILE_COLUMN, compile_profiles
+from Library.session import FilterSession
+
+# Importa el diccionario de parámetros de filtrado (y los perfiles, si hay)
+from filter_params import filter_parameters, filter_profiles
+
+# Estadísticas de selectividad de los filtros, para ordenar las reglas
+FILTER_STATS_PATH = "filter_stats.json"
+# Perfil por regla y por frase de la última ejecución con --profile
+FILTER_PROFILE_PATH = "filter_profile.json"
+# Histórico local de todas las ofertas descargadas
+JOB_STORE_PATH = "jobs.db"
+# Métricas por país y sitio de la última ejecución (.json y .prom)
+RUN_METRICS_PATH = "run_metrics"
+# Token CSRF de Glassdoor y cookies de ZipRecruiter, reutilizados entre ejecuciones
+BOOTSTRAP_CACHE_PATH = "bootstrap_cache.json"
 
-# Importa el diccionario de parámetros de filtrado
-from filter_params import filter_parameters
+
+def history_since():
+    """
+    Fecha desde la que interesa el histórico, según days_back de filter_params.
+    """
+    if filter_parameters.get("days_back") is None:
+        return None
+    return (
+        pd.Timestamp.now() - pd.Timedelta(days=filter_parameters["days_back"])
+    ).date()
 
 
 def paginate_and_display(df: pd.DataFrame, page_size: int = 10):
@@ -51,29 +77,12 @@ def paginate_and_display(df: pd.DataFrame, page_size: int = 10):
             break
 
 
-def main():
-    # 1) Configura el scraper
-    scraper = JobScraper(
-        exclude_countries=["venezuela"],
-        sites_to_query=["indeed", "glassdoor", "zip_recruiter"],
-        results_wanted=100,
-        verbose=0,
-        max_workers=5,
-    )
-    # Se obtienen los datos (un DataFrame)
-    raw_df = scraper.run_scraping()
-
-    # 2) Elimina duplicados usando 'title' + 'description'
-    #    Esto unifica ofertas que tengan exactamente el mismo título y descripción
-    raw_df = raw_df.drop_duplicates(subset=["title"], keep="first")
-
-    # 3) Aplica los filtros desde filter_params
-    final_df = apply_filters(raw_df, filter_parameters)
-
-    # 4) Truncar la columna de descripción
+def show_results(final_df: pd.DataFrame):
+    """
+    Trunca la descripción y muestra los resultados filtrados con paginación.
+    """
     final_df = truncate_column(final_df, "description", 77)
 
-    # 5) Mostrar resultados con paginación
     pd.set_option("display.max_colwidth", None)
     print("Resultados filtrados:")
     print(f"Cantidad de trabajos finales: {len(final_df)}\n")
@@ -81,5 +90,199 @@ def main():
     paginate_and_display(final_df, page_size=10)
 
 
+def show_batch(df: pd.DataFrame, country: str, site: str):
+    """
+    Muestra, sin paginar, los trabajos que acaba de traer un (país, sitio).
+    """
+    df = truncate_column(df, "description", 77)
+    print(f"\n{len(df)} trabajos de {site} - {country}:")
+    print(df)
+
+
+def interactive_session(raw_df: pd.DataFrame):
+    """
+    Mantiene en memoria los trabajos descargados y permite editar
+    filter_params.py y volver a filtrar sin repetir el scraping.
+    Solo se reevalúan las reglas (y frases) que cambiaron.
+    """
+    session = FilterSession(raw_df)
+    filter_params = filter_parameters
+    while True:
+        final_df = session.refilter(filter_params)
+        evaluated = ", ".join(session.last_evaluated) or "ninguna (todo en caché)"
+        print(
+            f"\nFiltrado en {session.last_seconds * 1000:.1f} ms. "
+            f"Reglas reevaluadas: {evaluated}"
+        )
+        show_results(final_df)
+
+        user_input = input(
+            "\nEdita filter_params.py y presiona [Enter] para volver a filtrar, o 'q' para salir: "
+        )
+        if user_input.lower() == "q":
+            break
+        try:
+            filter_params = session.load_params()
+        except Exception as e:
+            print(f"No se pudo recargar filter_params.py: {e}")
+
+
+def main(
+    interactive: bool = False,
+    profile: bool = False,
+    offline: bool = False,
+    full: bool = False,
+    run_dir: str = None,
+    stream: bool = False,
+    target_matches: int = None,
+):
+    # 1) Compila los filtros de filter_params una sola vez. Con perfiles, todos
+    #    se evalúan juntos en una sola pasada
+    if filter_profiles and not interactive:
+        compiled_filters = compile_profiles(
+            filter_profiles, stats_path=FILTER_STATS_PATH, profile=profile
+        )
+    else:
+        compiled_filters = compile_filters(
+            filter_parameters, stats_path=FILTER_STATS_PATH, profile=profile
+        )
+
+    # 2) Configura el scraper: cada hilo guarda lo que descarga en el histórico
+    #    y lo filtra, así solo se guardan en memoria los trabajos que pasan los
+    #    filtros. En modo interactivo se guarda todo, para poder volver a filtrar.
+    #    Sin conexión (offline) se filtra el histórico en lugar de descargar.
+    #    Salvo con --full, de cada (país, sitio) solo se descarga lo publicado
+    #    desde el último scraping correcto; por eso el resultado mostrado es el
+    #    histórico más lo descargado ahora, no solo lo nuevo.
+    #    Los títulos repetidos se quitan antes de filtrar (gana la primera
+    #    oferta con ese título, pase o no los filtros).
+    #    Se empieza por los (país, sitio) que más coincidencias dieron antes.
+    #    Con --stream se muestra lo de cada (país, sitio) en cuanto termina.
+    #    Con --run-dir cada (país, sitio) terminado se guarda en ese directorio
+    #    y, si la ejecución se interrumpe, se reanuda desde ahí.
+    #    Con --target la descarga para en cuanto hay ese número de coincidencias.
+    store = JobStore(JOB_STORE_PATH)
+    if offline:
+        final_df = store.query(posted_since=history_since())
+        print(f"Histórico {JOB_STORE_PATH}: {len(final_df)} trabajos\n")
+        final_df = final_df.drop_duplicates(subset=["title"], keep="first")
+        if not interactive:
+            final_df = compiled_filters.apply(final_df)
+    else:
+        started = datetime.now()
+        scraper = JobScraper(
+            exclude_countries=["venezuela"],
+            sites_to_query=["indeed", "glassdoor", "zip_recruiter"],
+            results_wanted=100,
+            verbose=0,
+            max_workers=5,
+            filters=None if interactive else compiled_filters,
+            store=store,
+            incremental=not full,
+            dedupe_titles=True,
+            run_dir=run_dir,
+            # Los (país, sitio) que no dieron coincidencias empiezan con una página
+            probe_results=20,
+            metrics_path=RUN_METRICS_PATH,
+            bootstrap_cache_path=BOOTSTRAP_CACHE_PATH,
+            target_matches=target_matches,
+        )
+        # Se obtienen los datos (un DataFrame)
+        if stream:
+            run_dfs = []
+            for country, site, df in scraper.iter_scraping():
+                run_dfs.append(df)
+                if not df.empty:
+                    show_batch(df, country, site)
+            run_df = scraper.concat_frames(run_dfs)
+        else:
+            run_df = scraper.run_scraping()
+        # Lo guardado antes y no vuelto a ver en esta ejecución (lo visto ahora
+        # ya está en run_df, filtrado en los hilos)
+        history_df = store.query(posted_since=history_since(), seen_before=started)
+        history_df = history_df.drop(columns=["first_seen", "last_seen"])
+        history_df = scraper.drop_seen_titles(history_df)
+        if not interactive:
+            history_df = compiled_filters.apply(history_df)
+        print(f"Del histórico {JOB_STORE_PATH}: {len(history_df)} trabajos más\n")
+        final_df = pd.concat(
+            [df for df in (run_df, history_df) if not df.empty] or [run_df],
+            ignore_index=True,
+            sort=False,
+        )
+    store.close()
+    if not interactive:
+        compiled_filters.save_stats()
+        if getattr(compiled_filters, "profile", None) is not None:
+            print("\nPerfil de los filtros:")
+            print(compiled_filters.profile.report())
+            compiled_filters.profile.to_json(FILTER_PROFILE_PATH)
+            print(f"Perfil guardado en {FILTER_PROFILE_PATH}\n")
+
+    if interactive:
+        interactive_session(final_df)
+        return
+
+    if PROFILE_COLUMN in final_df.columns:
+        for name, profile_df in compiled_filters.split(final_df).items():
+            print(f"Perfil {name}: {len(profile_df)} trabajos")
+
+    # 3) Mostrar resultados con paginación
+    show_results(final_df)
+
+
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Scraping y filtrado de ofertas de trabajo")
+    parser.add_argument(
+        "-i",
+        "--interactive",
+        action="store_true",
+        help="Mantiene los resultados en memoria para volver a filtrar tras editar filter_params.py",
+    )
+    parser.add_argument(
+        "-p",
+        "--profile",
+        action="store_true",
+        help=f"Muestra filas, tiempo y coincidencias por regla y frase (y lo guarda en {FILTER_PROFILE_PATH})",
+    )
+    parser.add_argument(
+        "-o",
+        "--offline",
+        action="store_true",
+        help=f"No descarga nada: filtra las ofertas guardadas en {JOB_STORE_PATH}",
+    )
+    parser.add_argument(
+        "-f",
+        "--full",
+        action="store_true",
+        help="Descarga todo, ignorando cuándo se hizo el último scraping de cada país y sitio",
+    )
+    parser.add_argument(
+        "-r",
+        "--run-dir",
+        default=None,
+        help="Guarda cada país y sitio terminado en este directorio; si ya existe, reanuda la ejecución",
+    )
+    parser.add_argument(
+        "-s",
+        "--stream",
+        action="store_true",
+        help="Muestra los trabajos de cada país y sitio en cuanto terminan, antes del resumen",
+    )
+    parser.add_argument(
+        "-t",
+        "--target",
+        type=int,
+        default=None,
+        help="Para de descargar en cuanto hay este número de trabajos que pasan los filtros",
+    )
+    args = parser.parse_args()
+    main(
+        interactive=args.interactive,
+        profile=args.profile,
+        offline=args.offline,
+        full=args.full,
+        run_dir=args.run_dir,
+        stream=args.stream,
+        target_matches=args.target,
+    )
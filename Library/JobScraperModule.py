@@ -1,26 +1,101 @@
+import asyncio
+import math
+import threading
+import time
 import warnings
 import logging
+from datetime import datetime, timedelta
 from bs4 import MarkupResemblesLocatorWarning
 from tqdm import tqdm
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 import pandas as pd
 
 warnings.filterwarnings("ignore", category=MarkupResemblesLocatorWarning)
 
-from JobSpy import scrape_jobs
+from JobSpy import (
+    CircuitOpenError,
+    apply_job_schema,
+    bootstrap_stats,
+    circuit_opened_since,
+    collect_metrics,
+    configure_bootstrap_cache,
+    circuit_state,
+    configure_parse_pool,
+    configure_site_limits,
+    limiter_stats,
+    reset_bootstrap_stats,
+    reset_limiter_stats,
+    reset_session_pool_stats,
+    scrape_jobs,
+    scrape_jobs_async,
+    session_pool_stats,
+    stop_when,
+    stopped_early,
+)
 from JobSpy.jobs import Country
+from Library.checkpoint import RunCheckpoint
+from Library.filterplan import CompiledFilters
+from Library.jobstore import JobStore
+from Library.runmetrics import RunMetrics
+from Library.scheduler import ScheduledTask, schedule_report, schedule_tasks
+from Library.taskplan import TaskPlan, plan_tasks
 
 
 class JobScraper:
     """
     Clase que encapsula la lógica para:
       - Deshabilitar los loggers internos de JobSpy.
-      - Definir sitios y países a consultar.
+      - Definir sitios y países a consultar y planificar los (país, sitio):
+        sin los que el sitio no admite y sin peticiones repetidas (taskplan.py).
+      - Con store, ejecutar primero los (país, sitio) que más coincidencias
+        dieron en ejecuciones anteriores y repartir entre ellos un presupuesto
+        de ofertas (scheduler.py).
       - Realizar la consulta con tqdm y sumar resultados, usando multithreading.
       - Filtrar DataFrames para quedarse solo con las columnas relevantes.
+      - Aplicar (opcionalmente) un CompiledFilters dentro de cada hilo, para
+        conservar en memoria solo las filas que pasan los filtros.
+      - Quitar (opcionalmente) los títulos repetidos antes de filtrar, como se
+        hacía sobre el DataFrame completo: gana la primera oferta descargada
+        con ese título, pase o no los filtros.
+      - Guardar (opcionalmente) todo lo descargado en un JobStore.
+      - Guardar (opcionalmente) cada (país, sitio) terminado en un directorio
+        de ejecución, para reanudar una ejecución interrumpida sin repetirlo.
+      - Medir cada (país, sitio): tiempo, peticiones, códigos de estado, bytes,
+        páginas y ofertas (runmetrics.py), y exportarlo en JSON y Prometheus.
+
+    Las peticiones de cada sitio pasan por un limitador compartido por todo el
+    proceso (JobSpy/scrapers/ratelimit.py): un máximo de peticiones simultáneas
+    y un token bucket con la tasa que tolera ese sitio. `max_workers` solo
+    limita cuántos (país, sitio) se procesan a la vez. El parseo (markdownify,
+    BeautifulSoup) se hace en un pool de procesos de JobSpy, no en esos hilos.
+
+    arun_scraping() hace lo mismo sobre asyncio (scrape_jobs_async, httpx):
+    cada (país, sitio) es una corrutina en vez de un hilo, así que
+    `max_workers` puede subir a cientos sin multiplicar hilos ni memoria.
+
+    iter_scraping() (y aiter_scraping()) cede el DataFrame de cada (país,
+    sitio) en cuanto termina, sin esperar al resto ni acumularlos.
+
+    Si un sitio encadena 429 o errores, su circuito (también en ratelimit.py)
+    se abre: sus tareas pendientes se omiten hasta que, pasado el enfriamiento,
+    una petición de prueba lo vuelve a cerrar. Las omitidas (y las cortadas a
+    medias) no mueven la marca de agua y se repiten al reanudar con run_dir.
+
+    Con `target_matches`, en cuanto las tareas terminadas suman ese número de
+    coincidencias se cancelan las que aún no empezaron y las que están en
+    marcha paran en el siguiente límite de página (stop_when de JobSpy). Lo
+    que traen las cortadas se conserva, pero no mueve la marca de agua ni el
+    rendimiento, y con run_dir quedan pendientes.
     """
 
+    # Margen que se solapa con el scraping anterior, para no perder ofertas
+    # publicadas justo en el límite de la marca de agua
+    WATERMARK_OVERLAP = timedelta(hours=1)
+
     DESIRED_COLS = [
+        "id",
+        "site",
         "title",
         "job_type",
         "interval",
@@ -39,6 +114,18 @@ class JobScraper:
         results_wanted=20,
         verbose=0,
         max_workers=5,
+        filters: CompiledFilters = None,
+        store: JobStore = None,
+        incremental: bool = True,
+        site_limits=None,
+        dedupe_titles: bool = False,
+        parse_workers: int = None,
+        run_dir: str = None,
+        results_budget: int = None,
+        probe_results: int = None,
+        metrics_path: str = None,
+        bootstrap_cache_path: str = None,
+        target_matches: int = None,
     ):
         """
         Inicializa el JobScraper.
@@ -47,16 +134,82 @@ class JobScraper:
           :param results_wanted:    Número de resultados deseados por país/sitio.
           :param verbose:           Nivel de verbosidad para JobSpy (0,1,2).
           :param max_workers:       Número de hilos para ejecutar peticiones en paralelo.
+          :param filters:           Filtros compilados (compile_filters o compile_profiles)
+                                    que se aplican a cada (país, sitio) nada más descargarse.
+          :param store:             JobStore en el que se guardan (upsert por id) todas las
+                                    ofertas descargadas, antes de filtrarlas.
+          :param incremental:       Con store, descarga solo lo publicado desde el último
+                                    scraping correcto de cada (país, sitio).
+          :param site_limits:       Límites por sitio que sustituyen a los de JobSpy, p. ej.
+                                    {"glassdoor": {"max_concurrent": 2, "rate": 1.0}}.
+          :param dedupe_titles:     Descarta, antes de filtrar, las ofertas cuyo título ya
+                                    apareció en esta ejecución (en cualquier hilo).
+          :param parse_workers:     Procesos para convertir y parsear descripciones (markdownify,
+                                    BeautifulSoup) aparte de los hilos de red. None deja el
+                                    valor de JobSpy (todos los núcleos menos uno); 0, en el hilo.
+          :param run_dir:           Directorio de la ejecución (RunCheckpoint). Si ya existe, se
+                                    reanuda: los (país, sitio) terminados se cargan del disco y
+                                    solo se repiten los fallidos o pendientes.
+          :param results_budget:    Total de ofertas a pedir en toda la ejecución. Se reparte
+                                    entre los (país, sitio) según las coincidencias que dieron
+                                    antes (requiere store); sin él, cada uno pide results_wanted.
+          :param probe_results:     Con store, los (país, sitio) que no dieron coincidencias piden
+                                    primero solo estas ofertas y se amplían si alguna pasa los filtros.
+          :param metrics_path:      Ruta base en la que, al terminar, se guardan las métricas por
+                                    (país, sitio) como <ruta>.json y <ruta>.prom (Prometheus).
+          :param bootstrap_cache_path: Fichero JSON en el que se guardan el token CSRF de
+                                    Glassdoor y las cookies de ZipRecruiter, para reutilizarlos
+                                    (mientras no caduquen) en la siguiente ejecución.
+          :param target_matches:    Para la ejecución en cuanto haya este número de ofertas que
+                                    pasan los filtros (o de ofertas, sin filtros).
         """
         self.exclude_countries = exclude_countries or ["venezuela"]
         self.sites_to_query = sites_to_query or ["indeed", "glassdoor", "zip_recruiter"]
         self.results_wanted = results_wanted
         self.verbose = verbose
         self.max_workers = max_workers
+        self.filters = filters
+        self.store = store
+        self.incremental = incremental
+        self.run_dir = run_dir
+        self.results_budget = results_budget
+        self.probe_results = probe_results
+        self.schedule = {}
+        self.metrics_path = metrics_path
+        self.target_matches = target_matches
+        # Se activa al llegar a target_matches; los scrapers lo miran entre páginas
+        self._stop = threading.Event()
+        self.run_metrics = RunMetrics()
+        self.checkpoint = None
+        for site, limits in (site_limits or {}).items():
+            configure_site_limits(site, **limits)
+        if parse_workers is not None:
+            configure_parse_pool(workers=parse_workers)
+        if bootstrap_cache_path is not None:
+            configure_bootstrap_cache(path=bootstrap_cache_path)
 
         self.disable_jobspy_loggers()
 
         self.all_dfs = []
+        self.total_raw_jobs = 0
+        self.total_new_jobs = 0
+        self.total_kept_jobs = 0
+        self.resumed_tasks = 0
+        self.failed_tasks = 0
+        self.collect_results = True
+        # sitio -> países omitidos por tener el circuito abierto
+        self.skipped_tasks = {}
+        # (país, sitio) que se cortaron a medias al abrirse el circuito
+        self.interrupted_tasks = set()
+        # (país, sitio) que pararon a medias al llegar a target_matches
+        self.stopped_tasks = set()
+        self.cancelled_tasks = 0
+        self.site_stats = {}
+        self.session_stats = {}
+        self.bootstrap_stats = {}
+        self.dedupe_titles = dedupe_titles
+        self.seen_titles = set()
+        self._titles_lock = threading.Lock()
 
     def disable_jobspy_loggers(self):
         """
@@ -80,84 +233,622 @@ class JobScraper:
                 valid_countries.append(name_in_lower)
         return valid_countries
 
-    def _scrape_single_df(self, country_str, site) -> pd.DataFrame:
+    def _watermark(self, country_str, site):
         """
-        Ejecuta scrape_jobs para un (país, sitio) y retorna un DataFrame filtrado con columnas deseadas.
-        Además, asigna la columna 'country' con el país correspondiente.
-        Si falla, retorna DataFrame vacío.
+        Devuelve (hours_old, posted_since) para un (país, sitio) según su marca
+        de agua, o (None, None) si no hay (primera ejecución o sin store).
         """
-        try:
-            df_site = scrape_jobs(
-                site_name=site,
-                search_term=None,
-                location=None,
-                distance=50,
-                is_remote=False,
-                results_wanted=self.results_wanted,
-                country_indeed=country_str,
-                verbose=self.verbose,
+        if self.store is None or not self.incremental:
+            return None, None
+        watermark = self.store.get_watermark(country_str, site)
+        if watermark is None:
+            return None, None
+        since = watermark - self.WATERMARK_OVERLAP
+        hours_old = max(1, math.ceil((datetime.now() - since).total_seconds() / 3600))
+        return hours_old, since
+
+    def _task_spec(self, country_str, site) -> ScheduledTask:
+        """
+        Cuántas ofertas pedir para un (país, sitio) según el planificador.
+        """
+        spec = self.schedule.get((country_str, site))
+        return spec or ScheduledTask(country_str, site, self.results_wanted)
+
+    def _scrape_kwargs(self, country_str, site):
+        """
+        Argumentos de scrape_jobs/scrape_jobs_async para un (país, sitio).
+        """
+        hours_old, posted_since = self._watermark(country_str, site)
+        return dict(
+            site_name=site,
+            search_term=None,
+            location=None,
+            distance=50,
+            is_remote=False,
+            results_wanted=self._task_spec(country_str, site).results_wanted,
+            country_indeed=country_str,
+            hours_old=hours_old,
+            posted_since=posted_since,
+            verbose=self.verbose,
+        )
+
+    def _scrape_single_df(self, country_str, site):
+        """
+        Ejecuta scrape_jobs para un (país, sitio) y retorna una tupla
+        (DataFrame con columnas deseadas, nº de trabajos descargados,
+        nº de trabajos nuevos en el store, títulos que registró la tarea).
+        Además, asigna la columna 'country' con el país correspondiente, guarda
+        lo descargado en el store (si hay) y, si hay filtros compilados,
+        descarta aquí las filas que no los pasan.
+        Si hay marca de agua, solo se piden las ofertas posteriores a ella.
+        Si la tarea es una sonda y encuentra coincidencias, se amplía.
+        Si falla, la excepción llega a run_scraping, que marca la tarea como fallida.
+        Las peticiones, bytes y tiempos de la tarea quedan en self.run_metrics.
+        """
+        with self._measure(country_str, site) as outcome, stop_when(self._stop):
+            outcome["result"] = self._scrape_task(country_str, site)
+        return outcome["result"]
+
+    def _scrape_task(self, country_str, site):
+        self._check_circuit(site)
+        spec = self._task_spec(country_str, site)
+        # Se calculan antes de procesar: la sonda mueve la marca de agua
+        kwargs = self._scrape_kwargs(country_str, site)
+        started = datetime.now()
+        df_site = scrape_jobs(**kwargs)
+        result = self._process_site_df(
+            df_site, country_str, site, started, spec.results_wanted
+        )
+        expansion = self._expansion_kwargs(spec, kwargs, result)
+        if expansion is not None:
+            started = datetime.now()
+            df_site = scrape_jobs(**expansion)
+            result = self._merge_results(
+                result,
+                self._process_site_df(
+                    df_site, country_str, site, started, expansion["results_wanted"]
+                ),
             )
-        except Exception:
-            # Retorna DataFrame vacío si hay error
-            return pd.DataFrame(columns=self.DESIRED_COLS)
+        self._record_yield(spec, result, expansion is not None)
+        return result
+
+    async def _ascrape_single_df(self, country_str, site):
+        """
+        Versión async de _scrape_single_df. El guardado y el filtrado se hacen
+        en un hilo aparte para no bloquear el bucle de eventos.
+        """
+        with self._measure(country_str, site) as outcome, stop_when(self._stop):
+            outcome["result"] = await self._ascrape_task(country_str, site)
+        return outcome["result"]
+
+    async def _ascrape_task(self, country_str, site):
+        self._check_circuit(site)
+        spec = self._task_spec(country_str, site)
+        kwargs = self._scrape_kwargs(country_str, site)
+        started = datetime.now()
+        df_site = await scrape_jobs_async(**kwargs)
+        result = await asyncio.to_thread(
+            self._process_site_df, df_site, country_str, site, started, spec.results_wanted
+        )
+        expansion = self._expansion_kwargs(spec, kwargs, result)
+        if expansion is not None:
+            started = datetime.now()
+            df_site = await scrape_jobs_async(**expansion)
+            result = self._merge_results(
+                result,
+                await asyncio.to_thread(
+                    self._process_site_df,
+                    df_site,
+                    country_str,
+                    site,
+                    started,
+                    expansion["results_wanted"],
+                ),
+            )
+        await asyncio.to_thread(self._record_yield, spec, result, expansion is not None)
+        return result
+
+    @contextmanager
+    def _measure(self, country_str, site):
+        """
+        Cuenta en run_metrics la duración y las peticiones (de cualquier hilo
+        o corrutina de JobSpy) de una tarea, termine como termine. El bloque
+        deja su resultado en outcome["result"].
+        """
+        outcome = {}
+        state = "failed"
+        started = time.perf_counter()
+        with collect_metrics() as requests:
+            try:
+                yield outcome
+                if (country_str, site) in self.interrupted_tasks:
+                    state = "interrupted"
+                elif (country_str, site) in self.stopped_tasks:
+                    state = "stopped"
+                else:
+                    state = "done"
+            except CircuitOpenError:
+                state = "skipped"
+                raise
+            finally:
+                df_filtered, raw_count, _, _ = outcome.get("result") or self._empty_result()
+                self.run_metrics.record(
+                    country_str,
+                    site,
+                    state,
+                    time.perf_counter() - started,
+                    requests.to_dict(),
+                    parsed=raw_count,
+                    kept=len(df_filtered),
+                )
+
+    @staticmethod
+    def _check_circuit(site):
+        """
+        Lanza CircuitOpenError si el circuito del sitio está abierto, para no
+        lanzar una tarea entera que fallaría petición a petición.
+        """
+        if circuit_state(site) == "open":
+            raise CircuitOpenError(site, 0)
 
+    def _expansion_kwargs(self, spec, kwargs, result):
+        """
+        Argumentos para ampliar una sonda, o None si no hay que ampliarla: no es
+        sonda, no encontró coincidencias o el sitio ya no tenía más ofertas.
+        """
+        df_filtered, raw_count, _, _ = result
+        if (
+            not spec.is_probe
+            or df_filtered.empty
+            or raw_count < spec.results_wanted
+            or self._incomplete(spec.task)
+        ):
+            return None
+        return dict(
+            kwargs,
+            results_wanted=spec.expand_to - spec.results_wanted,
+            offset=spec.results_wanted,
+        )
+
+    @staticmethod
+    def _merge_results(first, second):
+        dfs = [df for df in (first[0], second[0]) if not df.empty] or [first[0]]
+        return (
+            pd.concat(dfs, ignore_index=True, sort=False),
+            first[1] + second[1],
+            first[2] + second[2],
+            first[3] + second[3],
+        )
+
+    def _record_yield(self, spec, result, expanded):
+        """
+        Guarda en el store cuánto dio la tarea, para ordenar las próximas
+        ejecuciones. Sin filtros no se sabe cuántas coincidían.
+        """
+        if self.store is None or self._incomplete(spec.task):
+            return
+        df_filtered, raw_count, _, _ = result
+        requested = spec.expand_to if expanded else spec.results_wanted
+        matched = len(df_filtered) if self.filters is not None else None
+        self.store.record_yield(spec.country, spec.site, requested, raw_count, matched)
+
+    def _next_watermark(self, df, country_str, site, started, requested):
+        """
+        Nueva marca de agua tras descargar df, o None si no debe moverse.
+        Si se llegó a las `requested` ofertas pedidas, lo publicado entre la
+        marca anterior y la oferta más antigua descargada no se ha pedido: la
+        marca solo avanza hasta esa oferta más antigua (nunca hacia atrás).
+        """
+        if len(df) < requested:
+            return started
+        if "date_posted" not in df.columns:
+            return None
+        oldest = pd.to_datetime(df["date_posted"], errors="coerce").min()
+        if pd.isna(oldest):
+            return None
+        oldest = oldest.to_pydatetime()
+        previous = self.store.get_watermark(country_str, site)
+        if previous is not None and oldest <= previous:
+            return None
+        return oldest
+
+    def _incomplete(self, task):
+        """
+        True si la tarea se cortó a medias (circuito abierto o target_matches).
+        """
+        return task in self.interrupted_tasks or task in self.stopped_tasks
+
+    def _target_reached(self):
+        """
+        True solo la primera vez que las coincidencias llegan a target_matches;
+        entonces avisa a los scrapers en marcha de que paren.
+        """
+        if self.target_matches is None or self._stop.is_set():
+            return False
+        if self.total_kept_jobs < self.target_matches:
+            return False
+        self._stop.set()
+        return True
+
+    def drop_seen_titles(self, df):
+        """
+        Quita las filas cuyo título ya se vio (en esta ejecución o antes en
+        df) y registra los títulos nuevos. Es el drop_duplicates(subset=["title"])
+        de siempre, repartido entre los hilos.
+        """
+        if "title" not in df.columns or df.empty:
+            return df
+        titles = df["title"].tolist()
+        keep = []
+        with self._titles_lock:
+            for title in titles:
+                new = title not in self.seen_titles
+                if new:
+                    self.seen_titles.add(title)
+                keep.append(new)
+        return df[keep]
+
+    def _process_site_df(self, df_site, country_str, site, started, requested):
+        """
+        Recorta df_site a las columnas deseadas, lo guarda en el store, avanza
+        la marca de agua y aplica los filtros. Retorna la misma tupla que
+        _scrape_single_df.
+        """
         # Seleccionamos solo columnas deseadas que existan en df_site
         existing_cols = [c for c in self.DESIRED_COLS if c in df_site.columns]
         df_filtered = df_site[existing_cols].copy()
 
         # Agregamos/forzamos la columna 'country', para tenerla en el DF final
         df_filtered["country"] = country_str
+        apply_job_schema(df_filtered)
 
-        return df_filtered
+        raw_count = len(df_filtered)
+        new_count = 0
+        # Si el circuito se abrió durante la descarga, df_site está incompleto
+        interrupted = circuit_opened_since(site, started.timestamp())
+        if interrupted:
+            self.interrupted_tasks.add((country_str, site))
+        # El scraper paró en un límite de página al llegar a target_matches
+        # (las tareas que terminan enteras después de llegar no cuentan)
+        if stopped_early():
+            self.stopped_tasks.add((country_str, site))
+        if self.store is not None and raw_count:
+            new_count, _ = self.store.upsert(df_filtered)
+        if self.store is not None and raw_count and not self._incomplete((country_str, site)):
+            # Solo avanza con resultados: una respuesta vacía puede ser un bloqueo
+            watermark = self._next_watermark(
+                df_filtered, country_str, site, started, requested
+            )
+            if watermark is not None:
+                self.store.set_watermark(country_str, site, watermark)
+        titles = []
+        if self.dedupe_titles:
+            df_filtered = self.drop_seen_titles(df_filtered)
+            if "title" in df_filtered.columns:
+                titles = df_filtered["title"].tolist()
+        if self.filters is not None and raw_count:
+            df_filtered = self.filters.apply(df_filtered)
 
-    def run_scraping(self) -> pd.DataFrame:
+        return df_filtered, raw_count, new_count, titles
+
+    def print_skipped_tasks(self):
         """
-        Ejecuta el scraping país-por-país, sitio-por-sitio de forma *paralela*,
-        mostrando el progreso con tqdm y actualizando el conteo global.
-        Al final, concatena todo en un DataFrame con las columnas importantes.
+        Muestra, por sitio, los países omitidos (o cortados a medias) porque el
+        circuito del sitio estaba abierto.
         """
-        countries_to_process = self.collect_countries()
+        for site, countries in self.skipped_tasks.items():
+            cut = [c for c in countries if (c, site) in self.interrupted_tasks]
+            print(
+                f"Omitidas en {site} por circuito abierto: {len(countries)} "
+                f"({len(cut)} cortadas a medias): {', '.join(countries)}"
+            )
 
-        tasks = []
-        for country_str in countries_to_process:
-            for site in self.sites_to_query:
-                tasks.append((country_str, site))
+    def print_site_stats(self):
+        """
+        Muestra, por sitio, peticiones, peticiones por segundo, cuántas tuvieron
+        que esperar al limitador (y cuánto), cuántas recibieron un 429, si se
+        abrió el circuito (cuántas veces y cuántas peticiones se rechazaron),
+        cuántas peticiones costó cada oferta y cuántas sesiones HTTP se crearon
+        o se reutilizaron del pool (con sus handshakes TLS) y cuántas veces se
+        descargó el token o las cookies iniciales del sitio.
+        """
+        metrics = self.run_metrics.by_site()
+        for site, stats in self.site_stats.items():
+            if site not in self.sites_to_query:
+                continue
+            per_job = metrics.get(site, {}).get("requests_per_job")
+            sessions = self.session_stats.get(site)
+            bootstrap = self.bootstrap_stats.get(site)
+            print(
+                f"  {site}: {stats['requests']} peticiones "
+                f"({stats['requests_per_second']:.2f}/s), "
+                f"esperaron {stats['throttled']} ({stats['wait_seconds']:.1f}s), "
+                f"429: {stats['rate_limited_429']}"
+                + (
+                    f", circuito abierto {stats['circuit_opened']} veces "
+                    f"({stats['circuit_rejected']} rechazadas)"
+                    if stats.get("circuit_opened")
+                    else ""
+                )
+                + (f", {per_job:.2f} peticiones/oferta" if per_job is not None else "")
+                + (
+                    f", sesiones: {sessions['sessions_created']} nuevas, "
+                    f"{sessions['sessions_reused']} reutilizadas, "
+                    f"{sessions['tls_handshakes']} handshakes TLS"
+                    if sessions
+                    else ""
+                )
+                + (
+                    f", arranque: {bootstrap['fetched']} descargas, "
+                    f"{bootstrap['cached']} de caché"
+                    if bootstrap
+                    else ""
+                )
+            )
+
+    def plan(self) -> TaskPlan:
+        """
+        Plan de (país, sitio) a procesar: el producto de países y sitios sin
+        las combinaciones imposibles (Glassdoor en un país sin Glassdoor) ni
+        las que repiten la misma petición (ZipRecruiter en cada país).
+        """
+        return plan_tasks(self.collect_countries(), self.sites_to_query)
+
+    def _tasks(self):
+        """
+        Lista de (país, sitio) a procesar, en el orden del planificador.
+        Muestra el plan antes de ejecutarlo.
+        """
+        plan = self.plan()
+        print(plan.report(verbose=self.verbose > 0))
+        yields = self.store.get_yields() if self.store is not None else {}
+        scheduled = schedule_tasks(
+            plan.tasks,
+            yields,
+            self.results_wanted,
+            budget=self.results_budget,
+            probe_results=self.probe_results if yields else None,
+        )
+        self.schedule = {spec.task: spec for spec in scheduled}
+        print(schedule_report(scheduled))
+        return [spec.task for spec in scheduled]
+
+    def _progress_bar(self, total):
+        return tqdm(total=total, ncols=120, dynamic_ncols=False)
+
+    def _start_run(self, collect=True):
+        # Con iter_scraping los resultados se los queda quien itera
+        self.collect_results = collect
+        self.checkpoint = RunCheckpoint(self.run_dir) if self.run_dir else None
+        self.seen_titles = set()
+        # Los contadores del limitador son de todo el proceso: se ponen a cero
+        # para que site_stats refleje solo esta ejecución
+        reset_limiter_stats()
+        reset_session_pool_stats()
+        reset_bootstrap_stats()
+        self.all_dfs = []
+        self.total_raw_jobs = 0
+        self.total_new_jobs = 0
+        self.total_kept_jobs = 0
+        self.resumed_tasks = 0
+        self.failed_tasks = 0
+        self.skipped_tasks = {}
+        self.interrupted_tasks = set()
+        self.stopped_tasks = set()
+        self.cancelled_tasks = 0
+        self._stop = threading.Event()
+        self.run_metrics = RunMetrics()
 
-        total_iterations = len(tasks)
-        total_jobs_global = 0
+    def _resume(self, pbar, tasks):
+        """
+        Con run_dir, carga del disco los (país, sitio) que ya terminaron en una
+        ejecución anterior (incluidos sus títulos, para seguir quitando los
+        repetidos). Retorna (los que faltan, [(país, sitio, DataFrame)] de los
+        cargados).
+        """
+        if self.checkpoint is None:
+            return tasks, []
+        pending = []
+        resumed = []
+        for country, site in tasks:
+            if not self.checkpoint.is_done(country, site):
+                pending.append((country, site))
+                continue
+            result = self.checkpoint.load(country, site)
+            with self._titles_lock:
+                self.seen_titles.update(result[3])
+            self._record_result(pbar, country, site, result)
+            resumed.append((country, site, result[0]))
+            self.resumed_tasks += 1
+        self.checkpoint.plan(pending)
+        return pending, resumed
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor, tqdm(
-            total=total_iterations, ncols=120, dynamic_ncols=False
-        ) as pbar:
+    def _task_done(self, pbar, country, site, result):
+        if (country, site) in self.interrupted_tasks:
+            # Se conserva lo descargado, pero la tarea queda por repetir
+            self.skipped_tasks.setdefault(site, []).append(country)
+            if self.checkpoint is not None:
+                self.checkpoint.mark_failed(
+                    country, site, CircuitOpenError(site, 0), state="skipped"
+                )
+        elif (country, site) in self.stopped_tasks:
+            # Cortada por target_matches: en el checkpoint sigue pendiente
+            pass
+        elif self.checkpoint is not None:
+            self.checkpoint.save(country, site, result)
+        self._record_result(pbar, country, site, result)
+        return result[0]
+
+    def _task_failed(self, pbar, country, site, error):
+        if isinstance(error, CircuitOpenError):
+            self.skipped_tasks.setdefault(site, []).append(country)
+            state = "skipped"
+        else:
+            self.failed_tasks += 1
+            state = "failed"
+        if self.checkpoint is not None:
+            self.checkpoint.mark_failed(country, site, error, state=state)
+        result = self._empty_result()
+        self._record_result(pbar, country, site, result)
+        return result[0]
+
+    def _record_result(self, pbar, country, site, result):
+        """
+        Acumula el resultado de un (país, sitio) y actualiza la barra de progreso.
+        """
+        pbar.set_description_str(f"Analizando {site} - {country}")
+
+        df_filtered, raw_count, new_count, _ = result
+
+        # Acumulamos en self.all_dfs (solo las filas que pasan los filtros)
+        if self.collect_results:
+            self.all_dfs.append(df_filtered)
+        self.total_kept_jobs += len(df_filtered)
+        self.total_raw_jobs += raw_count
+        self.total_new_jobs += new_count
+
+        if self.filters is not None:
+            pbar.set_postfix_str(
+                f"jobs={self.total_raw_jobs} matched={self.total_kept_jobs}"
+            )
+        else:
+            pbar.set_postfix_str(f"jobs={self.total_kept_jobs}")
+        pbar.update(1)
+
+    def _empty_result(self):
+        return pd.DataFrame(columns=self.DESIRED_COLS), 0, 0, []
+
+    def iter_scraping(self):
+        """
+        Igual que run_scraping, pero en vez de esperar a que terminen todas las
+        tareas cede (país, sitio, DataFrame) en cuanto termina cada una, con las
+        filas que pasan los filtros (o todas, sin filtros). Las tareas
+        reanudadas de run_dir se ceden al principio. El resumen se muestra al
+        agotar el generador; si se abandona antes, se cancelan las tareas que
+        aún no empezaron. No acumula los resultados: se los queda quien itera.
+        """
+        yield from self._iter_scraping(collect=False)
+
+    def _iter_scraping(self, collect):
+        tasks = self._tasks()
+        self._start_run(collect)
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            with self._progress_bar(len(tasks)) as pbar:
+                pending, resumed = self._resume(pbar, tasks)
+                if self._target_reached():
+                    self.cancelled_tasks = len(pending)
+                    pending = []
+                yield from resumed
 
-            future_to_task = {
-                executor.submit(self._scrape_single_df, country, site): (country, site)
-                for (country, site) in tasks
-            }
+                future_to_task = {
+                    executor.submit(self._scrape_single_df, country, site): (country, site)
+                    for (country, site) in pending
+                }
 
-            for future in as_completed(future_to_task):
-                country, site = future_to_task[future]
+                for future in as_completed(future_to_task):
+                    if future.cancelled():
+                        continue
+                    country, site = future_to_task[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Se queda df vacío; al reanudar se vuelve a intentar
+                        df = self._task_failed(pbar, country, site, e)
+                    else:
+                        df = self._task_done(pbar, country, site, result)
+                    if self._target_reached():
+                        # Las que aún no empezaron no llegan a empezar
+                        self.cancelled_tasks = sum(
+                            other.cancel() for other in future_to_task
+                        )
+                    yield country, site, df
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
 
-                pbar.set_description_str(f"Analizando {site} - {country}")
+        self._report_run()
 
-                df_filtered = pd.DataFrame(columns=self.DESIRED_COLS)
+    def run_scraping(self) -> pd.DataFrame:
+        """
+        Ejecuta el scraping país-por-país, sitio-por-sitio de forma *paralela*,
+        mostrando el progreso con tqdm y actualizando el conteo global.
+        Al final, concatena todo en un DataFrame con las columnas importantes.
+        """
+        for _ in self._iter_scraping(collect=True):
+            pass
+        return self._concat_results()
+
+    async def aiter_scraping(self):
+        """
+        Versión async de iter_scraping: `async for country, site, df in
+        scraper.aiter_scraping()`.
+        """
+        async for item in self._aiter_scraping(collect=False):
+            yield item
+
+    async def _aiter_scraping(self, collect):
+        tasks = self._tasks()
+        self._start_run(collect)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run_task(country, site):
+            async with semaphore:
+                if self._stop.is_set():
+                    # Cancelada: se llegó a target_matches mientras esperaba
+                    return country, site, None, None
                 try:
-                    df_filtered = future.result()
-                except Exception:
-                    pass  # Se queda df vacío
+                    return country, site, await self._ascrape_single_df(country, site), None
+                except Exception as e:
+                    return country, site, None, e
 
-                # Acumulamos en self.all_dfs
-                self.all_dfs.append(df_filtered)
-                site_count = len(df_filtered)
-                total_jobs_global += site_count
+        running = []
+        try:
+            with self._progress_bar(len(tasks)) as pbar:
+                pending, resumed = self._resume(pbar, tasks)
+                self._target_reached()
+                for item in resumed:
+                    yield item
+                running = [
+                    asyncio.ensure_future(run_task(country, site))
+                    for (country, site) in pending
+                ]
+                for coro in asyncio.as_completed(running):
+                    country, site, result, error = await coro
+                    if result is None and error is None:
+                        self.cancelled_tasks += 1
+                        continue
+                    if error is not None:
+                        df = self._task_failed(pbar, country, site, error)
+                    else:
+                        df = self._task_done(pbar, country, site, result)
+                    self._target_reached()
+                    yield country, site, df
+        finally:
+            for task in running:
+                task.cancel()
 
-                pbar.set_postfix_str(f"jobs={total_jobs_global}")
-                pbar.update(1)
+        self._report_run()
+
+    async def arun_scraping(self) -> pd.DataFrame:
+        """
+        Versión async de run_scraping: cada (país, sitio) es una corrutina y
+        como mucho `max_workers` se ejecutan a la vez. Debe esperarse desde un
+        bucle de eventos, p. ej. asyncio.run(scraper.arun_scraping()).
+        """
+        async for _ in self._aiter_scraping(collect=True):
+            pass
+        return self._concat_results()
 
+    def concat_frames(self, dfs) -> pd.DataFrame:
+        """
+        Concatena los DataFrames de varias tareas (p. ej. los que cede
+        iter_scraping) en uno con las columnas importantes.
+        """
         # Excluimos dataframes vacíos para evitar warnings de concat
         # 1) Excluimos DataFrames completamente vacíos
         valid_dfs = []
-        for df in self.all_dfs:
+        for df in dfs:
             # si deseas eliminar columnas all-NA (opcional)
             df = df.dropna(axis=1, how="all")
             if not df.empty:
@@ -165,14 +856,52 @@ class JobScraper:
 
         # 2) Concatenamos si hay al menos uno
         if valid_dfs:
-            # sort=False evita reordenar las columnas
-            final_df = pd.concat(valid_dfs, ignore_index=True, sort=False)
-        else:
-            final_df = pd.DataFrame(columns=self.DESIRED_COLS)
+            # sort=False evita reordenar las columnas. concat deja como object
+            # las categóricas con categorías distintas: se vuelven a tipar
+            return apply_job_schema(pd.concat(valid_dfs, ignore_index=True, sort=False))
+        return pd.DataFrame(columns=self.DESIRED_COLS)
 
-        print(
-            f"\nTOTAL de trabajos (excluyendo {self.exclude_countries}): {total_jobs_global}"
-        )
+    def _concat_results(self) -> pd.DataFrame:
+        final_df = self.concat_frames(self.all_dfs)
         print(f"Final DataFrame shape: {final_df.shape} (filas, columnas)\n")
-
         return final_df
+
+    def _report_run(self):
+        """
+        Muestra el resumen de la ejecución.
+        """
+        self.site_stats = limiter_stats()
+        self.session_stats = session_pool_stats()
+        self.bootstrap_stats = bootstrap_stats()
+
+        print(
+            f"\nTOTAL de trabajos (excluyendo {self.exclude_countries}): {self.total_raw_jobs}"
+        )
+        if self.store is not None:
+            print(
+                f"Trabajos nuevos en {self.store.path}: {self.total_new_jobs} "
+                f"(total guardados: {len(self.store)})"
+            )
+        if self.filters is not None:
+            print(f"Trabajos que pasan los filtros: {self.total_kept_jobs}")
+        if self.failed_tasks:
+            print(f"Tareas fallidas: {self.failed_tasks}")
+        self.print_skipped_tasks()
+        if self._stop.is_set():
+            print(
+                f"Objetivo de {self.target_matches} coincidencias alcanzado: "
+                f"{self.cancelled_tasks} tareas canceladas, "
+                f"{len(self.stopped_tasks)} paradas en un límite de página"
+            )
+        if self.checkpoint is not None:
+            skipped = sum(len(countries) for countries in self.skipped_tasks.values())
+            print(
+                f"Ejecución guardada en {self.run_dir}: "
+                f"{self.resumed_tasks} tareas reanudadas del disco, "
+                f"{self.failed_tasks + skipped + len(self.stopped_tasks)} por repetir"
+            )
+        self.print_site_stats()
+        if self.metrics_path:
+            self.run_metrics.to_json(f"{self.metrics_path}.json")
+            self.run_metrics.to_prometheus(f"{self.metrics_path}.prom")
+            print(f"Métricas guardadas en {self.metrics_path}.json y {self.metrics_path}.prom")
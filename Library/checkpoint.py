@@ -0,0 +1,111 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+
+class RunCheckpoint:
+    """
+    Directorio de una ejecución de JobScraper. Cada (país, sitio) terminado
+    deja su DataFrame (ya filtrado) en un .pkl y su estado en status.json:
+      - "done":    terminado; al reanudar se carga del disco y no se repite.
+      - "failed":  lanzó una excepción; se vuelve a intentar al reanudar.
+      - "skipped": no se hizo (o se cortó) porque el sitio tenía el circuito
+                   abierto; también se repite.
+      - "pending": planificado y aún sin terminar (o cancelado o cortado al
+                   llegar a target_matches); también se repite.
+    status.json se reescribe entero (y de forma atómica) tras cada tarea, así
+    que una interrupción a mitad nunca deja el directorio corrupto.
+    """
+
+    STATUS_FILE = "status.json"
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self.status: Dict[str, dict] = {}
+        status_path = os.path.join(path, self.STATUS_FILE)
+        if os.path.exists(status_path):
+            with open(status_path, "r", encoding="utf-8") as f:
+                self.status = json.load(f)
+
+    @staticmethod
+    def _key(country: str, site: str) -> str:
+        return f"{site}/{country}"
+
+    def _frame_path(self, country: str, site: str) -> str:
+        name = f"{site}__{country}".replace(" ", "_").replace("/", "_")
+        return os.path.join(self.path, f"{name}.pkl")
+
+    def _save_status(self):
+        status_path = os.path.join(self.path, self.STATUS_FILE)
+        tmp_path = status_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.status, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, status_path)
+
+    def state(self, country: str, site: str) -> Optional[str]:
+        entry = self.status.get(self._key(country, site))
+        return entry["state"] if entry else None
+
+    def is_done(self, country: str, site: str) -> bool:
+        return self.state(country, site) == "done"
+
+    def plan(self, tasks: List[Tuple[str, str]]):
+        """
+        Registra como pendientes las tareas del plan que aún no tengan estado
+        (las fallidas conservan su error hasta que se repitan).
+        """
+        with self.lock:
+            for country, site in tasks:
+                if self.state(country, site) is None:
+                    self.status[self._key(country, site)] = {"state": "pending"}
+            self._save_status()
+
+    def save(self, country: str, site: str, result):
+        """
+        Guarda el resultado de una tarea terminada: (df, nº descargados,
+        nº nuevos, títulos registrados por la tarea).
+        """
+        df, raw_count, new_count, titles = result
+        frame_path = self._frame_path(country, site)
+        tmp_path = frame_path + ".tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, frame_path)
+        with self.lock:
+            self.status[self._key(country, site)] = {
+                "state": "done",
+                "raw_count": raw_count,
+                "new_count": new_count,
+                "titles": list(titles),
+                "finished": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            self._save_status()
+
+    def mark_failed(
+        self, country: str, site: str, error: Exception, state: str = "failed"
+    ):
+        with self.lock:
+            self.status[self._key(country, site)] = {
+                "state": state,
+                "error": f"{type(error).__name__}: {error}",
+            }
+            self._save_status()
+
+    def load(self, country: str, site: str):
+        """
+        Resultado guardado de una tarea terminada, en el mismo formato que save().
+        """
+        entry = self.status[self._key(country, site)]
+        df = pd.read_pickle(self._frame_path(country, site))
+        return df, entry["raw_count"], entry["new_count"], entry.get("titles", [])
+
+    def counts(self) -> Dict[str, int]:
+        counts: Dict[str, int] = {}
+        for entry in self.status.values():
+            counts[entry["state"]] = counts.get(entry["state"], 0) + 1
+        return counts
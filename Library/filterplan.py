@@ -0,0 +1,468 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Library.matcher import PatternMatcher
+from Library.normalize import normalize_patterns, normalized_column
+
+
+class FilterRule:
+    """
+    Regla base: evalúa una columna y devuelve una máscara booleana (numpy)
+    con True para las filas que sobreviven. Si `normalized` es True, la
+    columna llega ya normalizada desde la caché compartida (normalize.py).
+    """
+
+    name = "rule"
+    normalized = False
+    # Coste estimado (segundos por fila) mientras no haya estadísticas observadas
+    estimated_cost = 1e-6
+
+    def __init__(self, column: str):
+        self.column = column
+
+    def evaluate(self, series: pd.Series) -> np.ndarray:
+        raise NotImplementedError
+
+    def spec(self) -> tuple:
+        """
+        Todo lo que determina el resultado de la regla; dos reglas con la
+        misma spec producen la misma máscara sobre el mismo DataFrame.
+        """
+        return (type(self).__name__, self.column)
+
+    @property
+    def cache_key(self) -> str:
+        return hashlib.sha1(repr(self.spec()).encode("utf-8")).hexdigest()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.name!r})"
+
+
+class DateRule(FilterRule):
+    """
+    Conserva las filas publicadas en los últimos `days_back` días. El corte se
+    calcula en cada evaluación para que el plan compilado se pueda reutilizar.
+    """
+
+    estimated_cost = 5e-7
+
+    def __init__(self, column: str, days_back: int):
+        super().__init__(column)
+        self.days_back = days_back
+        self.name = f"{column}>=now-{days_back}d"
+
+    def evaluate(self, series: pd.Series) -> np.ndarray:
+        dates = (
+            series
+            if pd.api.types.is_datetime64_any_dtype(series)
+            else pd.to_datetime(series, errors="coerce")
+        )
+        cutoff = pd.Timestamp.now() - pd.Timedelta(days=self.days_back)
+        return (dates >= cutoff).to_numpy(dtype=bool)
+
+    def spec(self) -> tuple:
+        # El corte depende del día en que se evalúa
+        return super().spec() + (self.days_back, pd.Timestamp.now().date().isoformat())
+
+
+class PatternRule(FilterRule):
+    """
+    Busca una lista de frases con un PatternMatcher compilado una sola vez.
+      - exclude=False: conserva las filas que contienen alguna (o todas) las frases.
+      - exclude=True:  descarta las filas que contienen alguna frase.
+    `mode` es el modo de búsqueda: "substring", "word" o "regex".
+    """
+
+    def __init__(
+        self,
+        column: str,
+        patterns: List[str],
+        exclude: bool = False,
+        all_must_match: bool = False,
+        case_insensitive: bool = True,
+        label: Optional[str] = None,
+        mode: str = "substring",
+    ):
+        super().__init__(column)
+        self.exclude = exclude
+        self.all_must_match = all_must_match
+        self.matcher = PatternMatcher(
+            patterns, case_insensitive=case_insensitive, mode=mode
+        )
+        self.normalized = case_insensitive
+        self.name = label or f"{'-' if exclude else '+'}{column}"
+        # Las descripciones son textos largos; los títulos, cortos
+        self.estimated_cost = 2e-5 if column == "description" else 1e-6
+
+    def evaluate(self, series: pd.Series) -> np.ndarray:
+        if self.all_must_match and not self.exclude:
+            return self.matcher.contains_all(series, prepared=self.normalized).to_numpy(
+                dtype=bool
+            )
+        hits = self.matcher.contains(series, prepared=self.normalized).to_numpy(dtype=bool)
+        return ~hits if self.exclude else hits
+
+    def evaluate_with_hits(self, series: pd.Series) -> Tuple[np.ndarray, Dict[str, Tuple[int, int]]]:
+        """
+        Igual que `evaluate`, pero además devuelve, por frase, cuántas filas
+        la contienen y en cuántas es la única frase encontrada (las filas
+        cuyo resultado cambiaría si se quitara esa frase). Recorre el texto
+        buscando todas las frases, así que es más lento que `evaluate`.
+        """
+        masks = self.matcher.pattern_masks(series, prepared=self.normalized)
+        if not masks:
+            keep = self.evaluate(series)
+            return keep, {}
+        return self.combine(masks), self.pattern_hits(masks)
+
+    def pattern_hits(self, masks: Dict[str, np.ndarray]) -> Dict[str, Tuple[int, int]]:
+        """
+        Por frase de la regla, (filas que la contienen, filas en las que es
+        la única), a partir de máscaras por frase como las de `combine`.
+        """
+        selected = {pattern: masks[pattern] for pattern in self.matcher.patterns}
+        if not selected:
+            return {}
+        found = np.vstack(list(selected.values())).sum(axis=0)
+        return {
+            pattern: (int(mask.sum()), int((mask & (found == 1)).sum()))
+            for pattern, mask in selected.items()
+        }
+
+    def combine(self, masks: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Construye la máscara de la regla a partir de máscaras por frase
+        (las de PatternMatcher.pattern_masks o las de una caché), que deben
+        incluir todas las frases de la regla.
+        """
+        selected = [masks[pattern] for pattern in self.matcher.patterns]
+        if self.all_must_match and not self.exclude:
+            return np.logical_and.reduce(selected)
+        hits = np.logical_or.reduce(selected)
+        return ~hits if self.exclude else hits
+
+    def spec(self) -> tuple:
+        return super().spec() + (
+            self.exclude,
+            self.all_must_match,
+            self.matcher.case_insensitive,
+            self.matcher.mode,
+            tuple(self.matcher.patterns),
+        )
+
+
+class InListRule(FilterRule):
+    """
+    Conserva las filas cuyo valor coincide exactamente con alguno de la lista.
+    """
+
+    estimated_cost = 2e-7
+
+    def __init__(self, column: str, values: List[str], case_insensitive: bool = True):
+        super().__init__(column)
+        self.normalized = case_insensitive
+        self.values = normalize_patterns(values) if case_insensitive else list(values)
+        self.name = f"{column} in list"
+
+    def evaluate(self, series: pd.Series) -> np.ndarray:
+        if not self.normalized:
+            series = series.astype(str)
+        return series.isin(self.values).to_numpy(dtype=bool)
+
+    def spec(self) -> tuple:
+        return super().spec() + (self.normalized, tuple(self.values))
+
+
+class FilterStats:
+    """
+    Estadísticas acumuladas por regla (filas que entran, filas que salen y
+    tiempo empleado), persistidas en un JSON para que el orden de las reglas
+    mejore de una ejecución a otra.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.rules: Dict[str, Dict[str, float]] = {}
+        # Los hilos de JobScraper filtran en paralelo sobre el mismo plan
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.rules = json.load(f)
+            except (OSError, ValueError):
+                self.rules = {}
+
+    def record(
+        self, rule: FilterRule, rows_in: int, rows_out: int, seconds: Optional[float]
+    ):
+        """
+        Con seconds=None solo se acumula la selectividad: el tiempo de una
+        evaluación con perfil (evaluate_with_hits) no es el coste normal.
+        """
+        with self._lock:
+            entry = self.rules.setdefault(
+                rule.name, {"rows_in": 0, "rows_out": 0, "seconds": 0.0}
+            )
+            # JSON antiguos: todas sus filas se midieron con tiempo
+            entry.setdefault("timed_rows", entry["rows_in"])
+            entry["rows_in"] += rows_in
+            entry["rows_out"] += rows_out
+            if seconds is not None:
+                entry["timed_rows"] += rows_in
+                entry["seconds"] += seconds
+
+    def cost(self, rule: FilterRule) -> float:
+        entry = self.rules.get(rule.name)
+        timed_rows = entry.get("timed_rows", entry["rows_in"]) if entry else 0
+        if not timed_rows:
+            return rule.estimated_cost
+        return entry["seconds"] / timed_rows
+
+    def pass_rate(self, rule: FilterRule) -> float:
+        entry = self.rules.get(rule.name)
+        if not entry or not entry["rows_in"]:
+            return 0.5
+        return entry["rows_out"] / entry["rows_in"]
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock, open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.rules, f, indent=2, ensure_ascii=False)
+
+
+class FilterProfile:
+    """
+    Perfil de una o varias ejecuciones de los filtros: por regla, filas que
+    entran y salen, tiempo y, en las reglas de frases, cuántas filas
+    contienen cada frase ("hits") y en cuántas es la única ("only").
+    Una frase con hits=0 no descarta nada y se puede quitar.
+    """
+
+    def __init__(self):
+        self.rules: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        rule: FilterRule,
+        rows_in: int,
+        rows_out: int,
+        seconds: float,
+        hits: Optional[Dict[str, Tuple[int, int]]] = None,
+    ):
+        with self._lock:
+            entry = self.rules.setdefault(
+                rule.name,
+                {
+                    "column": rule.column,
+                    "calls": 0,
+                    "rows_in": 0,
+                    "rows_out": 0,
+                    "seconds": 0.0,
+                    "patterns": {},
+                },
+            )
+            entry["calls"] += 1
+            entry["rows_in"] += rows_in
+            entry["rows_out"] += rows_out
+            entry["seconds"] += seconds
+            if isinstance(rule, PatternRule):
+                for pattern in rule.matcher.patterns:
+                    counts = entry["patterns"].setdefault(pattern, {"hits": 0, "only": 0})
+                    pattern_hits, only = (hits or {}).get(pattern, (0, 0))
+                    counts["hits"] += pattern_hits
+                    counts["only"] += only
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return json.loads(json.dumps(self.rules))
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        """
+        Devuelve el perfil en JSON y, si se indica `path`, lo guarda ahí.
+        """
+        text = json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def report(self, top: int = 10) -> str:
+        """
+        Resumen legible: una línea por regla y, en las de frases, las que
+        más filas encuentran y las que no encuentran ninguna.
+        """
+        lines = [f"{'regla':<28} {'entran':>8} {'salen':>8} {'tiempo':>9}"]
+        for name, entry in self.to_dict().items():
+            lines.append(
+                f"{name:<28} {entry['rows_in']:>8} {entry['rows_out']:>8} "
+                f"{entry['seconds'] * 1000:>7.1f}ms"
+            )
+            patterns = entry["patterns"]
+            if not patterns:
+                continue
+            ranked = sorted(patterns.items(), key=lambda item: -item[1]["hits"])
+            for pattern, counts in ranked[:top]:
+                if counts["hits"]:
+                    lines.append(
+                        f"    {pattern!r}: hits={counts['hits']} only={counts['only']}"
+                    )
+            dead = [pattern for pattern, counts in ranked if not counts["hits"]]
+            if dead:
+                lines.append(f"    sin coincidencias ({len(dead)}): {', '.join(map(repr, dead))}")
+        return "\n".join(lines)
+
+
+class CompiledFilters:
+    """
+    Conjunto de reglas compilado a partir de un diccionario filter_parameters.
+
+    Se compila una vez y se reutiliza en cada ejecución: `mask(df)` construye
+    una única máscara booleana sobre el DataFrame original (cada regla solo
+    evalúa las filas que siguen vivas) y `apply(df)` recorta el DataFrame una
+    sola vez al final, sin copias intermedias.
+
+    Las reglas se ordenan con `plan()`: primero las baratas y muy selectivas,
+    para que las búsquedas sobre la descripción reciban el menor número de
+    filas posible.
+    """
+
+    def __init__(
+        self,
+        rules: List[FilterRule],
+        stats: Optional[FilterStats] = None,
+        profile: Optional[FilterProfile] = None,
+    ):
+        self.rules = rules
+        self.stats = stats or FilterStats()
+        # Si hay perfil, las reglas de frases cuentan además los hits por frase
+        self.profile = profile
+
+    def plan(self) -> List[FilterRule]:
+        """
+        Ordena las reglas por coste / fracción de filas que descartan, usando
+        las estadísticas observadas o, si aún no hay, las estimaciones.
+        """
+
+        def rank(rule: FilterRule) -> float:
+            removed = 1.0 - self.stats.pass_rate(rule)
+            return self.stats.cost(rule) / max(removed, 1e-6)
+
+        return sorted(self.rules, key=rank)
+
+    def save_stats(self):
+        self.stats.save()
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def __iter__(self):
+        return iter(self.rules)
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        alive = np.ones(len(df), dtype=bool)
+        for rule in self.plan():
+            if rule.column not in df.columns:
+                continue
+            positions = np.flatnonzero(alive)
+            if positions.size == 0:
+                break
+            start = time.perf_counter()
+            if rule.normalized:
+                column = normalized_column(df, rule.column, positions)
+            else:
+                column = df[rule.column]
+                if positions.size < len(df):
+                    column = column.iloc[positions]
+            hits = None
+            if self.profile is not None and isinstance(rule, PatternRule):
+                keep, hits = rule.evaluate_with_hits(column)
+            else:
+                keep = rule.evaluate(column)
+            seconds = time.perf_counter() - start
+            self.stats.record(
+                rule, positions.size, int(keep.sum()), None if hits is not None else seconds
+            )
+            if self.profile is not None:
+                self.profile.record(rule, positions.size, int(keep.sum()), seconds, hits)
+            alive[positions] = keep
+        return alive
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[self.mask(df)]
+
+
+def compile_filters(
+    filter_params: Dict[str, Any],
+    stats_path: Optional[str] = None,
+    profile: bool = False,
+) -> CompiledFilters:
+    """
+    Traduce el diccionario de filter_params.py a un CompiledFilters.
+    Si se indica `stats_path`, las estadísticas de selectividad se cargan de
+    ese JSON (y se guardan con `save_stats()`) para planificar el orden.
+    El modo de búsqueda de cada lista se lee de filter_params["match_mode"].
+    Con profile=True se adjunta un FilterProfile (ver `compiled.profile`).
+    """
+    rules: List[FilterRule] = []
+    match_mode = filter_params.get("match_mode") or {}
+
+    if filter_params.get("days_back") is not None:
+        rules.append(DateRule("date_posted", filter_params["days_back"]))
+
+    if filter_params.get("keywords_in_description"):
+        rules.append(
+            PatternRule(
+                "description",
+                filter_params["keywords_in_description"],
+                label="keywords_in_description",
+                mode=match_mode.get("keywords_in_description", "substring"),
+            )
+        )
+
+    if filter_params.get("negatives_in_description"):
+        rules.append(
+            PatternRule(
+                "description",
+                filter_params["negatives_in_description"],
+                exclude=True,
+                label="negatives_in_description",
+                mode=match_mode.get("negatives_in_description", "substring"),
+            )
+        )
+
+    if filter_params.get("title_keywords"):
+        rules.append(
+            PatternRule(
+                "title",
+                filter_params["title_keywords"],
+                label="title_keywords",
+                mode=match_mode.get("title_keywords", "substring"),
+            )
+        )
+
+    if filter_params.get("negatives_in_title"):
+        rules.append(
+            PatternRule(
+                "title",
+                filter_params["negatives_in_title"],
+                exclude=True,
+                label="negatives_in_title",
+                mode=match_mode.get("negatives_in_title", "substring"),
+            )
+        )
+
+    if filter_params.get("country_list"):
+        rules.append(InListRule("country", filter_params["country_list"]))
+
+    return CompiledFilters(
+        rules, FilterStats(stats_path), FilterProfile() if profile else None
+    )
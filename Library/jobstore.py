@@ -0,0 +1,271 @@
+import sqlite3
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import pandas as pd
+
+from JobSpy import apply_job_schema
+
+
+class JobStore:
+    """
+    Almacén local (SQLite) de todas las ofertas descargadas.
+
+    Cada oferta se guarda con el `id` que genera su scraper (in-, gd-, zr-,
+    li-, go-): si ya existía se actualiza (upsert) y se conserva la fecha en
+    que se vio por primera vez (first_seen); last_seen se actualiza en cada
+    ejecución. Las consultas por fecha, sitio y país usan índices, así que los
+    filtros se pueden volver a aplicar sobre el histórico sin conexión.
+
+    También guarda, por (país, sitio), la marca de agua: el momento del último
+    scraping correcto, a partir del cual JobScraper descarga solo lo nuevo,
+    y el rendimiento histórico de cada (país, sitio) con el que se ordenan las
+    tareas (scheduler.py).
+    """
+
+    # Peso de la última ejecución en la media móvil del rendimiento
+    YIELD_ALPHA = 0.5
+
+    COLUMNS = [
+        "id",
+        "site",
+        "country",
+        "title",
+        "job_type",
+        "interval",
+        "min_amount",
+        "max_amount",
+        "job_url",
+        "description",
+        "date_posted",
+    ]
+
+    def __init__(self, path: str = "jobs.db"):
+        self.path = path
+        # Los hilos de JobScraper guardan lo que descargan en paralelo
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS jobs (
+                    id TEXT PRIMARY KEY,
+                    site TEXT,
+                    country TEXT,
+                    title TEXT,
+                    job_type TEXT,
+                    interval TEXT,
+                    min_amount REAL,
+                    max_amount REAL,
+                    job_url TEXT,
+                    description TEXT,
+                    date_posted TEXT,
+                    first_seen TEXT NOT NULL,
+                    last_seen TEXT NOT NULL
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS watermarks (
+                    country TEXT NOT NULL,
+                    site TEXT NOT NULL,
+                    last_success TEXT NOT NULL,
+                    PRIMARY KEY (country, site)
+                )
+                """
+            )
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS task_yield (
+                    country TEXT NOT NULL,
+                    site TEXT NOT NULL,
+                    runs INTEGER NOT NULL,
+                    fill REAL NOT NULL,
+                    matched REAL,
+                    last_run TEXT NOT NULL,
+                    PRIMARY KEY (country, site)
+                )
+                """
+            )
+            for column in ("date_posted", "site", "country", "last_seen"):
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS jobs_{column} ON jobs ({column})"
+                )
+
+    @staticmethod
+    def _value(value):
+        # SQLite no entiende NaN/NaT ni fechas de pandas
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return None
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()[:10]
+        if hasattr(value, "item"):
+            return value.item()
+        return value
+
+    def upsert(self, df: pd.DataFrame, seen_at: Optional[datetime] = None) -> Tuple[int, int]:
+        """
+        Inserta o actualiza las filas de `df` (las que tienen `id`).
+        Devuelve (nuevas, actualizadas).
+        """
+        if df.empty or "id" not in df.columns:
+            return 0, 0
+        seen_at = (seen_at or datetime.now()).isoformat(timespec="seconds")
+        columns = [c for c in self.COLUMNS if c in df.columns]
+        rows = [
+            tuple(self._value(v) for v in row) + (seen_at, seen_at)
+            for row in df[columns].itertuples(index=False, name=None)
+            if not pd.isna(row[0])
+        ]
+        if not rows:
+            return 0, 0
+
+        names = ", ".join(columns + ["first_seen", "last_seen"])
+        placeholders = ", ".join("?" for _ in range(len(columns) + 2))
+        updates = ", ".join(
+            f"{c} = excluded.{c}" for c in columns[1:] + ["last_seen"]
+        )
+        with self._lock, self._conn:
+            before = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+            self._conn.executemany(
+                f"INSERT INTO jobs ({names}) VALUES ({placeholders}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                rows,
+            )
+            after = self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+        inserted = after - before
+        return inserted, len(rows) - inserted
+
+    def query(
+        self,
+        sites: Optional[Iterable[str]] = None,
+        countries: Optional[Iterable[str]] = None,
+        posted_since: Optional[Union[date, str]] = None,
+        seen_since: Optional[Union[datetime, str]] = None,
+        seen_before: Optional[Union[datetime, str]] = None,
+    ) -> pd.DataFrame:
+        """
+        Devuelve las ofertas guardadas, opcionalmente limitadas a unos sitios,
+        unos países, publicadas desde `posted_since`, vistas desde `seen_since`
+        o vistas por última vez antes de `seen_before`.
+        """
+        clauses = []
+        params = []
+        for column, values in (("site", sites), ("country", countries)):
+            if values:
+                values = list(values)
+                clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+        if posted_since is not None:
+            clauses.append("date_posted >= ?")
+            params.append(str(posted_since)[:10])
+        for op, when in ((">=", seen_since), ("<", seen_before)):
+            if when is not None:
+                clauses.append(f"last_seen {op} ?")
+                params.append(
+                    when.isoformat(timespec="seconds")
+                    if isinstance(when, datetime)
+                    else str(when)
+                )
+
+        sql = "SELECT * FROM jobs"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY site, date_posted DESC"
+        with self._lock:
+            df = pd.read_sql_query(sql, self._conn, params=params)
+        # Mismos tipos que el DataFrame de scrape_jobs, para poder concatenarlos
+        return apply_job_schema(df)
+
+    def get_watermark(self, country: str, site: str) -> Optional[datetime]:
+        """
+        Momento del último scraping correcto de (country, site), o None.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_success FROM watermarks WHERE country = ? AND site = ?",
+                (country, site),
+            ).fetchone()
+        return datetime.fromisoformat(row[0]) if row else None
+
+    def set_watermark(self, country: str, site: str, when: datetime):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO watermarks (country, site, last_success) VALUES (?, ?, ?) "
+                "ON CONFLICT(country, site) DO UPDATE SET last_success = excluded.last_success",
+                (country, site, when.isoformat(timespec="seconds")),
+            )
+
+    def record_yield(
+        self,
+        country: str,
+        site: str,
+        requested: int,
+        raw: int,
+        matched: Optional[int] = None,
+    ):
+        """
+        Actualiza la media móvil del rendimiento de (country, site) con una
+        ejecución en la que se pidieron `requested` ofertas, llegaron `raw` y
+        pasaron los filtros `matched` (None si no se filtró: se conserva la
+        media anterior de coincidencias).
+        """
+        if requested <= 0:
+            return
+        fill = raw / requested
+        matched_rate = None if matched is None else matched / requested
+        alpha = self.YIELD_ALPHA
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT runs, fill, matched FROM task_yield WHERE country = ? AND site = ?",
+                (country, site),
+            ).fetchone()
+            if row is not None:
+                runs, old_fill, old_matched = row
+                fill = alpha * fill + (1 - alpha) * old_fill
+                if matched_rate is None:
+                    matched_rate = old_matched
+                elif old_matched is not None:
+                    matched_rate = alpha * matched_rate + (1 - alpha) * old_matched
+                runs += 1
+            else:
+                runs = 1
+            self._conn.execute(
+                "INSERT INTO task_yield (country, site, runs, fill, matched, last_run) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(country, site) DO UPDATE SET runs = excluded.runs, "
+                "fill = excluded.fill, matched = excluded.matched, last_run = excluded.last_run",
+                (
+                    country,
+                    site,
+                    runs,
+                    fill,
+                    matched_rate,
+                    datetime.now().isoformat(timespec="seconds"),
+                ),
+            )
+
+    def get_yields(self) -> Dict[Tuple[str, str], Tuple[float, Optional[float], int]]:
+        """
+        Rendimiento histórico por (país, sitio): (ofertas recibidas por oferta
+        pedida, ofertas que pasan los filtros por oferta pedida o None,
+        nº de ejecuciones).
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT country, site, fill, matched, runs FROM task_yield"
+            ).fetchall()
+        return {(country, site): (fill, matched, runs) for country, site, fill, matched, runs in rows}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM jobs").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
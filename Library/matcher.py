@@ -0,0 +1,273 @@
+import re
+from operator import itemgetter
+from typing import Dict, Iterable, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from Library.normalize import normalize_patterns, normalize_regex, normalize_text
+
+try:
+    import ahocorasick
+except ImportError:  # pyahocorasick es opcional: sin él se usa el trie compilado
+    ahocorasick = None
+
+# Modos de búsqueda de una lista de frases:
+#   "substring": la frase aparece en cualquier parte ("lead" encuentra "leading")
+#   "word":      la frase aparece como palabra(s) completa(s)
+#   "regex":     cada entrada es una expresión regular
+MATCH_MODES = ("substring", "word", "regex")
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+def _contains_word(text: str, pattern: str) -> bool:
+    """
+    True si `pattern` aparece en `text` rodeado de límites de palabra.
+    """
+    start = text.find(pattern)
+    while start != -1:
+        end = start + len(pattern)
+        if (start == 0 or not _is_word_char(text[start - 1])) and (
+            end == len(text) or not _is_word_char(text[end])
+        ):
+            return True
+        start = text.find(pattern, start + 1)
+    return False
+
+
+class PatternMatcher:
+    """
+    Compila una lista de frases en un único autómata para recorrer cada texto
+    una sola vez, en lugar de hacer un `kw in text` por cada frase.
+
+    En modos "substring" y "word", si pyahocorasick está instalado se usa su
+    autómata Aho-Corasick (en C); en modo "word" se comprueba además que cada
+    coincidencia esté rodeada de límites de palabra. Si no está instalado,
+    el trie de frases se expresa como una única expresión regular (evaluada
+    con `str.contains`): como las ramas son disjuntas por carácter y se
+    prefiere continuar antes que terminar, en cada posición devuelve la frase
+    más larga que empieza ahí, y las frases más cortas de esa posición son
+    los prefijos de la coincidencia que también son frases.
+    En modo "regex" las expresiones se unen en una sola alternancia.
+    """
+
+    def __init__(
+        self,
+        patterns: Iterable[str],
+        case_insensitive: bool = True,
+        mode: str = "substring",
+    ):
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Modo de búsqueda no válido: {mode!r} (usa {MATCH_MODES})")
+        # case_insensitive=True compara textos normalizados (ver normalize_text):
+        # sin distinguir mayúsculas ni acentos y con los espacios colapsados
+        self.case_insensitive = case_insensitive
+        self.mode = mode
+
+        if case_insensitive and mode == "regex":
+            # Las expresiones se comparan con el texto sin acentos: se les
+            # quitan también a ellas (las mayúsculas las cubre IGNORECASE)
+            self.patterns = list(dict.fromkeys(normalize_regex(p) for p in patterns if p))
+        elif case_insensitive:
+            self.patterns = normalize_patterns(patterns)
+        else:
+            self.patterns = list(dict.fromkeys(p for p in patterns if p))
+
+        self.regex = None
+        self._scan_regex = None
+        self._pattern_regexes = {}
+        self._prefixes = {}
+        self._automaton = None
+        if not self.patterns:
+            return
+
+        if mode == "regex":
+            flags = re.IGNORECASE if case_insensitive else 0
+            self.regex = re.compile("|".join(f"(?:{p})" for p in self.patterns), flags)
+            self._pattern_regexes = {p: re.compile(p, flags) for p in self.patterns}
+            return
+
+        self._trie: Dict = {}
+        for pattern in self.patterns:
+            node = self._trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        body = self._trie_to_regex(self._trie)
+        if mode == "word":
+            self.regex = re.compile(rf"(?<!\w)(?:{body})(?!\w)")
+            self._scan_regex = re.compile(rf"(?=(?<!\w)({body})(?!\w))")
+        else:
+            self.regex = re.compile(body)
+            self._scan_regex = re.compile(f"(?=({body}))")
+
+        # Para cada frase, las frases que son prefijo suyo (incluida ella misma)
+        pattern_set = set(self.patterns)
+        self._prefixes = {
+            pattern: [pattern[:i] for i in range(1, len(pattern) + 1) if pattern[:i] in pattern_set]
+            for pattern in self.patterns
+        }
+
+        if ahocorasick is not None:
+            self._automaton = ahocorasick.Automaton()
+            for pattern in self.patterns:
+                self._automaton.add_word(pattern, pattern)
+            self._automaton.make_automaton()
+
+    @property
+    def backend(self) -> str:
+        return "ahocorasick" if self._automaton is not None else "regex"
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    @classmethod
+    def _trie_to_regex(cls, node: Dict) -> str:
+        branches = []
+        for char in sorted(k for k in node if k):
+            branches.append(re.escape(char) + cls._trie_to_regex(node[char]))
+        terminal = "" in node
+
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            # Greedy: primero se intenta seguir por el trie, luego terminar aquí
+            if len(branches) == 1 and len(body) > 1:
+                body = "(?:" + body + ")"
+            body += "?"
+        return body
+
+    def _prepare(self, text: str) -> str:
+        return normalize_text(text) if self.case_insensitive else text
+
+    def search(self, text: Optional[str]) -> bool:
+        """
+        Devuelve True si alguna de las frases aparece en el texto.
+        """
+        if self.regex is None or text is None:
+            return False
+        if self._automaton is not None:
+            for _ in self._automaton_hits(self._prepare(text)):
+                return True
+            return False
+        return self.regex.search(self._prepare(text)) is not None
+
+    def _automaton_hits(self, text: str):
+        """
+        Recorre las coincidencias del autómata; en modo "word" descarta las
+        que no empiezan y terminan en límite de palabra.
+        """
+        if self.mode != "word":
+            for _, pattern in self._automaton.iter(text):
+                yield pattern
+            return
+        last = len(text) - 1
+        for end, pattern in self._automaton.iter(text):
+            start = end - len(pattern) + 1
+            if start > 0 and _is_word_char(text[start - 1]):
+                continue
+            if end < last and _is_word_char(text[end + 1]):
+                continue
+            yield pattern
+
+    def findall(self, text: Optional[str]) -> Set[str]:
+        """
+        Devuelve el conjunto de frases que aparecen en el texto (incluidas
+        las que se solapan entre sí).
+        """
+        if self.regex is None or text is None:
+            return set()
+        return self._findall_prepared(self._prepare(text))
+
+    def _findall_prepared(self, text: str) -> Set[str]:
+        found: Set[str] = set()
+        if self.mode == "regex":
+            found.update(p for p, regex in self._pattern_regexes.items() if regex.search(text))
+            return found
+        if self._automaton is not None:
+            if self.mode == "substring":
+                # Sin comprobar límites de palabra se recorre el iterador en C
+                found.update(map(itemgetter(1), self._automaton.iter(text)))
+            else:
+                found.update(self._automaton_hits(text))
+            return found
+        for match in self._scan_regex.finditer(text):
+            if self.mode == "word":
+                # Las frases más cortas en esta posición también deben acabar en
+                # límite de palabra
+                start = match.start(1)
+                for prefix in self._prefixes[match.group(1)]:
+                    end = start + len(prefix)
+                    if end == len(text) or not _is_word_char(text[end]):
+                        found.add(prefix)
+            else:
+                found.update(self._prefixes[match.group(1)])
+        return found
+
+    def _prepare_series(self, series: pd.Series) -> pd.Series:
+        if self.case_insensitive:
+            return series.map(normalize_text)
+        return series.astype(str)
+
+    def pattern_masks(self, series: pd.Series, prepared: bool = False) -> Dict[str, np.ndarray]:
+        """
+        Recorre la columna una sola vez y devuelve, para cada frase, la
+        máscara de las filas en las que aparece.
+        """
+        masks = {pattern: np.zeros(len(series), dtype=bool) for pattern in self.patterns}
+        if self.regex is None:
+            return masks
+        if not prepared:
+            series = self._prepare_series(series)
+        texts = series.tolist()
+        if self.mode != "regex" and len(self.patterns) <= 4:
+            # Con pocas frases (p. ej. al añadir una en una sesión) es más rápido
+            # buscar cada una con str.find, que recorre el texto en C
+            for pattern in self.patterns:
+                if self.mode == "word":
+                    masks[pattern][:] = [_contains_word(text, pattern) for text in texts]
+                else:
+                    masks[pattern][:] = [pattern in text for text in texts]
+            return masks
+        for i, text in enumerate(texts):
+            for pattern in self._findall_prepared(text):
+                masks[pattern][i] = True
+        return masks
+
+    def contains(self, series: pd.Series, prepared: bool = False) -> pd.Series:
+        """
+        Versión vectorizada de `search` sobre una columna.
+        Con prepared=True se asume que la columna ya viene normalizada
+        (por ejemplo, de normalized_column) y no se vuelve a preparar.
+        """
+        if self.regex is None:
+            return pd.Series(False, index=series.index)
+        if not prepared:
+            series = self._prepare_series(series)
+        if self._automaton is not None:
+            hits = self._automaton_hits
+            return pd.Series(
+                [next(hits(text), None) is not None for text in series],
+                index=series.index,
+                dtype=bool,
+            )
+        return series.str.contains(self.regex, regex=True, na=False).astype(bool)
+
+    def contains_all(self, series: pd.Series, prepared: bool = False) -> pd.Series:
+        """
+        True para las filas en las que aparecen *todas* las frases.
+        """
+        if self.regex is None:
+            return pd.Series(True, index=series.index)
+        total = len(self.patterns)
+        if prepared:
+            return series.map(lambda text: len(self._findall_prepared(text)) == total)
+        return series.astype(str).map(lambda text: len(self.findall(text)) == total)
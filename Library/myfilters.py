@@ -1,13 +1,63 @@
+import re
+
 import pandas as pd
-from typing import List, Dict, Any, Optional
+from typing import Callable, List, Dict, Any, Optional, Union
+
+from Library.filterplan import CompiledFilters, compile_filters
+from Library.matcher import MATCH_MODES, PatternMatcher, _contains_word
+from Library.normalize import normalize_patterns, normalize_regex, normalized_column
+from Library.parallel import parallel_apply
+
+# Motores disponibles para los filtros de texto:
+#   "automaton": un único autómata por lista de frases sobre el texto
+#                normalizado (ver Library/normalize.py), por defecto
+#   "apply":     el recorrido original con un lambda por fila
+DEFAULT_ENGINE = "automaton"
+
+
+def _text_column(df: pd.DataFrame, column: str, case_insensitive: bool) -> pd.Series:
+    # Con case_insensitive se lee la columna normalizada compartida (caché por DataFrame)
+    if case_insensitive:
+        return normalized_column(df, column)
+    return df[column].astype(str)
+
+
+def _phrase_test(mode: str) -> Callable[[str, str], bool]:
+    """
+    Comprobación por frase del motor "apply" según el modo de búsqueda
+    (ver MATCH_MODES): substring, palabra completa o expresión regular.
+    """
+    if mode not in MATCH_MODES:
+        raise ValueError(f"Modo de búsqueda no válido: {mode!r} (usa {MATCH_MODES})")
+    if mode == "word":
+        return lambda text, phrase: _contains_word(text, phrase)
+    if mode == "regex":
+        return lambda text, phrase: re.search(phrase, text, re.IGNORECASE) is not None
+    return lambda text, phrase: phrase in text
+
+
+def _apply_phrases(phrases: List[str], mode: str, case_insensitive: bool) -> List[str]:
+    """
+    Frases para el motor "apply", normalizadas igual que en PatternMatcher,
+    para que los tres motores devuelvan las mismas filas.
+    """
+    if not case_insensitive:
+        return list(phrases)
+    # Las expresiones regulares solo pierden los acentos ("\S" no es "\s")
+    if mode == "regex":
+        return [normalize_regex(p) for p in phrases]
+    return normalize_patterns(phrases)
 
 
 def filter_by_date_posted(df: pd.DataFrame, days_back: Optional[int] = None) -> pd.DataFrame:
     if days_back is None or "date_posted" not in df.columns:
         return df
 
-    df = df.copy()
-    df["date_posted"] = pd.to_datetime(df["date_posted"], errors="coerce")
+    # scrape_jobs ya entrega date_posted como datetime64 (JOB_SCHEMA); solo
+    # se convierte si viene de otra fuente
+    if not pd.api.types.is_datetime64_any_dtype(df["date_posted"]):
+        df = df.copy()
+        df["date_posted"] = pd.to_datetime(df["date_posted"], errors="coerce")
     cutoff = pd.Timestamp.now() - pd.Timedelta(days=days_back)
     return df[df["date_posted"] >= cutoff]
 
@@ -17,21 +67,28 @@ def filter_by_keywords(
     column: str,
     keywords: Optional[List[str]] = None,
     case_insensitive: bool = True,
-    all_must_match: bool = False
+    all_must_match: bool = False,
+    engine: str = DEFAULT_ENGINE,
+    mode: str = "substring",
 ) -> pd.DataFrame:
     if not keywords or column not in df.columns:
         return df
 
-    df = df.copy()
-    col_series = df[column].astype(str)
-    if case_insensitive:
-        col_series = col_series.str.lower()
-        keywords = [kw.lower() for kw in keywords]
+    if engine == "automaton":
+        matcher = PatternMatcher(keywords, case_insensitive=case_insensitive, mode=mode)
+        text = _text_column(df, column, case_insensitive)
+        if all_must_match:
+            return df[matcher.contains_all(text, prepared=True)]
+        return df[matcher.contains(text, prepared=True)]
+
+    col_series = _text_column(df, column, case_insensitive)
+    keywords = _apply_phrases(keywords, mode, case_insensitive)
 
+    test = _phrase_test(mode)
     if all_must_match:
-        mask = col_series.apply(lambda text: all(kw in text for kw in keywords))
+        mask = col_series.apply(lambda text: all(test(text, kw) for kw in keywords))
     else:
-        mask = col_series.apply(lambda text: any(kw in text for kw in keywords))
+        mask = col_series.apply(lambda text: any(test(text, kw) for kw in keywords))
 
     return df[mask]
 
@@ -41,17 +98,22 @@ def filter_out_negative_phrases(
     column: str,
     negatives: Optional[List[str]] = None,
     case_insensitive: bool = True,
+    engine: str = DEFAULT_ENGINE,
+    mode: str = "substring",
 ) -> pd.DataFrame:
     if not negatives or column not in df.columns:
         return df
 
-    df = df.copy()
-    col_series = df[column].astype(str)
-    if case_insensitive:
-        col_series = col_series.str.lower()
-        negatives = [neg.lower() for neg in negatives]
+    if engine == "automaton":
+        matcher = PatternMatcher(negatives, case_insensitive=case_insensitive, mode=mode)
+        text = _text_column(df, column, case_insensitive)
+        return df[~matcher.contains(text, prepared=True)]
+
+    col_series = _text_column(df, column, case_insensitive)
+    negatives = _apply_phrases(negatives, mode, case_insensitive)
 
-    mask_negative = col_series.apply(lambda text: any(neg in text for neg in negatives))
+    test = _phrase_test(mode)
+    mask_negative = col_series.apply(lambda text: any(test(text, neg) for neg in negatives))
     return df[~mask_negative]
 
 
@@ -61,18 +123,26 @@ def filter_by_in_list(
     values: Optional[List[str]] = None,
     partial_match: bool = False,
     case_insensitive: bool = True,
+    engine: str = DEFAULT_ENGINE,
+    mode: str = "substring",
 ) -> pd.DataFrame:
     if not values or column not in df.columns:
         return df
 
-    df = df.copy()
-    col_series = df[column].astype(str)
-    if case_insensitive:
-        col_series = col_series.str.lower()
-        values = [v.lower() for v in values]
+    if partial_match and engine == "automaton":
+        matcher = PatternMatcher(values, case_insensitive=case_insensitive, mode=mode)
+        text = _text_column(df, column, case_insensitive)
+        return df[matcher.contains(text, prepared=True)]
+
+    col_series = _text_column(df, column, case_insensitive)
+    if partial_match:
+        values = _apply_phrases(values, mode, case_insensitive)
+    elif case_insensitive:
+        values = normalize_patterns(values)
 
     if partial_match:
-        mask = col_series.apply(lambda text: any(v in text for v in values))
+        test = _phrase_test(mode)
+        mask = col_series.apply(lambda text: any(test(text, v) for v in values))
     else:
         mask = col_series.isin(values)
 
@@ -90,11 +160,34 @@ def truncate_column(df: pd.DataFrame, column: str, max_length: int = 77) -> pd.D
     return df
 
 
-def apply_filters(df: pd.DataFrame, filter_params: Dict[str, Any]) -> pd.DataFrame:
+def apply_filters(
+    df: pd.DataFrame,
+    filter_params: Union[Dict[str, Any], CompiledFilters],
+    engine: str = "compiled",
+    workers: Optional[int] = None,
+) -> pd.DataFrame:
     """
-    Aplica secuencialmente los filtros que se hayan definido en filter_params.
+    Aplica los filtros que se hayan definido en filter_params.
+    `engine` elige cómo se evalúan:
+      - "compiled":  una sola máscara combinada y un único recorte (por defecto).
+                     También acepta un CompiledFilters ya compilado con compile_filters.
+      - "automaton": filtros encadenados, con autómata para los de texto.
+      - "apply":     filtros encadenados con el lambda original por fila.
+      - "parallel":  como "compiled", pero las reglas de texto se reparten por
+                     trozos entre `workers` procesos (por defecto, uno por núcleo).
     """
+    if engine == "parallel":
+        if not isinstance(filter_params, CompiledFilters):
+            filter_params = compile_filters(filter_params)
+        return parallel_apply(filter_params, df, workers=workers)
+    if isinstance(filter_params, CompiledFilters):
+        return filter_params.apply(df)
+    if engine == "compiled":
+        return compile_filters(filter_params).apply(df)
+
     df_filtered = df.copy()
+    # Modo de búsqueda por lista (substring, word o regex), igual que el plan compilado
+    match_mode = filter_params.get("match_mode") or {}
 
     # Ejemplo de cómo usar los parámetros (ajusta según tus necesidades):
     df_filtered = filter_by_date_posted(df_filtered, filter_params.get("days_back"))
@@ -105,6 +198,8 @@ def apply_filters(df: pd.DataFrame, filter_params: Dict[str, Any]) -> pd.DataFra
         keywords=filter_params.get("keywords_in_description"),
         case_insensitive=True,
         all_must_match=False,
+        engine=engine,
+        mode=match_mode.get("keywords_in_description", "substring"),
     )
 
     df_filtered = filter_out_negative_phrases(
@@ -112,6 +207,8 @@ def apply_filters(df: pd.DataFrame, filter_params: Dict[str, Any]) -> pd.DataFra
         column="description",
         negatives=filter_params.get("negatives_in_description"),
         case_insensitive=True,
+        engine=engine,
+        mode=match_mode.get("negatives_in_description", "substring"),
     )
 
     df_filtered = filter_by_in_list(
@@ -120,6 +217,8 @@ def apply_filters(df: pd.DataFrame, filter_params: Dict[str, Any]) -> pd.DataFra
         values=filter_params.get("title_keywords"),
         partial_match=True,
         case_insensitive=True,
+        engine=engine,
+        mode=match_mode.get("title_keywords", "substring"),
     )
 
     df_filtered = filter_out_negative_phrases(
@@ -127,6 +226,8 @@ def apply_filters(df: pd.DataFrame, filter_params: Dict[str, Any]) -> pd.DataFra
         column="title",
         negatives=filter_params.get("negatives_in_title"),
         case_insensitive=True,
+        engine=engine,
+        mode=match_mode.get("negatives_in_title", "substring"),
     )
 
     df_filtered = filter_by_in_list(
@@ -135,6 +236,7 @@ def apply_filters(df: pd.DataFrame, filter_params: Dict[str, Any]) -> pd.DataFra
         values=filter_params.get("country_list"),
         partial_match=False,
         case_insensitive=True,
+        engine=engine,
     )
 
     return df_filtered
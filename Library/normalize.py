@@ -0,0 +1,124 @@
+import re
+import threading
+import unicodedata
+import weakref
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+_COMBINING_MARKS = re.compile(r"[\u0300-\u036f]")
+
+
+def normalize_text(text) -> str:
+    """
+    Pasa un texto a su forma normalizada para los filtros:
+    casefold, sin acentos ("Híbrido" -> "hibrido") y con los espacios
+    (incluidos saltos de línea) colapsados en uno solo.
+    Los valores que no son texto (None, NaN) se normalizan a "".
+    """
+    if not isinstance(text, str):
+        return ""
+    text = text.casefold()
+    if not text.isascii():
+        text = _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", text))
+    return " ".join(text.split())
+
+
+def normalize_regex(pattern: str) -> str:
+    """
+    Normaliza una expresión regular para buscarla en textos normalizados:
+    solo quita los acentos ("híbrido" -> "hibrido"). No se pasa a minúsculas
+    (cambiaría "\\S" por "\\s"); las mayúsculas se ignoran con re.IGNORECASE.
+    Los metacaracteres son ASCII y no cambian.
+    """
+    if pattern.isascii():
+        return pattern
+    return _COMBINING_MARKS.sub("", unicodedata.normalize("NFKD", pattern))
+
+
+def normalize_patterns(patterns: Iterable[str]) -> List[str]:
+    """
+    Normaliza una lista de frases igual que los textos y elimina las que
+    quedan repetidas ("travel"/"TRAVEL", "híbrido"/"hibrido").
+    """
+    unique: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        key = normalize_text(pattern)
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(key)
+    return unique
+
+
+class NormalizedTextCache:
+    """
+    Guarda, por DataFrame y columna, la versión normalizada de cada fila.
+
+    Las filas se normalizan bajo demanda: si el plan de filtros ya descartó
+    una fila con una regla barata, su descripción nunca se normaliza. La
+    entrada se libera sola cuando el DataFrame deja de existir.
+
+    La clave es id(df): si se cambian en su sitio las celdas de un DataFrame
+    ya filtrado, la caché seguiría devolviendo el texto anterior. Quien lo
+    modifique debe llamar antes a invalidate(df) (o filtrar una copia).
+    """
+
+    def __init__(self):
+        self._entries: Dict[int, Dict[str, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, df: pd.DataFrame, column: str, positions: Optional[np.ndarray] = None
+    ) -> pd.Series:
+        key = id(df)
+        with self._lock:
+            columns = self._entries.get(key)
+            if columns is None:
+                columns = self._entries[key] = {}
+                weakref.finalize(df, self._entries.pop, key, None)
+            values = columns.get(column)
+            if values is None or len(values) != len(df):
+                values = columns[column] = np.full(len(df), None, dtype=object)
+
+        if positions is None:
+            positions = np.arange(len(df))
+        missing = positions[pd.isna(values[positions])]
+        if missing.size:
+            raw = df[column].to_numpy(dtype=object)
+            values[missing] = [normalize_text(raw[i]) for i in missing]
+
+        return pd.Series(values[positions], index=df.index[positions], dtype=object)
+
+    def invalidate(self, df: pd.DataFrame, column: Optional[str] = None):
+        """
+        Olvida lo normalizado de df (o solo de una columna).
+        """
+        with self._lock:
+            columns = self._entries.get(id(df))
+            if columns is None:
+                return
+            if column is None:
+                columns.clear()
+            else:
+                columns.pop(column, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+text_cache = NormalizedTextCache()
+
+
+def normalized_column(
+    df: pd.DataFrame, column: str, positions: Optional[np.ndarray] = None
+) -> pd.Series:
+    """
+    Devuelve la columna normalizada (solo las filas `positions` si se indican),
+    calculándola una sola vez por DataFrame. Los valores que no son texto
+    (None, NaN) quedan como "", no como "nan": ninguna frase los encuentra.
+    Ver NormalizedTextCache para los DataFrames que se modifican.
+    """
+    return text_cache.get(df, column, positions)
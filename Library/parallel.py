@@ -0,0 +1,190 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Library.filterplan import CompiledFilters, FilterRule, PatternRule
+from Library.normalize import normalize_text
+
+# Estado de cada proceso del pool, fijado una sola vez en _init_worker
+_worker_rules: List[PatternRule] = []
+_worker_profile = False
+_worker_columns: Dict[str, Tuple[shared_memory.SharedMemory, shared_memory.SharedMemory]] = {}
+
+
+class SharedTextColumn:
+    """
+    Columna de texto copiada una sola vez a memoria compartida: todos los
+    textos codificados en UTF-8 uno detrás de otro, más un array de offsets.
+    Los procesos del pool leen su trozo sin que se serialice nada por chunk.
+    """
+
+    def __init__(self, texts: List[str]):
+        encoded = [text.encode("utf-8") if isinstance(text, str) else b"" for text in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+
+        self.data = shared_memory.SharedMemory(create=True, size=max(int(offsets[-1]), 1))
+        self.data.buf[: offsets[-1]] = b"".join(encoded)
+        self.offsets = shared_memory.SharedMemory(create=True, size=offsets.nbytes)
+        np.ndarray(offsets.shape, dtype=np.int64, buffer=self.offsets.buf)[:] = offsets
+
+    @property
+    def names(self) -> Tuple[str, str]:
+        return self.data.name, self.offsets.name
+
+    def close(self):
+        for shm in (self.data, self.offsets):
+            shm.close()
+            shm.unlink()
+
+
+def _init_worker(
+    rules: List[PatternRule], columns: Dict[str, Tuple[str, str]], profile: bool = False
+):
+    global _worker_rules, _worker_columns, _worker_profile
+    _worker_rules = rules
+    _worker_profile = profile
+    _worker_columns = {
+        column: (
+            shared_memory.SharedMemory(name=data_name),
+            shared_memory.SharedMemory(name=offsets_name),
+        )
+        for column, (data_name, offsets_name) in columns.items()
+    }
+
+
+def _read_chunk(column: str, start: int, stop: int, total: int) -> List[str]:
+    data, offsets_shm = _worker_columns[column]
+    offsets = np.ndarray((total + 1,), dtype=np.int64, buffer=offsets_shm.buf)
+    raw = bytes(data.buf[offsets[start] : offsets[stop]])
+    base = offsets[start]
+    return [
+        raw[offsets[i] - base : offsets[i + 1] - base].decode("utf-8")
+        for i in range(start, stop)
+    ]
+
+
+def _evaluate_chunk(start: int, stop: int, total: int):
+    """
+    Evalúa las reglas de texto sobre las filas [start, stop) y devuelve la
+    máscara del trozo y las estadísticas por regla.
+    """
+    alive = np.ones(stop - start, dtype=bool)
+    texts: Dict[str, pd.Series] = {}
+    stats = []
+    for index, rule in enumerate(_worker_rules):
+        positions = np.flatnonzero(alive)
+        if positions.size == 0:
+            break
+        begin = time.perf_counter()
+        if rule.column not in texts:
+            chunk = _read_chunk(rule.column, start, stop, total)
+            if rule.normalized:
+                chunk = [normalize_text(text) for text in chunk]
+            texts[rule.column] = pd.Series(chunk, dtype=object)
+        hits = None
+        if _worker_profile:
+            keep, hits = rule.evaluate_with_hits(texts[rule.column].iloc[positions])
+        else:
+            keep = rule.evaluate(texts[rule.column].iloc[positions])
+        alive[positions] = keep
+        stats.append(
+            (index, positions.size, int(keep.sum()), time.perf_counter() - begin, hits)
+        )
+    return start, alive, stats
+
+
+def parallel_mask(
+    compiled: CompiledFilters,
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Versión multiproceso de CompiledFilters.mask para corpus grandes.
+
+    Las reglas baratas (fechas, listas exactas) se evalúan aquí mismo; las
+    filas que sobreviven se copian a memoria compartida y las reglas de
+    texto se reparten por trozos en un ProcessPoolExecutor. Cada proceso
+    normaliza y filtra su trozo, y las máscaras se unen al final.
+    """
+    workers = workers or os.cpu_count() or 1
+    alive = np.ones(len(df), dtype=bool)
+
+    text_rules: List[FilterRule] = []
+    for rule in compiled.plan():
+        if rule.column not in df.columns:
+            continue
+        if isinstance(rule, PatternRule):
+            text_rules.append(rule)
+            continue
+        positions = np.flatnonzero(alive)
+        if positions.size == 0:
+            return alive
+        column = df[rule.column].iloc[positions]
+        if rule.normalized:
+            column = column.map(normalize_text)
+        begin = time.perf_counter()
+        keep = rule.evaluate(column)
+        seconds = time.perf_counter() - begin
+        compiled.stats.record(rule, positions.size, int(keep.sum()), seconds)
+        if compiled.profile is not None:
+            compiled.profile.record(rule, positions.size, int(keep.sum()), seconds)
+        alive[positions] = keep
+
+    positions = np.flatnonzero(alive)
+    if not text_rules or positions.size == 0:
+        return alive
+
+    total = positions.size
+    chunk_size = chunk_size or max(1, -(-total // (workers * 4)))
+    shared = {
+        column: SharedTextColumn(df[column].iloc[positions].tolist())
+        for column in dict.fromkeys(rule.column for rule in text_rules)
+    }
+    try:
+        keep = np.ones(total, dtype=bool)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                text_rules,
+                {c: s.names for c, s in shared.items()},
+                compiled.profile is not None,
+            ),
+        ) as executor:
+            futures = [
+                executor.submit(_evaluate_chunk, start, min(start + chunk_size, total), total)
+                for start in range(0, total, chunk_size)
+            ]
+            for future in futures:
+                start, chunk_mask, stats = future.result()
+                keep[start : start + len(chunk_mask)] = chunk_mask
+                for index, rows_in, rows_out, seconds, hits in stats:
+                    rule = text_rules[index]
+                    # Con perfil el tiempo incluye buscar cada frase: no es el coste normal
+                    compiled.stats.record(
+                        rule, rows_in, rows_out, None if hits is not None else seconds
+                    )
+                    if compiled.profile is not None:
+                        compiled.profile.record(rule, rows_in, rows_out, seconds, hits)
+    finally:
+        for column in shared.values():
+            column.close()
+
+    alive[positions] = keep
+    return alive
+
+
+def parallel_apply(
+    compiled: CompiledFilters,
+    df: pd.DataFrame,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> pd.DataFrame:
+    return df[parallel_mask(compiled, df, workers=workers, chunk_size=chunk_size)]
@@ -0,0 +1,224 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Library.filterplan import (
+    FilterProfile,
+    FilterRule,
+    FilterStats,
+    PatternRule,
+    compile_filters,
+)
+from Library.matcher import PatternMatcher, _contains_word
+from Library.normalize import normalized_column
+
+# Columna con los perfiles (separados por comas) que cumple cada fila
+PROFILE_COLUMN = "profiles"
+
+
+class ProfileFilters:
+    """
+    Varios perfiles de filtrado con nombre (uno por equipo o familia de
+    puestos) evaluados en una sola pasada.
+
+    Las reglas idénticas entre perfiles se evalúan una sola vez, y todas las
+    listas de frases de una misma columna (y modo de búsqueda) se unen en un
+    único PatternMatcher: el texto se recorre una vez y de las máscaras por
+    frase se deduce el resultado de cada perfil. Así el coste se parece al de
+    un solo perfil aunque haya varios.
+
+    Tiene la misma interfaz que CompiledFilters (`mask`, `apply`,
+    `save_stats`, `profile`), así que también se puede pasar a JobScraper:
+    `apply` conserva las filas que cumplen algún perfil y añade la columna
+    PROFILE_COLUMN.
+
+    Las estadísticas y el FilterProfile se registran por regla, con el nombre
+    "perfil:regla". Las reglas de frases de un mismo recorrido comparten su
+    tiempo: en el perfil se reparte entre ellas según su número de frases, y
+    en las estadísticas solo se guarda su selectividad.
+    """
+
+    def __init__(
+        self,
+        profiles: Dict[str, List[FilterRule]],
+        stats: Optional[FilterStats] = None,
+        profile: Optional[FilterProfile] = None,
+    ):
+        self.profiles = profiles
+        self.stats = stats or FilterStats()
+        self.profile = profile
+
+    def __len__(self) -> int:
+        return len(self.profiles)
+
+    def masks(self, df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """
+        Devuelve, por perfil, la máscara de las filas que lo cumplen.
+        """
+        rules: Dict[str, FilterRule] = {}
+        profile_keys: Dict[str, List[str]] = {}
+        for name, profile_rules in self.profiles.items():
+            keys = []
+            for rule in profile_rules:
+                if rule.column not in df.columns:
+                    continue
+                rules.setdefault(rule.cache_key, rule)
+                keys.append(rule.cache_key)
+            profile_keys[name] = keys
+
+        # 1) Reglas baratas (fechas, listas exactas), una vez cada una
+        rule_masks: Dict[str, np.ndarray] = {}
+        shared: Dict[Tuple, List[PatternRule]] = {}
+        for key, rule in rules.items():
+            if isinstance(rule, PatternRule) and rule.matcher:
+                # Los modos "substring" y "word" comparten recorrido: una
+                # coincidencia como palabra es también una como subcadena
+                mode = "regex" if rule.matcher.mode == "regex" else "substring"
+                group = (rule.column, mode, rule.matcher.case_insensitive)
+                shared.setdefault(group, []).append(rule)
+                continue
+            start = time.perf_counter()
+            column = normalized_column(df, rule.column) if rule.normalized else df[rule.column]
+            rule_masks[key] = rule.evaluate(column)
+            self._record(rule, len(df), rule_masks[key], time.perf_counter() - start)
+
+        alive = {}
+        for name, keys in profile_keys.items():
+            alive[name] = np.ones(len(df), dtype=bool)
+            for key in keys:
+                if key in rule_masks:
+                    alive[name] &= rule_masks[key]
+
+        # 2) Un único recorrido por columna, solo sobre las filas que siguen
+        #    vivas en algún perfil
+        any_alive = np.zeros(len(df), dtype=bool)
+        for mask in alive.values():
+            any_alive |= mask
+        positions = np.flatnonzero(any_alive)
+        for (column, mode, case_insensitive), group_rules in shared.items():
+            start = time.perf_counter()
+            patterns = [p for rule in group_rules for p in rule.matcher.patterns]
+            matcher = PatternMatcher(patterns, case_insensitive=case_insensitive, mode=mode)
+            if case_insensitive:
+                text = normalized_column(df, column, positions)
+            else:
+                text = df[column].iloc[positions].astype(str)
+            pattern_masks = matcher.pattern_masks(text, prepared=True)
+            word_masks = self._word_masks(group_rules, pattern_masks, text.tolist())
+            seconds = time.perf_counter() - start
+            for rule in group_rules:
+                masks = word_masks if rule.matcher.mode == "word" else pattern_masks
+                keep = rule.combine(masks)
+                mask = np.zeros(len(df), dtype=bool)
+                mask[positions] = keep
+                rule_masks[rule.cache_key] = mask
+                share = len(rule.matcher.patterns) / max(len(patterns), 1)
+                self._record(
+                    rule, positions.size, keep, seconds * share, rule.pattern_hits(masks)
+                )
+
+        return {
+            name: np.logical_and.reduce([alive[name]] + [rule_masks[k] for k in keys])
+            for name, keys in profile_keys.items()
+        }
+
+    def _record(self, rule, rows_in, keep, seconds, hits=None):
+        """
+        Selectividad de la regla en las estadísticas (y su tiempo, salvo en las
+        de un recorrido compartido) y, con perfil, en el FilterProfile.
+        """
+        rows_out = int(keep.sum())
+        self.stats.record(rule, rows_in, rows_out, None if hits is not None else seconds)
+        if self.profile is not None:
+            self.profile.record(rule, rows_in, rows_out, seconds, hits)
+
+    @staticmethod
+    def _word_masks(
+        rules: List[PatternRule], substring_masks: Dict[str, np.ndarray], texts: List[str]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Máscaras en modo "word" de las frases de reglas en ese modo: solo se
+        comprueban los límites de palabra en las filas donde la frase ya
+        apareció como subcadena.
+        """
+        word_masks: Dict[str, np.ndarray] = {}
+        for rule in rules:
+            if rule.matcher.mode != "word":
+                continue
+            for pattern in rule.matcher.patterns:
+                if pattern in word_masks:
+                    continue
+                mask = substring_masks[pattern].copy()
+                for i in np.flatnonzero(mask):
+                    mask[i] = _contains_word(texts[i], pattern)
+                word_masks[pattern] = mask
+        return word_masks
+
+    def mask(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Filas que cumplen al menos un perfil.
+        """
+        keep = np.zeros(len(df), dtype=bool)
+        for mask in self.masks(df).values():
+            keep |= mask
+        return keep
+
+    def tag(self, df: pd.DataFrame, column: str = PROFILE_COLUMN) -> pd.DataFrame:
+        """
+        Devuelve las filas que cumplen algún perfil con la columna `column`
+        ("backend,data", por ejemplo) indicando cuáles.
+        """
+        masks = self.masks(df)
+        names = np.array(list(masks), dtype=object)
+        matrix = np.zeros((len(df), len(masks)), dtype=bool)
+        for i, mask in enumerate(masks.values()):
+            matrix[:, i] = mask
+        keep = matrix.any(axis=1)
+        tagged = df[keep].copy()
+        tagged[column] = [",".join(names[row]) for row in matrix[keep]]
+        return tagged
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.tag(df)
+
+    def split(self, df: pd.DataFrame, column: str = PROFILE_COLUMN) -> Dict[str, pd.DataFrame]:
+        """
+        Un DataFrame por perfil. Si `df` ya viene etiquetado (tiene la
+        columna `column`), se reparte sin volver a evaluar los filtros.
+        """
+        if column in df.columns:
+            tags = df[column].fillna("").map(lambda value: set(value.split(",")))
+            return {
+                name: df[tags.map(lambda found: name in found).to_numpy(dtype=bool)]
+                for name in self.profiles
+            }
+        return {name: df[mask] for name, mask in self.masks(df).items()}
+
+    def save_stats(self):
+        self.stats.save()
+
+
+def compile_profiles(
+    profiles: Dict[str, Dict[str, Any]],
+    stats_path: Optional[str] = None,
+    profile: bool = False,
+) -> ProfileFilters:
+    """
+    Compila un diccionario {nombre: filter_parameters} (ver filter_profiles
+    en filter_params.py) en un ProfileFilters. `stats_path` y `profile`
+    funcionan como en compile_filters.
+    """
+    compiled = {}
+    for name, params in profiles.items():
+        rules = list(compile_filters(params))
+        for rule in rules:
+            # Las reglas de perfiles distintos se llaman igual ("+description")
+            rule.name = f"{name}:{rule.name}"
+        compiled[name] = rules
+    return ProfileFilters(
+        compiled,
+        stats=FilterStats(stats_path),
+        profile=FilterProfile() if profile else None,
+    )
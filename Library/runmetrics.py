@@ -0,0 +1,159 @@
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+
+class RunMetrics:
+    """
+    Métricas de una ejecución de JobScraper, una entrada por (país, sitio):
+    duración, peticiones HTTP, histograma de códigos de estado, bytes
+    descargados, errores de conexión, páginas de resultados, ofertas
+    parseadas y ofertas que pasan los filtros, más el estado final de la
+    tarea (done, failed, skipped, interrupted o stopped).
+
+    Se exporta como JSON (to_json) y como fichero de texto para el textfile
+    collector de node_exporter (to_prometheus), para seguir en el tiempo las
+    peticiones por oferta de cada sitio.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.time()
+        self.tasks: List[Dict[str, Any]] = []
+
+    def record(
+        self,
+        country: str,
+        site: str,
+        state: str,
+        seconds: float,
+        requests: Dict[str, Any],
+        parsed: int = 0,
+        kept: int = 0,
+    ):
+        entry = {
+            "country": country,
+            "site": site,
+            "state": state,
+            "seconds": round(seconds, 3),
+            **requests,
+            "jobs_parsed": parsed,
+            "jobs_kept": kept,
+        }
+        with self.lock:
+            self.tasks.append(entry)
+
+    def by_site(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Totales por sitio, con peticiones por oferta parseada.
+        """
+        totals: Dict[str, Dict[str, Any]] = {}
+        with self.lock:
+            tasks = list(self.tasks)
+        for task in tasks:
+            site = totals.setdefault(
+                task["site"],
+                {
+                    "tasks": 0,
+                    "seconds": 0.0,
+                    "requests": 0,
+                    "bytes": 0,
+                    "errors": 0,
+                    "pages": 0,
+                    "jobs_parsed": 0,
+                    "jobs_kept": 0,
+                },
+            )
+            site["tasks"] += 1
+            for key in ("seconds", "requests", "bytes", "errors", "pages", "jobs_parsed", "jobs_kept"):
+                site[key] += task[key]
+        for site in totals.values():
+            site["seconds"] = round(site["seconds"], 3)
+            site["requests_per_job"] = (
+                round(site["requests"] / site["jobs_parsed"], 3)
+                if site["jobs_parsed"]
+                else None
+            )
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            tasks = list(self.tasks)
+        return {
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.started)),
+            "seconds": round(time.time() - self.started, 3),
+            "sites": self.by_site(),
+            "tasks": tasks,
+        }
+
+    @staticmethod
+    def _write(path: str, text: str):
+        # Se escribe aparte y se renombra: el collector nunca lee un fichero a medias
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def to_json(self, path: Optional[str] = None) -> str:
+        text = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        if path:
+            self._write(path, text)
+        return text
+
+    @staticmethod
+    def _labels(**labels) -> str:
+        def escape(value) -> str:
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        return "{" + ",".join(f'{k}="{escape(v)}"' for k, v in labels.items()) + "}"
+
+    def to_prometheus(self, path: Optional[str] = None) -> str:
+        """
+        Formato de exposición de Prometheus: una serie por tarea y métrica,
+        más peticiones por oferta por sitio. Son valores de la última
+        ejecución (el fichero se reescribe entero), así que todo son gauges.
+        """
+        with self.lock:
+            tasks = list(self.tasks)
+        series = [
+            ("task_duration_seconds", "gauge", "Duración de la tarea", "seconds"),
+            ("task_requests", "gauge", "Peticiones HTTP de la tarea", "requests"),
+            ("task_bytes", "gauge", "Bytes descargados por la tarea", "bytes"),
+            ("task_errors", "gauge", "Errores de conexión de la tarea", "errors"),
+            ("task_pages", "gauge", "Páginas de resultados pedidas", "pages"),
+            ("task_jobs_parsed", "gauge", "Ofertas parseadas", "jobs_parsed"),
+            ("task_jobs_kept", "gauge", "Ofertas que pasan los filtros", "jobs_kept"),
+        ]
+        lines = []
+        for name, kind, help_text, key in series:
+            lines.append(f"# HELP jobscraper_{name} {help_text}")
+            lines.append(f"# TYPE jobscraper_{name} {kind}")
+            for task in tasks:
+                labels = self._labels(country=task["country"], site=task["site"], state=task["state"])
+                lines.append(f"jobscraper_{name}{labels} {task[key]}")
+
+        lines.append("# HELP jobscraper_task_responses Respuestas por código de estado")
+        lines.append("# TYPE jobscraper_task_responses gauge")
+        for task in tasks:
+            for code, count in task["status_codes"].items():
+                labels = self._labels(country=task["country"], site=task["site"], code=code)
+                lines.append(f"jobscraper_task_responses{labels} {count}")
+
+        lines.append("# HELP jobscraper_site_requests_per_job Peticiones por oferta parseada")
+        lines.append("# TYPE jobscraper_site_requests_per_job gauge")
+        for site, totals in self.by_site().items():
+            if totals["requests_per_job"] is not None:
+                lines.append(
+                    f"jobscraper_site_requests_per_job{self._labels(site=site)} "
+                    f"{totals['requests_per_job']}"
+                )
+
+        lines.append("# HELP jobscraper_run_timestamp_seconds Inicio de la ejecución")
+        lines.append("# TYPE jobscraper_run_timestamp_seconds gauge")
+        lines.append(f"jobscraper_run_timestamp_seconds {self.started:.0f}")
+        text = "\n".join(lines) + "\n"
+        if path:
+            self._write(path, text)
+        return text
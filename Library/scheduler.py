@@ -0,0 +1,125 @@
+from typing import Dict, List, Optional, Tuple
+
+# Rendimiento (coincidencias por oferta pedida) por debajo del cual una tarea
+# con historial se considera de bajo rendimiento y, si hay sondeo, se sondea
+LOW_YIELD = 0.01
+
+
+class ScheduledTask:
+    """
+    Un (país, sitio) del plan con cuántas ofertas pedir. Si `expand_to` no es
+    None es una sonda: se piden `results_wanted` y, solo si alguna pasa los
+    filtros, se amplía hasta `expand_to` (continuando desde la sonda).
+    """
+
+    def __init__(
+        self,
+        country: str,
+        site: str,
+        results_wanted: int,
+        expected: Optional[float] = None,
+        expand_to: Optional[int] = None,
+    ):
+        self.country = country
+        self.site = site
+        self.results_wanted = results_wanted
+        # Coincidencias esperadas por oferta pedida (None sin historial)
+        self.expected = expected
+        self.expand_to = expand_to
+
+    @property
+    def task(self) -> Tuple[str, str]:
+        return self.country, self.site
+
+    @property
+    def is_probe(self) -> bool:
+        return self.expand_to is not None
+
+    def __repr__(self) -> str:
+        probe = f", sonda hasta {self.expand_to}" if self.is_probe else ""
+        return f"ScheduledTask({self.site}/{self.country}: {self.results_wanted}{probe})"
+
+
+def _expected_yield(stats) -> float:
+    fill, matched, _ = stats
+    # Sin coincidencias registradas (ejecuciones sin filtros) se usa lo recibido
+    return fill if matched is None else matched
+
+
+def schedule_tasks(
+    tasks: List[Tuple[str, str]],
+    yields: Dict[Tuple[str, str], Tuple[float, Optional[float], int]],
+    results_wanted: int,
+    budget: Optional[int] = None,
+    probe_results: Optional[int] = None,
+) -> List[ScheduledTask]:
+    """
+    Ordena las tareas por coincidencias esperadas (JobStore.get_yields), de
+    mayor a menor; las que no tienen historial reciben la media de las
+    demás, para que se aprendan pronto.
+      - Sin `budget`, cada tarea pide `results_wanted`.
+      - Con `budget` (total de ofertas de toda la ejecución), se reparte en
+        proporción a las coincidencias esperadas, con un mínimo por tarea.
+      - Con `probe_results`, las tareas de bajo rendimiento piden solo
+        `probe_results` y se amplían a lo que les tocaría (como poco, el
+        reparto uniforme del presupuesto) si encuentran algo. Van al final.
+    """
+    if not tasks:
+        return []
+    known = [_expected_yield(yields[t]) for t in tasks if t in yields]
+    prior = sum(known) / len(known) if known else 1.0
+    expected = {
+        t: _expected_yield(yields[t]) if t in yields else prior for t in tasks
+    }
+    low = {
+        t
+        for t in tasks
+        if probe_results and t in yields and expected[t] < LOW_YIELD
+    }
+
+    floor = probe_results or 1
+    if budget is None:
+        shares = {t: results_wanted for t in tasks}
+        even = results_wanted
+    else:
+        even = max(floor, budget // len(tasks))
+        total = sum(expected.values())
+        shares = {
+            t: max(floor, round(budget * expected[t] / total)) if total else even
+            for t in tasks
+        }
+
+    scheduled = []
+    for t in tasks:
+        if t in low:
+            expand_to = max(shares[t], even)
+            if expand_to > probe_results:
+                scheduled.append(
+                    ScheduledTask(*t, probe_results, expected[t] if t in yields else None, expand_to)
+                )
+                continue
+        scheduled.append(
+            ScheduledTask(*t, shares[t], expected[t] if t in yields else None)
+        )
+
+    # sorted es estable: a igual rendimiento se respeta el orden del plan
+    return sorted(
+        scheduled,
+        key=lambda s: (s.is_probe, -expected[s.task]),
+    )
+
+
+def schedule_report(scheduled: List[ScheduledTask]) -> str:
+    """
+    Una línea con lo que ha decidido el planificador.
+    """
+    known = sum(1 for s in scheduled if s.expected is not None)
+    probes = sum(1 for s in scheduled if s.is_probe)
+    requested = sum(s.results_wanted for s in scheduled)
+    line = (
+        f"Orden por rendimiento: {known} de {len(scheduled)} tareas con historial, "
+        f"{requested} ofertas pedidas"
+    )
+    if probes:
+        line += f", {probes} sondas"
+    return line
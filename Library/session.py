@@ -0,0 +1,97 @@
+import importlib
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from Library.filterplan import FilterRule, PatternRule, compile_filters
+from Library.matcher import PatternMatcher
+from Library.normalize import normalized_column
+
+
+class FilterSession:
+    """
+    Sesión de filtrado incremental sobre un DataFrame ya descargado.
+
+    El DataFrame se queda en memoria y cada regla se evalúa sobre todas sus
+    filas una sola vez: la máscara resultante se guarda con la clave
+    `rule.cache_key` (un hash de la regla). Al recargar filter_params.py solo
+    se reevalúan las reglas que cambiaron, y dentro de las reglas de frases
+    solo las frases nuevas, porque también se guarda una máscara por frase.
+    """
+
+    def __init__(self, df: pd.DataFrame, params_module: str = "filter_params"):
+        self.df = df
+        self.params_module = params_module
+        self._rule_masks: Dict[str, np.ndarray] = {}
+        self._pattern_masks: Dict[Tuple, np.ndarray] = {}
+        # Reglas evaluadas (no servidas desde caché) en la última llamada a refilter
+        self.last_evaluated: List[str] = []
+        self.last_seconds = 0.0
+
+    def load_params(self) -> Dict[str, Any]:
+        """
+        Recarga el módulo de parámetros (filter_params.py por defecto) y
+        devuelve su diccionario filter_parameters.
+        """
+        module = importlib.import_module(self.params_module)
+        module = importlib.reload(module)
+        return module.filter_parameters
+
+    def refilter(self, filter_params: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Devuelve las filas del DataFrame de la sesión que pasan filter_params
+        (si no se indica, se recarga de disco).
+        """
+        if filter_params is None:
+            filter_params = self.load_params()
+
+        start = time.perf_counter()
+        self.last_evaluated = []
+        mask = np.ones(len(self.df), dtype=bool)
+        for rule in compile_filters(filter_params):
+            if rule.column not in self.df.columns:
+                continue
+            mask &= self._rule_mask(rule)
+        self.last_seconds = time.perf_counter() - start
+        return self.df[mask]
+
+    def _column(self, rule: FilterRule) -> pd.Series:
+        if rule.normalized:
+            return normalized_column(self.df, rule.column)
+        return self.df[rule.column]
+
+    def _rule_mask(self, rule: FilterRule) -> np.ndarray:
+        key = rule.cache_key
+        cached = self._rule_masks.get(key)
+        if cached is not None:
+            return cached
+
+        self.last_evaluated.append(rule.name)
+        if isinstance(rule, PatternRule):
+            mask = self._pattern_rule_mask(rule)
+        else:
+            mask = rule.evaluate(self._column(rule))
+        self._rule_masks[key] = mask
+        return mask
+
+    def _pattern_rule_mask(self, rule: PatternRule) -> np.ndarray:
+        """
+        Combina las máscaras por frase, calculando en una sola pasada solo
+        las frases que aún no están en caché.
+        """
+        matcher = rule.matcher
+        prefix = (rule.column, matcher.mode, matcher.case_insensitive)
+        missing = [p for p in matcher.patterns if prefix + (p,) not in self._pattern_masks]
+        if missing:
+            text = self._column(rule)
+            if not rule.normalized:
+                text = text.astype(str)
+            partial = PatternMatcher(
+                missing, case_insensitive=matcher.case_insensitive, mode=matcher.mode
+            )
+            for pattern, pattern_mask in partial.pattern_masks(text, prepared=True).items():
+                self._pattern_masks[prefix + (pattern,)] = pattern_mask
+
+        return rule.combine({p: self._pattern_masks[prefix + (p,)] for p in matcher.patterns})
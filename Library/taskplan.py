@@ -0,0 +1,130 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+from JobSpy.jobs import Country
+
+
+# Entradas de Country que JobSpy usa internamente y no son países
+INTERNAL_COUNTRIES = {Country.US_CANADA, Country.WORLDWIDE}
+
+# País que se conserva cuando varios producen la misma petición (p. ej.
+# www.glassdoor.com para usa, malaysia y vietnam, o ZipRecruiter)
+PREFERRED_COUNTRIES = ["usa", "canada"]
+
+
+def _ignores_country(country: Country) -> str:
+    return "*"
+
+
+# Para cada sitio, qué determina la petición según el país: dos países con la
+# misma clave hacen exactamente la misma consulta. Si la función lanza una
+# excepción, el sitio no está disponible en ese país. Los sitios que no estén
+# aquí se consultan en todos los países.
+SITE_REQUEST_KEYS: Dict[str, Callable[[Country], object]] = {
+    "indeed": lambda country: country.indeed_domain_value,
+    "glassdoor": lambda country: country.glassdoor_domain_value,
+    # ZipRecruiter solo tiene EE. UU./Canadá y no usa el país
+    "zip_recruiter": _ignores_country,
+    # Sin location, LinkedIn y Google buscan lo mismo para cualquier país
+    "linkedin": _ignores_country,
+    "google": _ignores_country,
+}
+
+
+class TaskPlan:
+    """
+    Plan de ejecución de un JobScraper: los (país, sitio) que se van a
+    consultar, los descartados porque el sitio no existe en ese país y los
+    que se fusionan con otro que hace la misma petición.
+    """
+
+    def __init__(self):
+        self.tasks: List[Tuple[str, str]] = []
+        # (país, sitio, motivo)
+        self.pruned: List[Tuple[str, str, str]] = []
+        # (país, sitio) -> país de la tarea que hace la misma petición
+        self.collapsed: Dict[Tuple[str, str], str] = {}
+
+    @property
+    def candidates(self) -> int:
+        return len(self.tasks) + len(self.pruned) + len(self.collapsed)
+
+    def __len__(self) -> int:
+        return len(self.tasks)
+
+    def __iter__(self):
+        return iter(self.tasks)
+
+    def report(self, verbose: bool = False) -> str:
+        """
+        Resumen del plan: tareas por sitio y cuántas se han ahorrado. Con
+        verbose, lista además cada combinación descartada o fusionada.
+        """
+        lines = [
+            f"Plan: {len(self.tasks)} tareas de {self.candidates} "
+            f"({len(self.pruned)} no disponibles, {len(self.collapsed)} duplicadas)"
+        ]
+        sites = list(dict.fromkeys(site for _, site in self.tasks))
+        for site in sites:
+            countries = [c for c, s in self.tasks if s == site]
+            lines.append(f"  {site}: {len(countries)} ({', '.join(countries)})")
+        if verbose:
+            for country, site, reason in self.pruned:
+                lines.append(f"  - {site}/{country}: {reason}")
+            for (country, site), kept in self.collapsed.items():
+                lines.append(f"  = {site}/{country}: igual que {site}/{kept}")
+        return "\n".join(lines)
+
+
+def _country_enum(country_str: str) -> Optional[Country]:
+    try:
+        return Country.from_string(country_str)
+    except ValueError:
+        return None
+
+
+def plan_tasks(countries: List[str], sites: List[str]) -> TaskPlan:
+    """
+    Construye el plan a partir del producto países x sitios:
+      - descarta los países internos de JobSpy y los (país, sitio) en los que
+        el sitio no está disponible;
+      - agrupa los que generan la misma petición y conserva uno por grupo
+        (el de PREFERRED_COUNTRIES si está, si no el primero).
+    El orden de las tareas sigue el de `countries` y `sites`.
+    """
+    plan = TaskPlan()
+    # (sitio, clave) -> países que hacen esa petición, en orden
+    groups: Dict[Tuple[str, object], List[str]] = {}
+
+    for country_str in countries:
+        country = _country_enum(country_str)
+        for site in sites:
+            if country is None or country in INTERNAL_COUNTRIES:
+                plan.pruned.append((country_str, site, "no es un país"))
+                continue
+            key_fn = SITE_REQUEST_KEYS.get(site)
+            if key_fn is None:
+                key = country_str
+            else:
+                try:
+                    key = key_fn(country)
+                except Exception as e:
+                    plan.pruned.append((country_str, site, str(e)))
+                    continue
+            groups.setdefault((site, key), []).append(country_str)
+
+    kept = set()
+    for (site, _), group in groups.items():
+        preferred = [c for c in PREFERRED_COUNTRIES if c in group]
+        chosen = preferred[0] if preferred else group[0]
+        kept.add((chosen, site))
+        for country_str in group:
+            if country_str != chosen:
+                plan.collapsed[(country_str, site)] = chosen
+
+    plan.tasks = [
+        (country_str, site)
+        for country_str in countries
+        for site in sites
+        if (country_str, site) in kept
+    ]
+    return plan
@@ -0,0 +1,156 @@
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from Library.matcher import MATCH_MODES, PatternMatcher
+from Library.myfilters import apply_filters
+from Library.normalize import normalized_column
+from filter_params import filter_parameters
+
+
+WORDS = (
+    "we are looking for a developer to join our team python java cloud "
+    "services customers product agile scrum office benefits salary bonus "
+    "remote friendly schedule experience years degree english spanish "
+    "desarrollador programador equipo empresa beneficios oficina proyecto"
+).split()
+
+
+# Expresiones de ejemplo para el modo "regex": una alternancia de muchas
+# frases literales es mucho más rápida en modo "substring" o "word"
+REGEX_SAMPLE = [
+    r"\b(?:travel(?:ing)?|viajar?|viajes)\b",
+    r"\b\d{2}% travel\b",
+    r"\b(?:senior|sr\.|lead|chief|principal)\b",
+    r"\b(?:hybrid|hibrido|presencial|on-?site)\b",
+]
+
+
+def build_corpus(rows: int, words_per_description: int = 400, seed: int = 0) -> pd.DataFrame:
+    """
+    Genera un DataFrame sintético con la misma forma que el que devuelve JobScraper.
+    Una parte de las descripciones incluye frases positivas y negativas reales
+    de filter_params para que los filtros tengan trabajo que hacer.
+    """
+    rng = random.Random(seed)
+    positives = filter_parameters["keywords_in_description"]
+    negatives = filter_parameters["negatives_in_description"]
+    today = pd.Timestamp.now().normalize()
+
+    records = []
+    for i in range(rows):
+        words = [rng.choice(WORDS) for _ in range(words_per_description)]
+        if rng.random() < 0.6:
+            words.insert(rng.randrange(len(words)), rng.choice(positives))
+        if rng.random() < 0.3:
+            words.insert(rng.randrange(len(words)), rng.choice(negatives))
+        records.append(
+            {
+                "title": f"Job {i} {rng.choice(WORDS)}",
+                "job_url": f"https://example.com/{i}",
+                "description": " ".join(words),
+                "date_posted": (today - pd.Timedelta(days=rng.randint(0, 2))).date(),
+                "country": rng.choice(["usa", "spain", "mexico", "argentina"]),
+            }
+        )
+    return pd.DataFrame.from_records(records)
+
+
+def time_engine(df: pd.DataFrame, params, engine: str, repeat: int, workers=None):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = apply_filters(df, params, engine=engine, workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def time_modes(df: pd.DataFrame, repeat: int):
+    """
+    Compara los modos de búsqueda de PatternMatcher sobre la descripción con
+    el lambda original (`any(neg in text ...)` fila a fila). El modo "regex"
+    se mide con REGEX_SAMPLE.
+    """
+    negatives = filter_parameters["negatives_in_description"]
+    lowered = [n.lower() for n in negatives]
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    baseline = best_of(
+        lambda: df["description"]
+        .astype(str)
+        .str.lower()
+        .apply(lambda text: any(neg in text for neg in lowered))
+    )
+    print(f"{'lambda':<12} {baseline:8.3f}s")
+
+    start = time.perf_counter()
+    text = normalized_column(df, "description")
+    print(f"{'normalizar':<12} {time.perf_counter() - start:8.3f}s  (una vez por DataFrame)")
+
+    for mode in MATCH_MODES:
+        patterns = REGEX_SAMPLE if mode == "regex" else negatives
+        matcher = PatternMatcher(patterns, mode=mode)
+        elapsed = best_of(lambda: matcher.contains(text, prepared=True))
+        hits = int(matcher.contains(text, prepared=True).sum())
+        print(f"{mode:<12} {elapsed:8.3f}s  x{baseline / elapsed:.1f}  aciertos={hits}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los motores de filtrado")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--modes",
+        action="store_true",
+        help="Compara los modos de búsqueda (substring/word/regex) con el lambda",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        nargs="*",
+        help="Mide también el motor 'parallel' con cada número de procesos indicado",
+    )
+    args = parser.parse_args()
+
+    df = build_corpus(args.rows)
+    print(f"Corpus sintético: {len(df)} filas\n")
+
+    if args.modes:
+        time_modes(df, args.repeat)
+        return
+
+    params = filter_parameters
+
+    baseline, expected = time_engine(df, params, "apply", args.repeat)
+    print(f"{'apply':<12} {baseline:8.3f}s  filas={len(expected)}")
+
+    for engine in ("automaton", "compiled"):
+        elapsed, result = time_engine(df, params, engine, args.repeat)
+        same = result.index.equals(expected.index)
+        print(
+            f"{engine:<12} {elapsed:8.3f}s  filas={len(result)}  "
+            f"x{baseline / elapsed:.1f}  {'OK' if same else 'DIFERENTE'}"
+        )
+
+    for workers in args.workers or []:
+        elapsed, result = time_engine(df, params, "parallel", args.repeat, workers)
+        same = result.index.equals(expected.index)
+        label = f"parallel/{workers}"
+        print(
+            f"{label:<12} {elapsed:8.3f}s  filas={len(result)}  "
+            f"x{baseline / elapsed:.1f}  {'OK' if same else 'DIFERENTE'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
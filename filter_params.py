@@ -35,6 +35,7 @@ filter_parameters = {
     ],
 
     # Frases negativas en la descripción (para excluir trabajos NO-remotos, presenciales, híbridos, viajes, etc.)
+    # Los filtros comparan textos normalizados (sin mayúsculas ni acentos): basta con escribir cada frase una vez.
     # + AÑADIMOS LAS QUE EXCLUYEN “SENIOR”, “LEAD”, ETC.
     "negatives_in_description": [
         # --- NO REMOTO / PRESENCIAL ---
@@ -45,46 +46,46 @@ filter_parameters = {
         "work on site", "work onsite", "work on-site",
 
         # --- HÍBRIDO / SEMI REMOTO ---
-        "hybrid", "híbrido", "hibrido", "hybrid only",
+        "hybrid", "híbrido", "hybrid only",
         "partially remote", "part-time remote", "semi-remote", 
         "mixed remote", "some days remote", "some days onsite", 
         "some office days", "flexible location",
 
         # --- VIAJE / TRAVEL
-        "travel", "TRAVEL",
-        "traveling", "TRAVELING",
-        "travel required", "TRAVEL REQUIRED",
-        "requires travel", "REQUIRES TRAVEL",
-        "some travel", "SOME TRAVEL",
-        "traveling is required", "TRAVELING IS REQUIRED",
-        "must be able to travel", "MUST BE ABLE TO TRAVEL",
+        "travel",
+        "traveling",
+        "travel required",
+        "requires travel",
+        "some travel",
+        "traveling is required",
+        "must be able to travel",
 
-        "viajar", "VIAJAR",
-        "viajes", "VIAJES",
-        "disponibilidad para viajar", "DISPONIBILIDAD PARA VIAJAR",
-        "requiere viajar", "REQUIERE VIAJAR",
-        "requiere viajes", "REQUIERE VIAJES",
-        "viajar frecuentemente", "VIAJAR FRECUENTEMENTE",
-        "viajar obligatorio", "VIAJAR OBLIGATORIO",
+        "viajar",
+        "viajes",
+        "disponibilidad para viajar",
+        "requiere viajar",
+        "requiere viajes",
+        "viajar frecuentemente",
+        "viajar obligatorio",
 
-        "travel up to", "TRAVEL UP TO",
-        "travel 25%", "TRAVEL 25%",
-        "travel 50%", "TRAVEL 50%",
-        "25% travel", "25% TRAVEL",
-        "50% travel", "50% TRAVEL",
-        "occasional travel", "OCCASIONAL TRAVEL",
-        "frequent travel", "FREQUENT TRAVEL",
+        "travel up to",
+        "travel 25%",
+        "travel 50%",
+        "25% travel",
+        "50% travel",
+        "occasional travel",
+        "frequent travel",
 
         # --- RELOCATION / COMMUTE ---
-        "relocation required", "RELOCATION REQUIRED",
-        "relocation assistance", "RELOCATION ASSISTANCE",
-        "some relocation", "SOME RELOCATION",
-        "must relocate", "MUST RELOCATE",
-        "requires relocation", "REQUIRES RELOCATION",
-        "commute required", "COMMUTE REQUIRED",
-        "commuting is required", "COMMUTING IS REQUIRED",
-        "desplazamiento obligatorio", "DESPLAZAMIENTO OBLIGATORIO",
-        "desplazarse", "DESPLAZARSE",
+        "relocation required",
+        "relocation assistance",
+        "some relocation",
+        "must relocate",
+        "requires relocation",
+        "commute required",
+        "commuting is required",
+        "desplazamiento obligatorio",
+        "desplazarse",
 
         # --- EXCLUIR SENIOR/LEAD (EN LA DESCRIPCIÓN) ---
         "senior",
@@ -104,4 +105,20 @@ filter_parameters = {
 
     # Lista de países (exact match). Vacío => no filtra
     "country_list": [],
+
+    # Modo de búsqueda por lista: "substring" (por defecto), "word" (palabra
+    # completa: "lead" no excluye "leading") o "regex" (expresiones regulares)
+    "match_mode": {
+        "negatives_in_description": "word",
+    },
 }
+
+# Perfiles de filtrado con nombre (opcional). Si hay alguno, JobThis los
+# evalúa todos en una sola pasada (ver Library/profiles.py) en lugar de
+# filter_parameters, y añade la columna "profiles" con los que cumple cada
+# oferta. Cada perfil tiene las mismas claves que filter_parameters, p. ej.:
+#   filter_profiles = {
+#       "backend": {**filter_parameters, "title_keywords": ["backend", "python"]},
+#       "frontend": {**filter_parameters, "title_keywords": ["frontend", "react"]},
+#   }
+filter_profiles = {}
@@ -0,0 +1,156 @@
+import asyncio
+import time
+import types
+
+import pytest
+
+from JobSpy.scrapers import ratelimit
+from JobSpy.scrapers.ratelimit import CircuitBreaker, CircuitOpenError, SiteLimiter, SiteLimits
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(
+        ratelimit,
+        "time",
+        types.SimpleNamespace(monotonic=clock, time=time.time, sleep=time.sleep),
+    )
+    return clock
+
+
+def _open(breaker):
+    for _ in range(breaker.threshold):
+        breaker.record_failure()
+    assert breaker.state == "open"
+
+
+def test_opens_after_threshold(clock):
+    breaker = CircuitBreaker("indeed", threshold=3, cooldown=60)
+    assert breaker.before_request() is None
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    # A success resets the count of consecutive failures
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.times_opened == 1
+
+    with pytest.raises(CircuitOpenError) as error:
+        breaker.before_request()
+    assert error.value.retry_in == 60
+    assert breaker.rejected == 1
+
+
+def test_half_open_probe_closes(clock):
+    breaker = CircuitBreaker("indeed", threshold=2, cooldown=60)
+    _open(breaker)
+    # A late success from a request sent before opening doesn't close it
+    breaker.record_success()
+    assert breaker.state == "open"
+
+    clock.now += 60
+    assert breaker.state == "half_open"
+    probe = breaker.before_request()
+    assert probe is not None
+    # Only one probe at a time
+    assert breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.before_request() is None
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("indeed", threshold=2, cooldown=60)
+    _open(breaker)
+    clock.now += 60
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.times_opened == 1
+
+    # The cooldown starts again from the failed probe
+    clock.now += 30
+    assert breaker.state == "open"
+    clock.now += 30
+    assert breaker.state == "half_open"
+
+
+def test_abandoned_probe_goes_back_to_half_open(clock):
+    breaker = CircuitBreaker("indeed", threshold=1, cooldown=60)
+    _open(breaker)
+    clock.now += 60
+    probe = breaker.before_request()
+    # Another caller's token doesn't release the probe
+    breaker.abandon_probe(object())
+    assert breaker.state == "open"
+    breaker.abandon_probe(probe)
+    assert breaker.state == "half_open"
+    assert breaker.before_request() is not None
+
+
+def _limiter():
+    return SiteLimiter(
+        "indeed",
+        SiteLimits(max_concurrent=2, rate=1000, burst=10, failure_threshold=1, cooldown=60),
+    )
+
+
+def test_slot_interrupted_probe(clock):
+    limiter = _limiter()
+    limiter.record_status(503)
+    assert limiter.breaker.state == "open"
+    clock.now += 60
+
+    with pytest.raises(KeyboardInterrupt):
+        with limiter.slot():
+            raise KeyboardInterrupt
+    assert limiter.breaker.state == "half_open"
+
+    with pytest.raises(ConnectionError):
+        with limiter.slot():
+            raise ConnectionError
+    assert limiter.breaker.state == "open"
+
+    clock.now += 60
+    with limiter.slot():
+        limiter.record_status(200)
+    assert limiter.breaker.state == "closed"
+
+
+def test_aslot_cancelled_probe(clock):
+    limiter = _limiter()
+    limiter.record_status(429)
+    clock.now += 60
+
+    async def probe(started):
+        async with limiter.aslot():
+            started.set()
+            await asyncio.sleep(10)
+
+    async def main():
+        started = asyncio.Event()
+        task = asyncio.create_task(probe(started))
+        await started.wait()
+        assert limiter.breaker.state == "open"
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert limiter.breaker.state == "half_open"
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Library.filterplan import compile_filters
+from Library.myfilters import apply_filters
+from Library.profiles import PROFILE_COLUMN, compile_profiles
+
+
+@pytest.fixture
+def jobs():
+    now = pd.Timestamp.now()
+    return pd.DataFrame(
+        {
+            "id": [f"in-{i}" for i in range(8)],
+            "title": [
+                "Python Developer",
+                "Senior Java Engineer",
+                "Data Analyst",
+                "Python Intern",
+                "Ingeniero de Datos",
+                "JavaScript Developer",
+                "Python Developer (Sr)",
+                "Backend Python",
+            ],
+            "description": [
+                "Python, SQL y Docker",
+                "Java y Spring",
+                "Análisis de datos con SQL",
+                "Python para prácticas",
+                np.nan,
+                "React y node",
+                "python y sql, no remoto",
+                "Django y SQL",
+            ],
+            "country": ["Spain", "spain", "USA", "Spain", "Spain", "UK", "Spain", "Spain"],
+            "date_posted": [now - pd.Timedelta(days=d) for d in (1, 2, 3, 1, 1, 40, 2, 5)],
+        }
+    )
+
+
+PARAMS = {
+    "days_back": 30,
+    "keywords_in_description": ["python", "sql", "análisis"],
+    "negatives_in_description": ["no remoto"],
+    "title_keywords": ["developer", "analyst", "backend", "ingeniero"],
+    "negatives_in_title": ["intern"],
+    "country_list": ["spain", "usa"],
+}
+
+
+@pytest.mark.parametrize(
+    "match_mode",
+    [
+        {},
+        {"title_keywords": "word", "keywords_in_description": "word"},
+        {"keywords_in_description": "regex", "negatives_in_title": "regex"},
+    ],
+)
+def test_compiled_matches_legacy_engines(jobs, match_mode):
+    params = dict(PARAMS, match_mode=match_mode)
+    compiled = compile_filters(params).apply(jobs)
+    assert not compiled.empty
+    for engine in ("apply", "automaton"):
+        legacy = apply_filters(jobs, params, engine=engine)
+        assert legacy["id"].tolist() == compiled["id"].tolist(), engine
+
+
+def test_compiled_filters(jobs):
+    kept = compile_filters(PARAMS).apply(jobs)
+    assert kept["id"].tolist() == ["in-0", "in-2", "in-7"]
+    # apply no modifica el DataFrame original
+    assert len(jobs) == 8
+
+
+def test_empty_params_keep_everything(jobs):
+    assert compile_filters({}).apply(jobs)["id"].tolist() == jobs["id"].tolist()
+    assert apply_filters(jobs, {}, engine="apply")["id"].tolist() == jobs["id"].tolist()
+
+
+def test_profiles_match_separate_plans(jobs, tmp_path):
+    profiles = {
+        "python": dict(PARAMS, keywords_in_description=["python"]),
+        "datos": dict(PARAMS, keywords_in_description=["sql", "análisis"]),
+    }
+    stats_path = tmp_path / "stats.json"
+    compiled = compile_profiles(profiles, stats_path=str(stats_path), profile=True)
+    kept = compiled.apply(jobs)
+
+    expected = {}
+    for name, params in profiles.items():
+        for job_id in compile_filters(params).apply(jobs)["id"]:
+            expected.setdefault(job_id, []).append(name)
+    assert kept["id"].tolist() == sorted(expected)
+    assert {
+        job_id: names.split(",") for job_id, names in zip(kept["id"], kept[PROFILE_COLUMN])
+    } == expected
+
+    assert "python:keywords_in_description" in compiled.profile.report()
+    compiled.save_stats()
+    assert stats_path.exists()
@@ -0,0 +1,82 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from Library.jobstore import JobStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    yield store
+    store.close()
+
+
+def _jobs(ids, title="Python Developer"):
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "site": ["indeed"] * len(ids),
+            "country": ["spain"] * len(ids),
+            "title": [title] * len(ids),
+            "min_amount": [30000.0] + [np.nan] * (len(ids) - 1),
+            "date_posted": [pd.Timestamp("2024-05-01")] * len(ids),
+        }
+    )
+
+
+def test_upsert_counts_new_and_updated_rows(store):
+    assert store.upsert(_jobs(["in-1", "in-2"]), seen_at=datetime(2024, 5, 1)) == (2, 0)
+    assert store.upsert(_jobs(["in-2", "in-3"], title="Data Engineer"), seen_at=datetime(2024, 5, 2)) == (1, 1)
+    assert len(store) == 3
+
+    df = store.query().set_index("id")
+    assert df.loc["in-2", "title"] == "Data Engineer"
+    # first_seen se conserva; last_seen se actualiza
+    assert df.loc["in-2", "first_seen"] == "2024-05-01T00:00:00"
+    assert df.loc["in-2", "last_seen"] == "2024-05-02T00:00:00"
+    assert df.loc["in-1", "min_amount"] == 30000
+
+
+def test_upsert_skips_rows_without_id(store):
+    df = _jobs(["in-1", None])
+    assert store.upsert(df) == (1, 0)
+    assert store.upsert(df.iloc[0:0]) == (0, 0)
+    assert store.upsert(df.drop(columns="id")) == (0, 0)
+
+
+def test_query_filters(store):
+    store.upsert(_jobs(["in-1"]), seen_at=datetime(2024, 5, 1))
+    other = _jobs(["gd-1"]).assign(site="glassdoor", country="usa")
+    store.upsert(other, seen_at=datetime(2024, 5, 3))
+
+    assert store.query(sites=["glassdoor"])["id"].tolist() == ["gd-1"]
+    assert store.query(countries=["spain"])["id"].tolist() == ["in-1"]
+    assert store.query(seen_since=datetime(2024, 5, 2))["id"].tolist() == ["gd-1"]
+    assert store.query(seen_before=datetime(2024, 5, 2))["id"].tolist() == ["in-1"]
+    assert store.query(posted_since="2024-06-01").empty
+
+
+def test_watermarks(store):
+    assert store.get_watermark("spain", "indeed") is None
+    store.set_watermark("spain", "indeed", datetime(2024, 5, 1, 10, 30))
+    store.set_watermark("usa", "indeed", datetime(2024, 5, 2))
+    assert store.get_watermark("spain", "indeed") == datetime(2024, 5, 1, 10, 30)
+
+    store.set_watermark("spain", "indeed", datetime(2024, 5, 3))
+    assert store.get_watermark("spain", "indeed") == datetime(2024, 5, 3)
+    assert store.get_watermark("usa", "indeed") == datetime(2024, 5, 2)
+    assert store.get_watermark("spain", "glassdoor") is None
+
+
+def test_watermarks_persist(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = JobStore(path)
+    store.set_watermark("spain", "indeed", datetime(2024, 5, 1))
+    store.close()
+
+    store = JobStore(path)
+    assert store.get_watermark("spain", "indeed") == datetime(2024, 5, 1)
+    store.close()
@@ -0,0 +1,101 @@
+import pandas as pd
+import pytest
+
+from Library import matcher
+from Library.matcher import PatternMatcher
+
+TEXTS = [
+    "Senior Java developer",
+    "JavaScript y TypeScript",
+    "Análisis de datos con Python",
+    "python-dev, SQL;   spark",
+    "Java/JavaScript full stack",
+    "sin coincidencias",
+    "",
+]
+
+
+@pytest.fixture(params=["ahocorasick", "regex"])
+def backend(request, monkeypatch):
+    """
+    Ejecuta el test con el autómata de pyahocorasick y con el trie compilado
+    como expresión regular.
+    """
+    if request.param == "ahocorasick":
+        if matcher.ahocorasick is None:
+            pytest.skip("pyahocorasick no está instalado")
+    else:
+        monkeypatch.setattr(matcher, "ahocorasick", None)
+    return request.param
+
+
+def test_substring_finds_overlapping_phrases(backend):
+    m = PatternMatcher(["java", "javascript", "script"])
+    assert m.backend == backend
+    assert m.findall("Me gusta JavaScript") == {"java", "javascript", "script"}
+    assert m.search("JAVA")
+    assert not m.search("python")
+
+
+def test_substring_ignores_case_and_accents(backend):
+    m = PatternMatcher(["analisis de datos"])
+    assert m.search("ANÁLISIS  de   datos")
+    assert not PatternMatcher(["Análisis"], case_insensitive=False).search("análisis")
+
+
+def test_word_mode_requires_word_boundaries(backend):
+    m = PatternMatcher(["java", "java developer"], mode="word")
+    assert m.findall("Java developer") == {"java", "java developer"}
+    assert m.findall("Java/Kotlin") == {"java"}
+    assert m.findall("JavaScript developer") == set()
+    assert not m.search("javadeveloper")
+
+
+def test_regex_mode():
+    m = PatternMatcher([r"c\+\+", r"go(lang)?\b", r"análisis"], mode="regex")
+    assert m.findall("C++ y Golang") == {r"c\+\+", r"go(lang)?\b"}
+    # Las expresiones pierden los acentos igual que el texto
+    assert m.search("analisis")
+    assert not m.search("google")
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        PatternMatcher(["java"], mode="fuzzy")
+
+
+def test_empty_matcher():
+    m = PatternMatcher(["", ""])
+    assert not m
+    assert not m.search("java")
+    assert not m.contains(pd.Series(["java"])).any()
+
+
+@pytest.mark.parametrize("mode", ["substring", "word"])
+@pytest.mark.parametrize(
+    "patterns",
+    [
+        ["java", "javascript", "python", "sql", "spark"],
+        ["java"],
+        ["data", "datos", "de", "de datos", "analisis de datos", "script"],
+    ],
+)
+def test_backends_agree(monkeypatch, mode, patterns):
+    if matcher.ahocorasick is None:
+        pytest.skip("pyahocorasick no está instalado")
+    series = pd.Series(TEXTS)
+    automaton = PatternMatcher(patterns, mode=mode)
+    monkeypatch.setattr(matcher, "ahocorasick", None)
+    fallback = PatternMatcher(patterns, mode=mode)
+    assert fallback.backend == "regex"
+
+    assert [automaton.findall(t) for t in TEXTS] == [fallback.findall(t) for t in TEXTS]
+    assert automaton.contains(series).tolist() == fallback.contains(series).tolist()
+    assert automaton.contains_all(series).tolist() == fallback.contains_all(series).tolist()
+    automaton_masks = automaton.pattern_masks(series)
+    fallback_masks = fallback.pattern_masks(series)
+    assert automaton_masks.keys() == fallback_masks.keys()
+    for pattern, mask in automaton_masks.items():
+        assert mask.tolist() == fallback_masks[pattern].tolist()
+    # contains coincide con search fila a fila
+    assert fallback.contains(series).tolist() == [fallback.search(t) for t in TEXTS]
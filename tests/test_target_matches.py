@@ -0,0 +1,115 @@
+import asyncio
+import json
+import time
+
+import pandas as pd
+import pytest
+
+import Library.JobScraperModule as scraper_module
+from JobSpy import stop_requested
+from Library.JobScraperModule import JobScraper
+
+PAGE = 3
+
+
+def _page(country, start):
+    ids = [f"in-{country}-{i}" for i in range(start, start + PAGE)]
+    return pd.DataFrame(
+        {
+            "id": ids,
+            "site": ["indeed"] * PAGE,
+            "title": ids,
+            "description": ["python"] * PAGE,
+            "date_posted": [pd.Timestamp.now()] * PAGE,
+        }
+    )
+
+
+def _pages(country, results_wanted):
+    """
+    Páginas de la búsqueda simulada de cada país:
+      - usa: dos páginas enseguida.
+      - canada: páginas hasta results_wanted; mira stop_requested() entre
+        páginas, como los scrapers de JobSpy.
+      - uk: una página lenta, sin mirar la señal de parada.
+    """
+    if country == "usa":
+        yield 0
+        yield 0
+    elif country == "canada":
+        for _ in range(results_wanted // PAGE):
+            yield 0.02
+            if stop_requested():
+                return
+    else:
+        yield 0.3
+
+
+def fake_scrape_jobs(**kwargs):
+    country = kwargs["country_indeed"]
+    frames = []
+    for delay in _pages(country, kwargs["results_wanted"]):
+        time.sleep(delay)
+        frames.append(_page(country, PAGE * len(frames)))
+    return pd.concat(frames, ignore_index=True)
+
+
+async def fake_scrape_jobs_async(**kwargs):
+    country = kwargs["country_indeed"]
+    frames = []
+    for delay in _pages(country, kwargs["results_wanted"]):
+        await asyncio.sleep(delay)
+        frames.append(_page(country, PAGE * len(frames)))
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def scraper(monkeypatch, tmp_path):
+    monkeypatch.setattr(scraper_module, "scrape_jobs", fake_scrape_jobs)
+    monkeypatch.setattr(scraper_module, "scrape_jobs_async", fake_scrape_jobs_async)
+    js = JobScraper(
+        sites_to_query=["indeed"],
+        max_workers=3,
+        results_wanted=300,
+        run_dir=str(tmp_path / "run"),
+        target_matches=5,
+    )
+    js.collect_countries = lambda: ["usa", "canada", "uk"]
+    return js
+
+
+def _check_stopped(js, df, run_dir):
+    counts = df.groupby("country").size().to_dict()
+    assert counts["usa"] == 6
+    assert counts["uk"] == 3
+    # canada paró en cuanto usa llegó al objetivo, lejos de sus 300 ofertas
+    assert 0 < counts["canada"] < 300
+    # Solo se marca la tarea que de verdad cortó su búsqueda
+    assert js.stopped_tasks == {("canada", "indeed")}
+    assert js.cancelled_tasks == 0
+
+    # En el checkpoint sigue pendiente, para repetirla al reanudar
+    status = json.loads((run_dir / "status.json").read_text())
+    assert {task: entry["state"] for task, entry in status.items()} == {
+        "indeed/usa": "done",
+        "indeed/canada": "pending",
+        "indeed/uk": "done",
+    }
+
+
+def test_target_matches_stops_running_scrapers(scraper, tmp_path):
+    df = scraper.run_scraping()
+    _check_stopped(scraper, df, tmp_path / "run")
+
+
+def test_target_matches_stops_async_scrapers(scraper, tmp_path):
+    df = asyncio.run(scraper.arun_scraping())
+    _check_stopped(scraper, df, tmp_path / "run")
+
+
+def test_without_target_everything_finishes(scraper):
+    scraper.target_matches = None
+    scraper.results_wanted = 30
+    df = scraper.run_scraping()
+    assert df.groupby("country").size().to_dict() == {"canada": 30, "uk": 3, "usa": 6}
+    assert scraper.stopped_tasks == set()